@@ -0,0 +1,19 @@
+"""
+Seeded benchmarks for dungeon generation, FOV, pathfinding, AI and rendering
+
+Run from the dungeon_crawler directory:
+
+    python -m benchmarks                      # run everything
+    python -m benchmarks --filter render      # only matching names or groups
+    python -m benchmarks --save-baseline      # store results as the baseline
+    python -m benchmarks --compare            # compare against the baseline
+"""
+
+from .harness import (Benchmark, BENCHMARKS, benchmark, parametrize, run_benchmarks,
+                      compare, save_results, load_results)
+from . import cases
+
+__all__ = [
+    'Benchmark', 'BENCHMARKS', 'benchmark', 'parametrize', 'run_benchmarks',
+    'compare', 'save_results', 'load_results'
+]
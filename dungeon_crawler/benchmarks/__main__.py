@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+from .harness import run_benchmarks, compare, save_results, load_results, format_time, select
+from . import cases
+
+# Baselines are machine specific, so they live next to the benchmarks but are not committed
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "baseline.json")
+
+def print_result(result):
+    """Print one benchmark result as it finishes"""
+    print(f"{result['name']:<40} {format_time(result['median']):>12} "
+          f"(min {format_time(result['min'])}, stdev {format_time(result['stdev'])})",
+          flush=True)
+
+def print_comparison(rows, threshold):
+    """Print a comparison table against the baseline"""
+    print()
+    print(f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        marker = {"slower": "  SLOWER", "faster": "  faster"}.get(row["status"], "")
+        print(f"{row['name']:<40} {format_time(row['baseline']):>12} "
+              f"{format_time(row['median']):>12} {change:>9}{marker}")
+    slower = sum(1 for row in rows if row["status"] == "slower")
+    print(f"\n{slower} regression(s) beyond {threshold * 100:.0f}%")
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run the Epic Dungeon Crawler benchmarks")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name or group contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed repeats per benchmark")
+    parser.add_argument("--output", default=None, help="write results JSON to this file")
+    parser.add_argument("--json", action="store_true", help="print results JSON instead of a table")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--verbose", action="store_true", help="show game log output")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in select(args.filter):
+            print(f"{bench.group:<12} {bench.name}")
+        return 0
+
+    progress = None if args.json else print_result
+    document = run_benchmarks(args.filter, args.repeat, args.warmup, not args.verbose, progress)
+
+    if args.json:
+        print(json.dumps(document, indent=2))
+    if args.output:
+        save_results(document, args.output)
+
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+            status = 2
+        else:
+            rows = compare(document, load_results(args.baseline), args.threshold)
+            print_comparison(rows, args.threshold)
+            if any(row["status"] == "slower" for row in rows):
+                status = 1
+
+    if args.save_baseline:
+        save_results(document, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+import os
+import random
+from .harness import benchmark, parametrize
+from game.settings import *
+from game.tile import TileType
+from game.world.dungeon import Dungeon
+from game.player import Player
+from game.enemy import Enemy
+from game.item import Item
+from game.pathfinding import PathFinder, IncrementalPathFinder, HierarchicalPathFinder, PathService
+
+# Shared display for the rendering benchmarks
+_screen = None
+
+def get_screen():
+    """Open a screen-sized display, using SDL's dummy driver unless one is set"""
+    global _screen
+    if _screen is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        pygame.display.init()
+        pygame.font.init()
+        _screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return _screen
+
+def make_dungeon(width=GRID_WIDTH, height=GRID_HEIGHT, level=1):
+    """Create a dungeon from the current random state"""
+    return Dungeon(width, height, max_rooms=12, room_min_size=6, room_max_size=12, level=level)
+
+def floor_positions(dungeon):
+    """Get every floor tile position in a dungeon"""
+    grid = dungeon.grid
+    floor = TileType.FLOOR.value
+    return [(i % grid.width, i // grid.width) for i in range(grid.size) if grid.types[i] == floor]
+
+def random_walk(dungeon, start, steps):
+    """Get a walkable random walk of positions starting from start"""
+    x, y = start
+    walk = []
+    for _ in range(steps):
+        dx, dy = random.choice(((0, -1), (0, 1), (-1, 0), (1, 0)))
+        if dungeon.is_position_valid(x + dx, y + dy):
+            x, y = x + dx, y + dy
+        walk.append((x, y))
+    return walk
+
+def make_maze(width, height):
+    """Carve a perfect maze with a depth-first search (odd sizes keep a wall border)"""
+    grid = [[False] * width for _ in range(height)]
+    stack = [(1, 1)]
+    grid[1][1] = True
+    while stack:
+        x, y = stack[-1]
+        options = [(dx, dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 < x + dx < width - 1 and 0 < y + dy < height - 1
+                   and not grid[y + dy][x + dx]]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = random.choice(options)
+        grid[y + dy // 2][x + dx // 2] = True
+        grid[y + dy][x + dx] = True
+        stack.append((x + dx, y + dy))
+    return grid
+
+# Generation
+
+@parametrize("dungeon.generate", "generation",
+             [{"width": 40, "height": 30}, {"width": 60, "height": 40}, {"width": 120, "height": 80}],
+             number=5)
+def bench_generate(width, height):
+    dungeon = make_dungeon(width, height)
+
+    return lambda: dungeon.generate(12, 6, 12)
+
+@parametrize("item.create_random_item", "generation",
+             [{"level": 1}, {"level": 10}, {"level": 25}], number=1000)
+def bench_create_item(level):
+    return lambda: Item.create_random_item(10, 10, level=level, biome_name="CAVERN")
+
+# Field of view
+
+@parametrize("dungeon.compute_fov", "fov",
+             [{"radius": 4}, {"radius": 8}, {"radius": 12}, {"radius": 16}])
+def bench_fov(radius):
+    dungeon = make_dungeon()
+    positions = random.sample(floor_positions(dungeon), 200)
+    dungeon.fov.invalidate()
+
+    def run():
+        for x, y in positions:
+            dungeon.compute_fov(x, y, radius)
+    return run
+
+# Pathfinding
+
+@benchmark("astar.open", "pathfinding", number=20)
+def bench_astar_open():
+    finder = PathFinder(GRID_WIDTH, GRID_HEIGHT)
+    finder.set_walkable(bytearray([1]) * (GRID_WIDTH * GRID_HEIGHT))
+    return lambda: finder.find_path((0, 0), (GRID_WIDTH - 1, GRID_HEIGHT - 1))
+
+@benchmark("astar.maze", "pathfinding", number=20)
+def bench_astar_maze():
+    width = GRID_WIDTH + 1 if GRID_WIDTH % 2 == 0 else GRID_WIDTH
+    height = GRID_HEIGHT + 1 if GRID_HEIGHT % 2 == 0 else GRID_HEIGHT
+    grid = make_maze(width, height)
+    finder = PathFinder(width, height)
+    finder.set_walkable(bytearray(1 if cell else 0 for row in grid for cell in row))
+    return lambda: finder.find_path((1, 1), (width - 2, height - 2))
+
+@parametrize("paths.burst", "pathfinding", [{"requests": 15}, {"requests": 60}], number=20)
+def bench_path_burst(requests):
+    # One tick of a crowd that all starts chasing at once, on a large floor
+    dungeon = make_dungeon(GRID_WIDTH * 3, GRID_HEIGHT * 3)
+    spots = floor_positions(dungeon)
+    bursts = [(random.sample(spots, requests), random.choice(spots)) for _ in range(20)]
+    service = PathService(dungeon.get_pathfinder, PATH_SEARCH_BUDGET)
+    state = {"burst": 0}
+
+    def run():
+        starts, goal = bursts[state["burst"] % len(bursts)]
+        state["burst"] += 1
+        dungeon.pathfinder.cache.clear()
+        service.clear()
+        for requester, start in enumerate(starts):
+            service.request(requester, start, goal)
+        service.update()
+    return run
+
+@parametrize("paths.chase", "pathfinding", [{"floor": "maze", "incremental": False, "blocked": 0.0},
+                                             {"floor": "maze", "incremental": True, "blocked": 0.0},
+                                             {"floor": "dungeon", "incremental": False, "blocked": 0.0},
+                                             {"floor": "dungeon", "incremental": True, "blocked": 0.0},
+                                             {"floor": "dungeon", "incremental": False, "blocked": 0.2},
+                                             {"floor": "dungeon", "incremental": True, "blocked": 0.2}],
+             number=5)
+def bench_path_chase(floor, incremental, blocked):
+    # A long chase: the goal wanders a tile per turn while the chaser walks
+    # its path, finding its next step taken on a fraction of turns. A maze
+    # has a single route; a generated floor has rooms to step around in
+    if floor == "maze":
+        width = GRID_WIDTH + 1 if GRID_WIDTH % 2 == 0 else GRID_WIDTH
+        height = GRID_HEIGHT + 1 if GRID_HEIGHT % 2 == 0 else GRID_HEIGHT
+        grid = make_maze(width, height)
+        walkable = bytearray(1 if cell else 0 for row in grid for cell in row)
+        start = (1, 1)
+        goal = (width - 2, height - 2)
+        walk = []
+        for _ in range(60):
+            x, y = goal
+            options = [(x + dx, y + dy) for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)) if grid[y + dy][x + dx]]
+            goal = random.choice(options)
+            walk.append(goal)
+    else:
+        dungeon = make_dungeon()
+        width, height = dungeon.width, dungeon.height
+        walkable = dungeon.get_walkable_mask()
+        # Start the goal in the room furthest away by path
+        reference = PathFinder(width, height)
+        reference.set_walkable(walkable)
+        start = dungeon.rooms[0].center()
+        far = max(dungeon.rooms, key=lambda room: len(reference.find_path(start, room.center())))
+        walk = random_walk(dungeon, far.center(), 60)
+    blockers = [random.random() < blocked for _ in walk]
+
+    def run():
+        finder = IncrementalPathFinder(width, height) if incremental else PathFinder(width, height)
+        finder.set_walkable(walkable, 1)
+        position = start
+        taken = None
+        for goal, blocker in zip(walk, blockers):
+            path = finder.find_path(position, goal, taken)
+            taken = None
+            if len(path) > 3 and blocker:
+                step = path[1]
+                taken = {step[1] * width + step[0]}
+            elif len(path) > 2:
+                position = path[1]
+    return run
+
+@parametrize("paths.long", "pathfinding", [{"hierarchical": False}, {"hierarchical": True}], number=2)
+def bench_path_long(hierarchical):
+    # Cross-map paths on a large floor with many rooms
+    dungeon = Dungeon(GRID_WIDTH * 3, GRID_HEIGHT * 3, max_rooms=60, level=1)
+    walkable = dungeon.get_walkable_mask()
+    rooms = [(room.x, room.y, room.width, room.height) for room in dungeon.rooms]
+    finder = PathFinder(dungeon.width, dungeon.height, cache_size=0)
+    if hierarchical:
+        finder = HierarchicalPathFinder(finder)
+        finder.set_walkable(walkable, dungeon.grid.version, rooms)
+        finder.build(rooms)  # Time the queries, not the one-off graph build
+    else:
+        finder.set_walkable(walkable, dungeon.grid.version)
+
+    # Connected pairs at least a screen apart
+    reference = PathFinder(dungeon.width, dungeon.height)
+    reference.set_walkable(walkable)
+    spots = floor_positions(dungeon)
+    pairs = []
+    while len(pairs) < 20:
+        start, goal = random.sample(spots, 2)
+        if abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > GRID_WIDTH and reference.find_path(start, goal):
+            pairs.append((start, goal))
+
+    def run():
+        for start, goal in pairs:
+            finder.find_path(start, goal)
+    return run
+
+# Enemy AI
+
+@parametrize("enemy.update", "ai", [{"enemies": 10}, {"enemies": 50}, {"enemies": 200}], number=50)
+def bench_enemy_update(enemies):
+    dungeon = make_dungeon()
+    for enemy in dungeon.enemies[:]:
+        dungeon.remove_enemy(enemy)
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+
+    # Place the enemies on free floor tiles
+    spots = [pos for pos in floor_positions(dungeon) if pos != (player.x, player.y)]
+    for x, y in random.sample(spots, min(enemies, len(spots))):
+        dungeon.add_enemy(Enemy(x, y, random.choice(list(ENEMY_STATS.keys())), level=1))
+
+    def run():
+        for enemy in dungeon.enemies[:]:
+            enemy.update(player, dungeon)
+    return run
+
+@parametrize("ai.scheduler", "ai", [{"enemies": 50}, {"enemies": 200}, {"enemies": 800}], number=50)
+def bench_ai_scheduler(enemies):
+    # A large floor, so most enemies are far from the player
+    dungeon = make_dungeon(GRID_WIDTH * 3, GRID_HEIGHT * 3)
+    for enemy in dungeon.enemies[:]:
+        dungeon.remove_enemy(enemy)
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+
+    spots = [pos for pos in floor_positions(dungeon) if pos != (player.x, player.y)]
+    for x, y in random.sample(spots, min(enemies, len(spots))):
+        dungeon.add_enemy(Enemy(x, y, random.choice(list(ENEMY_STATS.keys())), level=1))
+
+    return lambda: dungeon.ai_scheduler.update(player, dungeon)
+
+# Rendering
+
+@benchmark("dungeon.render.static", "render", number=60)
+def bench_render_static():
+    screen = get_screen()
+    dungeon = make_dungeon()
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+    return lambda: dungeon.render(screen, player)
+
+@benchmark("dungeon.render.moving", "render", number=60)
+def bench_render_moving():
+    screen = get_screen()
+    dungeon = make_dungeon()
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+    walk = iter(random_walk(dungeon, (player.x, player.y), 60))
+
+    def run():
+        player.x, player.y = next(walk)
+        dungeon.update()
+        dungeon.render(screen, player)
+    return run
+
+@benchmark("hud.render.static", "render", number=60)
+def bench_hud_static():
+    from game.ui.hud import HUD
+    from game.quest_manager import QuestManager
+    screen = get_screen()
+    dungeon = make_dungeon()
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+    quest = QuestManager().generate_quest(1, dungeon.biome)
+    hud = HUD(screen)
+    theme = UI_COLORS.get(f"{dungeon.biome.name}_THEME", UI_COLORS["BACKGROUND"])
+    return lambda: hud.render(player, quest, 1, theme)
+
+@benchmark("hud.render.changing", "render", number=60)
+def bench_hud_changing():
+    from game.ui.hud import HUD
+    from game.quest_manager import QuestManager
+    screen = get_screen()
+    dungeon = make_dungeon()
+    player = Player(*dungeon.rooms[0].center())
+    player.dungeon = dungeon
+    quest = QuestManager().generate_quest(1, dungeon.biome)
+    hud = HUD(screen)
+    theme = UI_COLORS.get(f"{dungeon.biome.name}_THEME", UI_COLORS["BACKGROUND"])
+    walk = iter(random_walk(dungeon, (player.x, player.y), 60))
+
+    def run():
+        # Every frame changes the stats and minimap, so every widget redraws
+        player.x, player.y = next(walk)
+        player.health = player.health - 1 if player.health > 1 else player.max_health
+        player.xp += 1
+        hud.render(player, quest, 1, theme)
+    return run
+
+# Whole game
+
+@benchmark("session.turns", "game", number=1)
+def bench_session_turns():
+    from game.headless import RandomInputProvider, run_simulation
+    seed = random.getrandbits(32)
+    return lambda: run_simulation(RandomInputProvider(seed), max_turns=500, seed=seed)
+
+@benchmark("game.frame", "game", number=60)
+def bench_frame():
+    from game.session import GameSession
+    from game.ui.hud import HUD
+    screen = get_screen()
+    session = GameSession()
+    session.new_game()
+    hud = HUD(screen)
+    moves = iter([random.choice(("up", "down", "left", "right")) for _ in range(60)])
+
+    def run():
+        session.handle_action(next(moves))
+        session.update()
+        screen.fill(COLOR_BLACK)
+        session.dungeon.render(screen, session.player)
+        hud.render(session.player, session.quest_manager.active_quest, session.current_floor)
+    return run
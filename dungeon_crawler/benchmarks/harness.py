@@ -0,0 +1,187 @@
+import json
+import os
+import platform
+import random
+import statistics
+import time
+
+# Registered benchmarks, in definition order
+BENCHMARKS = []
+
+class Benchmark:
+    """
+    A named, seeded benchmark
+
+    The factory is called once per repeat, untimed, with the benchmark's
+    parameters and returns a callable; only the calls to that callable are
+    timed. The global random module is reseeded before every repeat so each
+    repeat measures exactly the same work.
+    """
+
+    def __init__(self, name, group, factory, params=None, number=1, seed=1234):
+        self.name = name
+        self.group = group
+        self.factory = factory
+        self.params = params or {}
+        self.number = number
+        self.seed = seed
+
+    def run(self, repeat=5, warmup=1):
+        """
+        Time the benchmark
+
+        Returns:
+            Dictionary with per-call timings in seconds
+        """
+        timings = []
+        for index in range(warmup + repeat):
+            random.seed(self.seed)
+            func = self.factory(**self.params)
+            start = time.perf_counter()
+            for _ in range(self.number):
+                func()
+            elapsed = (time.perf_counter() - start) / self.number
+            if index >= warmup:
+                timings.append(elapsed)
+
+        return {
+            "name": self.name,
+            "group": self.group,
+            "params": self.params,
+            "number": self.number,
+            "repeat": repeat,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        }
+
+def benchmark(name, group, number=1, seed=1234, params=None):
+    """Decorator registering a benchmark factory"""
+    def register(factory):
+        BENCHMARKS.append(Benchmark(name, group, factory, params, number, seed))
+        return factory
+    return register
+
+def parametrize(name, group, variants, number=1, seed=1234):
+    """Decorator registering one benchmark per parameter set, named name[key=value]"""
+    def register(factory):
+        for params in variants:
+            label = ",".join(f"{key}={value}" for key, value in params.items())
+            BENCHMARKS.append(Benchmark(f"{name}[{label}]", group, factory, params, number, seed))
+        return factory
+    return register
+
+def select(pattern=None):
+    """Get the registered benchmarks whose name or group contains a pattern"""
+    if not pattern:
+        return list(BENCHMARKS)
+    return [bench for bench in BENCHMARKS if pattern in bench.name or pattern in bench.group]
+
+def run_benchmarks(pattern=None, repeat=5, warmup=1, quiet=True, progress=None):
+    """
+    Run benchmarks and collect their results
+
+    Args:
+        pattern: Only run benchmarks whose name or group contains this text
+        repeat: Timed repeats per benchmark
+        warmup: Untimed repeats before timing
+        quiet: Only let game errors through the log while running
+        progress: Optional callback(result) after each benchmark
+
+    Returns:
+        Results document with environment metadata and a list of results
+    """
+    from game.log import LOG_MANAGER
+    previous_level = LOG_MANAGER.level
+    if quiet:
+        LOG_MANAGER.configure(level="error")
+
+    results = []
+    try:
+        for bench in select(pattern):
+            results.append(bench.run(repeat, warmup))
+            if progress:
+                progress(results[-1])
+    finally:
+        LOG_MANAGER.configure(level=previous_level)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": get_environment(),
+        "results": results,
+    }
+
+def get_environment():
+    """Describe the machine and library versions the numbers came from"""
+    environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import pygame
+        environment["pygame"] = pygame.version.ver
+    except ImportError:
+        pass
+    try:
+        import numpy
+        environment["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    return environment
+
+def save_results(document, path):
+    """Write a results document as JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+def load_results(path):
+    """Read a results document written by save_results"""
+    with open(path) as f:
+        return json.load(f)
+
+def compare(document, baseline, threshold=0.10):
+    """
+    Compare results against a baseline by median time
+
+    Args:
+        document: Results document for the current run
+        baseline: Results document to compare against
+        threshold: Relative slowdown that counts as a regression (0.10 = 10%)
+
+    Returns:
+        List of comparison rows, one per benchmark in the current run
+    """
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in document["results"]:
+        old = previous.get(result["name"])
+        row = {"name": result["name"], "median": result["median"],
+               "baseline": None, "change": None, "status": "new"}
+        if old and old["median"] > 0:
+            change = result["median"] / old["median"] - 1
+            row["baseline"] = old["median"]
+            row["change"] = change
+            if change > threshold:
+                row["status"] = "slower"
+            elif change < -threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "same"
+        rows.append(row)
+    return rows
+
+def format_time(seconds):
+    """Format a duration with a readable unit"""
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
@@ -5,6 +5,7 @@
 
 # Import important classes for easier access
 from .world.dungeon import Dungeon, Biome, Room
+from .world.grid import TileGrid
 from .player import Player
 from .enemy import Enemy
 from .item import Item
@@ -13,15 +14,17 @@ from .sound_manager import SoundManager
 from .quest_manager import QuestManager, Quest
 from .tile import Tile, TileType
 from .entity import Entity
+from .session import GameSession
+from .rng import RNGService
 
 # Import UI components
 from .ui import HUD, MainMenu, OptionsMenu, Button
 
 # Explicitly indicate what should be imported when using "from game import *"
 __all__ = [
-    'Dungeon', 'Biome', 'Room',
+    'Dungeon', 'Biome', 'Room', 'TileGrid',
     'Player', 'Enemy', 'Item',
     'GameState', 'SoundManager', 'QuestManager', 'Quest',
-    'Tile', 'TileType', 'Entity',
+    'Tile', 'TileType', 'Entity', 'GameSession', 'RNGService',
     'HUD', 'MainMenu', 'OptionsMenu', 'Button'
 ] 
\ No newline at end of file
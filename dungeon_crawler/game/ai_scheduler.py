@@ -0,0 +1,185 @@
+from .settings import *
+from .turn_queue import TurnQueue
+
+# Activity tiers
+ACTIVE = "active"
+DORMANT = "dormant"
+ASLEEP = "asleep"
+
+class AIScheduler:
+    """
+    Decides which enemies think, and when
+
+    Enemies within active_radius of the player, in the player's room, or
+    recently woken by noise are active. Enemies within dormant_radius are
+    dormant and act dormant_interval times less often. Everything farther
+    away is asleep and costs nothing. On crowded floors the tiers are found
+    with spatial index queries around the player, so the cost per tick
+    follows the number of nearby enemies, not the number on the floor; with
+    only a few enemies a single pass over them is cheaper.
+
+    Within the tiers, enemies only run when their next action is due: each
+    turn returns how long until the next one (from the enemy's speed), and
+    a TurnQueue wakes the enemy then. An idle enemy that comes within aggro
+    range of the player is pulled forward to act as soon as its move
+    cooldown allows. The active radius is at least the aggro range and the
+    view radius, so an enemy is always active before it can see or chase
+    the player.
+    """
+
+    def __init__(self, active_radius=AI_ACTIVE_RADIUS, dormant_radius=AI_DORMANT_RADIUS,
+                 dormant_interval=AI_DORMANT_INTERVAL, wake_ticks=AI_WAKE_TICKS, scan_limit=64):
+        self.active_radius = active_radius
+        self.dormant_radius = dormant_radius
+        self.dormant_interval = max(1, dormant_interval)
+        self.wake_ticks = wake_ticks
+        self.scan_limit = scan_limit  # Up to this many enemies, one linear pass beats spatial queries
+        self.tick = 0
+        self.queue = TurnQueue()  # Next turn of every enemy in range
+        self.woken = {}           # enemy -> tick it stays active until
+        self.dormant_ring = None  # Enemies within dormant_radius, found once per cycle
+
+        # Active enemies and turns taken on the last tick
+        self.counts = {ACTIVE: 0, "turns": 0}
+
+    def wake(self, dungeon, x, y, radius=AI_NOISE_RADIUS):
+        """Wake every enemy within a radius of a noise, keeping them active for a while"""
+        until = self.tick + self.wake_ticks
+        for enemy in dungeon.entities_in_radius(x, y, radius):
+            self.woken[enemy] = until
+
+    def get_player_room(self, player, dungeon):
+        """Get the room the player is standing in, or None in a corridor"""
+        for room in dungeon.rooms:
+            if room.x <= player.x < room.x + room.width and room.y <= player.y < room.y + room.height:
+                return room
+        return None
+
+    def add_woken(self, active, dungeon):
+        """Add enemies woken by noise to the active set, until their wake time runs out"""
+        for enemy, until in list(self.woken.items()):
+            if until < self.tick or enemy not in dungeon.enemy_index:
+                del self.woken[enemy]
+            else:
+                active[enemy] = None
+
+    def scan(self, player, dungeon):
+        """
+        Sort every enemy into a tier with one pass over the floor
+
+        Cheaper than spatial queries while the floor holds few enemies.
+
+        Returns:
+            (active, nearby): ordered dict of active enemies and a list of
+            the dormant ones
+        """
+        room = self.get_player_room(player, dungeon)
+        active_sq = self.active_radius * self.active_radius
+        dormant_sq = self.dormant_radius * self.dormant_radius
+        px, py = player.x, player.y
+        active = {}
+        nearby = []
+        for enemy in dungeon.enemies:
+            distance_sq = (enemy.x - px) ** 2 + (enemy.y - py) ** 2
+            if distance_sq <= active_sq or (room and room.x <= enemy.x < room.x + room.width
+                                            and room.y <= enemy.y < room.y + room.height):
+                active[enemy] = None
+            elif distance_sq <= dormant_sq:
+                nearby.append(enemy)
+        if self.woken:
+            self.add_woken(active, dungeon)
+        return active, nearby
+
+    def query(self, player, dungeon):
+        """
+        Find the tiers with spatial index queries around the player
+
+        Returns:
+            (active, nearby) as for scan(), except nearby may include active
+            enemies and is only refreshed once per dormant cycle
+        """
+        active = {}
+        for enemy in dungeon.entities_in_radius(player.x, player.y, self.active_radius):
+            active[enemy] = None
+
+        # Everyone in the player's room, however large the room
+        room = self.get_player_room(player, dungeon)
+        if room:
+            for enemy in dungeon.entities_in_rect(room.x, room.y,
+                                                  room.x + room.width - 1, room.y + room.height - 1):
+                active[enemy] = None
+
+        if self.woken:
+            self.add_woken(active, dungeon)
+
+        # Find the dormant ring once per cycle; each tick updates a slice of it
+        if self.tick % self.dormant_interval == 0 or self.dormant_ring is None:
+            self.dormant_ring = dungeon.entities_in_radius(player.x, player.y, self.dormant_radius)
+        return active, self.dormant_ring
+
+    def tier_of(self, enemy, player, dungeon):
+        """Get the tier an enemy is currently in"""
+        active, nearby = self.scan(player, dungeon)
+        if enemy in active:
+            return ACTIVE
+        if enemy in nearby:
+            return DORMANT
+        return ASLEEP
+
+    def update(self, player, dungeon):
+        """Run one tick of enemy AI"""
+        self.tick += 1
+        tick = self.tick
+        if len(dungeon.enemies) <= self.scan_limit:
+            active, nearby = self.scan(player, dungeon)
+        else:
+            active, nearby = self.query(player, dungeon)
+        queue = self.queue
+
+        # Active enemies without a turn get one; idle ones that could now
+        # reach the player act as soon as they are allowed to move
+        for enemy in active:
+            due = queue.due_tick(enemy)
+            if due is None:
+                if enemy.alive:
+                    in_range = enemy.euclidean_distance_to(player) <= enemy.aggro_range
+                    queue.schedule(enemy, tick if in_range else tick + enemy.wander_wait())
+            elif enemy.idle:
+                ready = max(tick, enemy.move_ready)
+                if due > ready and enemy.euclidean_distance_to(player) <= enemy.aggro_range:
+                    queue.schedule(enemy, ready)
+
+        # Once per cycle, dormant enemies that were asleep get a turn too
+        if tick % self.dormant_interval == 0:
+            for enemy in nearby:
+                if enemy.alive and enemy not in queue and enemy not in active:
+                    queue.schedule(enemy, tick + enemy.wander_wait() * self.dormant_interval)
+
+        # Take the turns that are due
+        dormant = None
+        turns = 0
+        for enemy in queue.pop_due(tick):
+            if enemy not in dungeon.enemy_index:
+                continue  # Removed from the floor
+            if enemy in active:
+                scale = 1
+            else:
+                if dormant is None:
+                    dormant = set(nearby)
+                if enemy not in dormant:
+                    continue  # Asleep: no new turn until it is back in range
+                scale = self.dormant_interval
+            delay = enemy.take_turn(player, dungeon, tick)
+            turns += 1
+            if delay is not None:
+                queue.schedule(enemy, tick + delay * scale)
+
+        self.counts[ACTIVE] = len(active)
+        self.counts["turns"] = turns
+
+    def update_all(self, player, dungeon):
+        """Update every enemy on the floor (scheduling disabled)"""
+        self.tick += 1
+        for enemy in dungeon.enemies[:]:  # Use a copy to safely modify during iteration
+            enemy.update(player, dungeon)
+        self.counts[ACTIVE] = self.counts["turns"] = len(dungeon.enemies)
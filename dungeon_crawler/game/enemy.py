@@ -1,17 +1,17 @@
 import pygame
-import random
 import math
 from .entity import Entity
+from .rng import get_stream
 from .settings import *
-from .pathfinding import astar
 
 class Enemy(Entity):
     """Enemy entity with AI movement and combat capabilities"""
     
-    def __init__(self, x, y, enemy_type, level=1):
+    def __init__(self, x, y, enemy_type, level=1, rngs=None):
         super().__init__(x, y)
         self.enemy_type = enemy_type
         self.level = level
+        self.rngs = rngs  # RNGService of the floor, or None for the global random module
         
         # Get base stats from settings based on enemy type
         base_stats = ENEMY_STATS.get(enemy_type, ENEMY_STATS["goblin"])
@@ -27,15 +27,55 @@ class Enemy(Entity):
         
         self.alive = True
         self.path = []
+        self.blocked_step = None  # Next step of the last path, if someone was standing on it
         self.aggro_range = 10
-        self.move_cooldown = 0
-        self.attack_cooldown = 0
+        
+        # Cooldowns are stored as the tick they end on, so waiting costs nothing
+        self.clock = 0        # Current tick as far as this enemy knows
+        self.move_ready = 0   # Tick the enemy may move again
+        self.attack_ready = 0
+        self.idle = True      # Last turn was spent wandering rather than chasing
         
         # Visual properties
         self.animation_frame = 0
         self.direction = "down"
         self.colors = self.get_enemy_colors()
         
+    @property
+    def move_cooldown(self):
+        """Ticks until the enemy may move again"""
+        return max(0, self.move_ready - self.clock)
+        
+    @move_cooldown.setter
+    def move_cooldown(self, ticks):
+        self.move_ready = self.clock + ticks
+        
+    @property
+    def attack_cooldown(self):
+        """Ticks until the enemy may attack again"""
+        return max(0, self.attack_ready - self.clock)
+        
+    @attack_cooldown.setter
+    def attack_cooldown(self, ticks):
+        self.attack_ready = self.clock + ticks
+        
+    def chase_delay(self):
+        """Ticks between steps while chasing (faster enemies move more often)"""
+        return max(1, int(20 * (1 - self.speed)))
+        
+    def wander_delay(self):
+        """Ticks between steps while wandering"""
+        return max(1, int(30 * (1 - self.speed)))
+        
+    def wander_wait(self):
+        """Ticks until the next wander step once the enemy is free to move
+        
+        Wandering used to be a 10% roll on every tick; this draws the number
+        of ticks until that roll succeeds (a geometric distribution) in one go.
+        """
+        roll = get_stream(self.rngs, "ai").random()
+        return 1 + int(math.log(1.0 - roll) / math.log(0.9))
+        
     def get_enemy_colors(self):
         """Get color scheme based on enemy type"""
         color_schemes = {
@@ -70,41 +110,116 @@ class Enemy(Entity):
         }
         return color_schemes.get(self.enemy_type, color_schemes["goblin"])
         
-    def update(self, player, dungeon):
-        """Update enemy state and AI"""
+    def update(self, player, dungeon, elapsed=1):
+        """Update enemy state and AI; elapsed is the number of ticks since the last update"""
         if not self.alive:
             return
             
-        # Reduce cooldowns
+        # Cooldowns run down as the clock advances
+        self.clock += elapsed
+        
+        # Out of aggro range the enemy wanders on a 10% roll each tick
+        if self.move_cooldown <= 0:
+            if (self.euclidean_distance_to(player) <= self.aggro_range
+                    or get_stream(self.rngs, "ai").random() < 0.1):
+                self.act(player, dungeon)
+                
+        # Update animation
+        self.animation_frame = (self.animation_frame + 0.15) % 4
+        
+    def take_turn(self, player, dungeon, tick):
+        """
+        Act on a scheduled turn (see AIScheduler)
+        
+        Does what update() would do on the first tick the enemy can act,
+        then says when it next needs a turn, so the ticks in between cost
+        nothing.
+        
+        Returns:
+            Ticks until the enemy's next turn, or None if it is dead
+        """
+        if not self.alive:
+            return None
+        elapsed = max(1, tick - self.clock)
+        self.clock = tick
+        self.animation_frame = (self.animation_frame + 0.15 * elapsed) % 4
+        
         if self.move_cooldown > 0:
-            self.move_cooldown -= 1
+            return self.move_cooldown
+        if self.euclidean_distance_to(player) <= self.aggro_range:
+            return self.act(player, dungeon)
             
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-            
-        # Check if player is in aggro range
-        distance_to_player = self.euclidean_distance_to(player)
+        # Wander after the ticks update() would spend rolling for it
+        if not self.idle:
+            # Just lost track of the player: wait for a wander roll first
+            self.idle = True
+            return self.wander_wait()
+        return self.act(player, dungeon) + self.wander_wait()
+        
+    def act(self, player, dungeon):
+        """
+        Take one action once the move cooldown is over
         
-        if distance_to_player <= self.aggro_range:
-            # Player is in range, try to pathfind
-            if not self.path and self.move_cooldown <= 0:
+        Chases the player when in aggro range and otherwise takes a random
+        step. The callers decide when that is; this only does it.
+        
+        Returns:
+            Ticks until the enemy may act again
+        """
+        if self.euclidean_distance_to(player) > self.aggro_range:
+            self.random_move(dungeon)
+            self.move_cooldown = self.wander_delay()
+            return self.move_cooldown
+            
+        self.idle = False
+        if self.is_adjacent_to(player):
+            # Stay engaged and check again next tick
+            return 1
+            
+        # Step downhill on the shared distance field toward the player
+        distance_map = dungeon.get_player_distance_map(player)
+        if distance_map.distance_at(self.x, self.y) is not None:
+            self.path = []
+            self.step_toward_player(distance_map, dungeon)
+        else:
+            # Out of reach of the distance field, pathfind on our own
+            if not self.path:
                 self.path = self.calculate_path_to_player(player, dungeon)
-                
-            # Try to move along path
-            if self.path and self.move_cooldown <= 0:
+            if self.path:
                 self.follow_path(dungeon)
-                self.move_cooldown = max(1, int(20 * (1 - self.speed)))  # Faster enemies move more frequently
-        else:
-            # Random wandering
-            if random.random() < 0.1 and self.move_cooldown <= 0:
-                self.random_move(dungeon)
-                self.move_cooldown = max(1, int(30 * (1 - self.speed)))
                 
-        # Update animation
-        self.animation_frame = (self.animation_frame + 0.15) % 4
+        # A step blocked by another enemy still spends the turn, so a
+        # crowd queued behind the front line does not retry every tick
+        self.move_cooldown = self.chase_delay()
+        return self.move_cooldown
                 
+    def step_toward_player(self, distance_map, dungeon):
+        """Take one step downhill on the player distance field"""
+        step = distance_map.next_step(
+            self.x, self.y,
+            lambda x, y: not self.is_valid_move(x, y, dungeon))
+        if step is None:
+            return False
+            
+        # Update direction based on movement
+        dx = step[0] - self.x
+        dy = step[1] - self.y
+        if dx != 0:
+            self.direction = "right" if dx > 0 else "left"
+        else:
+            self.direction = "down" if dy > 0 else "up"
+            
+        dungeon.move_entity(self, step[0], step[1])
+        return True
+        
     def calculate_path_to_player(self, player, dungeon):
-        """Calculate path to player using A* pathfinding"""
+        """
+        Get a path to the player from the dungeon's path service
+        
+        Searches are queued and run within a per-tick budget, so the first
+        call only submits the request and returns an empty path; the path
+        is picked up on a later turn.
+        """
         # Convert positions to tuples for pathfinding
         start = (self.x, self.y)
         goal = (player.x, player.y)
@@ -113,22 +228,21 @@ class Enemy(Entity):
         if self.is_adjacent_to(player):
             return []
         
-        # Create a walkable grid for pathfinding
-        walkable = [[dungeon.grid[y][x].type == 1 for x in range(GRID_WIDTH)] 
-                    for y in range(GRID_HEIGHT)]
-                    
-        # Make enemy positions unwalkable
-        for enemy in dungeon.enemies:
-            if enemy != self and enemy.alive and 0 <= enemy.y < GRID_HEIGHT and 0 <= enemy.x < GRID_WIDTH:
-                walkable[enemy.y][enemy.x] = False
-                
-        # Find path
-        path = astar(walkable, start, goal)
+        # Paths search over the terrain only. Other enemies are not baked in
+        # (so results can be cached and shared); follow_path drops the path
+        # if the next step turns out to be occupied.
+        service = dungeon.path_service
+        path = service.take(self)
+        if path is None or not path or path[0] != start:
+            # Nothing found yet, or found from a tile we have since left.
+            # Route around whoever blocked the last path.
+            avoid = (self.blocked_step,) if self.blocked_step and self.blocked_step != goal else ()
+            service.request(self, start, goal, avoid)
+            return []
+        self.blocked_step = None
         
         # Remove the first node, which is the current position
-        if path and len(path) > 1:
-            return path[1:]
-        return []
+        return path[1:]
         
     def follow_path(self, dungeon):
         """Move along calculated path"""
@@ -139,13 +253,13 @@ class Enemy(Entity):
         
         # Check if next position is valid
         if self.is_valid_move(next_pos[0], next_pos[1], dungeon):
-            self.x, self.y = next_pos
-            self.path.pop(0)
-            
             # Update direction based on movement
             dx = next_pos[0] - self.x
             dy = next_pos[1] - self.y
             
+            dungeon.move_entity(self, next_pos[0], next_pos[1])
+            self.path.pop(0)
+            
             if abs(dx) > abs(dy):
                 self.direction = "right" if dx > 0 else "left"
             else:
@@ -153,22 +267,22 @@ class Enemy(Entity):
                 
             return True
         else:
-            # Path is now invalid, clear it
+            # Path is now invalid, clear it and plan around the blocked step
+            self.blocked_step = next_pos
             self.path = []
             return False
             
     def random_move(self, dungeon):
         """Move in a random direction"""
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-        random.shuffle(directions)
+        get_stream(self.rngs, "ai").shuffle(directions)
         
         for dx, dy in directions:
             new_x = self.x + dx
             new_y = self.y + dy
             
             if self.is_valid_move(new_x, new_y, dungeon):
-                self.x = new_x
-                self.y = new_y
+                dungeon.move_entity(self, new_x, new_y)
                 
                 # Update direction
                 if dx > 0:
@@ -187,17 +301,17 @@ class Enemy(Entity):
     def is_valid_move(self, x, y, dungeon):
         """Check if a move is valid"""
         # Check boundaries
-        if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
+        if not (0 <= x < dungeon.width and 0 <= y < dungeon.height):
             return False
             
         # Check if tile is walkable
-        if dungeon.grid[y][x].type != 1:  # FLOOR
+        if dungeon.grid.get_type(x, y) != 1:  # FLOOR
             return False
             
         # Check for other enemies
-        for enemy in dungeon.enemies:
-            if enemy != self and enemy.alive and enemy.x == x and enemy.y == y:
-                return False
+        occupant = dungeon.entity_at(x, y)
+        if occupant is not None and occupant is not self:
+            return False
                 
         return True
         
@@ -206,7 +320,7 @@ class Enemy(Entity):
         if self.attack_cooldown > 0:
             return 0
             
-        damage = random.randint(self.base_damage - 5, self.base_damage + 5)
+        damage = get_stream(self.rngs, "combat").randint(self.base_damage - 5, self.base_damage + 5)
         self.attack_cooldown = 10
         return damage
         
@@ -281,12 +395,14 @@ class Enemy(Entity):
             "items": []
         }
         
+        rng = get_stream(self.rngs, "loot")
+        
         # Chance to drop health potion
-        if random.random() < 0.3:
+        if rng.random() < 0.3:
             loot["items"].append(("HEALTH_POTION", 20 + self.level * 5))
             
         # Chance to drop equipment based on enemy type and level
-        if random.random() < 0.05 * self.level:
+        if rng.random() < 0.05 * self.level:
             if self.enemy_type in ["skeleton", "orc", "frost_troll"]:
                 loot["items"].append(("WEAPON", 5 + self.level * 2))
             elif self.enemy_type in ["goblin", "lynx", "magma_elemental", "shadow_wraith"]:
@@ -10,6 +10,10 @@ class Entity:
         self.y = y
         self.id = id(self)  # Unique identifier
         
+        # Position at the start of the current simulation tick, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        
     def distance_to(self, other):
         """Calculate Manhattan distance to another entity"""
         return abs(self.x - other.x) + abs(self.y - other.y)
@@ -31,6 +35,25 @@ class Entity:
         self.x = x
         self.y = y
         
+    def begin_tick(self):
+        """Remember the current position as the start of a simulation tick"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
+    def interpolated_offset(self, camera_offset, alpha):
+        """Get a camera offset that draws this entity part way from its previous tile.
+        
+        Drawing code places entities at x * TILE_SIZE - offset, so shifting the
+        offset slides the entity between ticks without changing any draw code.
+        Jumps of more than one tile (teleports, new floors) are not smoothed.
+        """
+        dx = self.x - self.prev_x
+        dy = self.y - self.prev_y
+        if alpha >= 1.0 or (dx == 0 and dy == 0) or abs(dx) + abs(dy) > 1:
+            return camera_offset
+        back = (1.0 - alpha) * TILE_SIZE
+        return (camera_offset[0] + int(dx * back), camera_offset[1] + int(dy * back))
+        
     def draw(self, screen, camera_offset=(0, 0)):
         """Draw the entity (to be overridden by subclasses)"""
         # Default rendering as a simple rectangle
@@ -0,0 +1,383 @@
+"""
+Gym-style environments for training agents against the game
+
+DungeonEnv wraps one headless GameSession. VectorEnv steps many of them in
+one call and writes observations into preallocated NumPy arrays:
+
+    tiles     (N, H, W)     uint8    tile type values
+    visible   (N, H, W)     uint8    1 where the tile is in the player's view
+    entities  (N, 3, H, W)  uint8    player, enemy and item channels
+    stats     (N, S)        float32  STAT_FIELDS for each player
+
+Environments can be stepped serially, on a thread pool or on worker
+processes that write straight into shared-memory observation buffers.
+"""
+
+import random
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .session import GameSession, ACTIONS
+from .settings import *
+
+# Entity channels in the entities observation
+ENTITY_CHANNELS = ("player", "enemy", "item")
+PLAYER_CHANNEL = 0
+ENEMY_CHANNEL = 1
+ITEM_CHANNEL = 2
+
+# Player stats in the stats observation, in order
+STAT_FIELDS = ("health", "max_health", "mana", "level", "xp", "score", "gold",
+               "floor", "x", "y", "turn")
+
+# Reward shaping
+FLOOR_REWARD = 10.0
+DEATH_PENALTY = -10.0
+
+# Per-step arrays shared with process workers, alongside the observations
+ACTION_SPECS = {
+    "actions": ((), np.int64),
+    "rewards": ((), np.float32),
+    "terminated": ((), np.bool_),
+    "truncated": ((), np.bool_),
+}
+
+def observation_spec(width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Get the (shape, dtype) of each observation array for one environment"""
+    return {
+        "tiles": ((height, width), np.uint8),
+        "visible": ((height, width), np.uint8),
+        "entities": ((len(ENTITY_CHANNELS), height, width), np.uint8),
+        "stats": ((len(STAT_FIELDS),), np.float32),
+    }
+
+def allocate_observations(num_envs, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Allocate zeroed batched observation arrays"""
+    return {name: np.zeros((num_envs,) + shape, dtype=dtype)
+            for name, (shape, dtype) in observation_spec(width, height).items()}
+
+class DungeonEnv:
+    """
+    One headless game exposed as reset()/step(action)
+
+    Observations are written in place into the arrays given to bind() (or
+    private ones allocated on first use), so stepping does not build new
+    observation objects. Actions are indices into session.ACTIONS.
+    """
+
+    def __init__(self, seed=None, max_turns=1000, floor=1):
+        self.max_turns = max_turns
+        self.start_floor = floor
+        self.seed_stream = random.Random(seed)
+        self.episode_seed = None
+        self.session = None
+        self.observation = None
+        self.last_score = 0
+        self.last_floor = floor
+
+    def bind(self, observation):
+        """Write observations into the given arrays (one environment's slice)"""
+        self.observation = observation
+
+    def reset(self):
+        """Start a new game and write its first observation"""
+        if self.observation is None:
+            self.observation = {name: array[0] for name, array in allocate_observations(1).items()}
+
+        # Each episode gets its own seed from the environment's seed stream
+        self.episode_seed = self.seed_stream.getrandbits(32)
+
+        self.session = GameSession(visual_effects=False, seed=self.episode_seed)
+        self.session.current_floor = self.start_floor
+        self.session.new_game()
+        self.last_score = self.session.player.score
+        self.last_floor = self.session.current_floor
+        self.write_observation()
+        return self.observation
+
+    def step(self, action):
+        """
+        Apply one action and advance the game by one turn
+
+        Returns:
+            (reward, terminated, truncated)
+        """
+        session = self.session
+        session.handle_action(ACTIONS[action])
+        session.update()
+
+        player = session.player
+        reward = float(player.score - self.last_score)
+        reward += FLOOR_REWARD * (session.current_floor - self.last_floor)
+        self.last_score = player.score
+        self.last_floor = session.current_floor
+
+        terminated = session.game_over
+        if terminated:
+            reward += DEATH_PENALTY
+        truncated = not terminated and session.turn >= self.max_turns
+
+        self.write_observation()
+        return reward, terminated, truncated
+
+    def write_observation(self):
+        """Copy the current game state into the bound observation arrays"""
+        session = self.session
+        dungeon = session.dungeon
+        player = session.player
+        grid = dungeon.grid
+        obs = self.observation
+        shape = obs["tiles"].shape
+
+        dungeon.compute_fov(player.x, player.y, dungeon.visibility_radius)
+        obs["tiles"][:] = np.frombuffer(grid.types, dtype=np.uint8).reshape(shape)
+        obs["visible"][:] = np.frombuffer(grid.visible, dtype=np.uint8).reshape(shape)
+
+        entities = obs["entities"]
+        entities.fill(0)
+        entities[PLAYER_CHANNEL, player.y, player.x] = 1
+        for enemy in dungeon.enemies:
+            entities[ENEMY_CHANNEL, enemy.y, enemy.x] = 1
+        for item in dungeon.items:
+            entities[ITEM_CHANNEL, item.y, item.x] = 1
+
+        stats = obs["stats"]
+        stats[0] = player.health
+        stats[1] = player.max_health
+        stats[2] = player.mana
+        stats[3] = player.level
+        stats[4] = player.xp
+        stats[5] = player.score
+        stats[6] = player.gold
+        stats[7] = session.current_floor
+        stats[8] = player.x
+        stats[9] = player.y
+        stats[10] = session.turn
+
+def _step_envs(envs, actions, rewards, terminated, truncated, infos, indices):
+    """Step a group of environments, auto-resetting finished ones"""
+    for i in indices:
+        env = envs[i]
+        reward, done, cut = env.step(int(actions[i]))
+        rewards[i] = reward
+        terminated[i] = done
+        truncated[i] = cut
+        if done or cut:
+            infos[i] = env.session.get_summary()
+            infos[i]["seed"] = env.episode_seed
+            env.reset()
+
+def _worker(connection, names, num_envs, start, count, seed, max_turns, floor):
+    """Process backend worker: owns envs [start, start + count) and writes to shared memory"""
+    from multiprocessing import shared_memory
+    blocks = {}
+    try:
+        arrays = {}
+        specs = observation_spec()
+        specs.update(ACTION_SPECS)
+        for name, block_name in names.items():
+            shape, dtype = specs[name]
+            blocks[name] = shared_memory.SharedMemory(name=block_name)
+            arrays[name] = np.ndarray((num_envs,) + shape, dtype=dtype, buffer=blocks[name].buf)
+
+        envs = {}
+        for i in range(start, start + count):
+            envs[i] = DungeonEnv(None if seed is None else seed + i, max_turns, floor)
+            envs[i].bind({name: arrays[name][i] for name in observation_spec()})
+        indices = range(start, start + count)
+
+        while True:
+            command = connection.recv()
+            if command == "reset":
+                for i in indices:
+                    envs[i].reset()
+                connection.send(None)
+            elif command == "step":
+                infos = {}
+                _step_envs(envs, arrays["actions"], arrays["rewards"], arrays["terminated"],
+                           arrays["truncated"], infos, indices)
+                connection.send(infos)
+            elif command == "close":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Drop array views before detaching from the shared blocks
+        arrays = None
+        for block in blocks.values():
+            block.close()
+        connection.close()
+
+class VectorEnv:
+    """
+    Many independent dungeons stepped together
+
+    reset() returns the batched observation dict; step(actions) returns
+    (observations, rewards, terminated, truncated, infos) like a Gymnasium
+    vector environment. The returned arrays are reused by every call, so
+    copy them if they must outlive the next step. Finished games are reset
+    automatically and their summary is reported in infos.
+
+    Backends:
+        "serial": step every environment in the calling thread
+        "thread": split environments across a thread pool
+        "process": split environments across worker processes that write
+            observations into shared memory (Python 3.8+)
+
+    Every game draws from its own seeded random streams, so a seeded run
+    gives the same games with every backend.
+    """
+
+    def __init__(self, num_envs, backend="serial", num_workers=None, seed=None,
+                 max_turns=1000, floor=1):
+        if backend not in ("serial", "thread", "process"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.num_envs = num_envs
+        self.backend = backend
+        self.num_workers = max(1, min(num_envs, num_workers or multiprocessing.cpu_count()))
+        self.num_actions = len(ACTIONS)
+        self.closed = False
+
+        # Environment index ranges handled by each worker
+        size, extra = divmod(num_envs, self.num_workers)
+        self.chunks = []
+        start = 0
+        for worker in range(self.num_workers):
+            count = size + (1 if worker < extra else 0)
+            self.chunks.append((start, count))
+            start += count
+
+        self.blocks = {}
+        self.envs = None
+        self.pool = None
+        self.workers = []
+        self.connections = []
+
+        if backend == "process":
+            self.create_shared_arrays()
+            context = multiprocessing.get_context()
+            names = {name: block.name for name, block in self.blocks.items()}
+            for start, count in self.chunks:
+                parent, child = context.Pipe()
+                process = context.Process(target=_worker, daemon=True,
+                                          args=(child, names, num_envs, start, count,
+                                                seed, max_turns, floor))
+                process.start()
+                child.close()
+                self.workers.append(process)
+                self.connections.append(parent)
+        else:
+            self.observations = allocate_observations(num_envs)
+            self.actions = np.zeros(num_envs, dtype=np.int64)
+            self.rewards = np.zeros(num_envs, dtype=np.float32)
+            self.terminated = np.zeros(num_envs, dtype=np.bool_)
+            self.truncated = np.zeros(num_envs, dtype=np.bool_)
+            self.envs = [DungeonEnv(None if seed is None else seed + i, max_turns, floor)
+                         for i in range(num_envs)]
+            for i, env in enumerate(self.envs):
+                env.bind({name: array[i] for name, array in self.observations.items()})
+            if backend == "thread":
+                self.pool = ThreadPoolExecutor(max_workers=self.num_workers)
+
+    def create_shared_arrays(self):
+        """Allocate observation and step arrays in shared memory"""
+        # Only the process backend needs shared memory (Python 3.8+)
+        from multiprocessing import shared_memory
+        specs = observation_spec()
+        specs.update(ACTION_SPECS)
+        arrays = {}
+        for name, (shape, dtype) in specs.items():
+            shape = (self.num_envs,) + shape
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.blocks[name] = block
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            arrays[name].fill(0)
+
+        self.observations = {name: arrays[name] for name in observation_spec()}
+        self.actions = arrays["actions"]
+        self.rewards = arrays["rewards"]
+        self.terminated = arrays["terminated"]
+        self.truncated = arrays["truncated"]
+
+    def reset(self):
+        """Start a new game in every environment"""
+        if self.backend == "process":
+            for connection in self.connections:
+                connection.send("reset")
+            for connection in self.connections:
+                connection.recv()
+        elif self.backend == "thread":
+            list(self.pool.map(lambda chunk: [self.envs[i].reset()
+                                              for i in range(chunk[0], chunk[0] + chunk[1])],
+                               self.chunks))
+        else:
+            for env in self.envs:
+                env.reset()
+        return self.observations, {}
+
+    def step(self, actions):
+        """
+        Advance every environment by one turn
+
+        Args:
+            actions: Sequence of num_envs action indices (into ACTIONS)
+
+        Returns:
+            (observations, rewards, terminated, truncated, infos), where infos
+            maps the index of each finished environment to its game summary
+        """
+        self.actions[:] = actions
+        infos = {}
+        if self.backend == "process":
+            for connection in self.connections:
+                connection.send("step")
+            for connection in self.connections:
+                infos.update(connection.recv())
+        elif self.backend == "thread":
+            list(self.pool.map(lambda chunk: _step_envs(
+                self.envs, self.actions, self.rewards, self.terminated, self.truncated,
+                infos, range(chunk[0], chunk[0] + chunk[1])), self.chunks))
+        else:
+            _step_envs(self.envs, self.actions, self.rewards, self.terminated,
+                       self.truncated, infos, range(self.num_envs))
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def close(self):
+        """Stop workers and release shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.pool:
+            self.pool.shutdown()
+        for connection in self.connections:
+            try:
+                connection.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+
+        # Array views must go before the shared blocks can be released
+        self.observations = None
+        self.actions = self.rewards = self.terminated = self.truncated = None
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
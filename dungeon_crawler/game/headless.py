@@ -0,0 +1,157 @@
+"""
+Headless simulation runner
+
+Drives a GameSession turn by turn from an input provider, with no window,
+audio or menus. Usable as a library (run_simulation) or from the command
+line:
+
+    python -m game.headless --runs 10 --turns 2000 --seed 42 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from .session import GameSession, ACTIONS
+from .replay import InputRecorder
+from .log import configure as configure_logging
+
+class InputProvider:
+    """Supplies one player action per turn to a headless session"""
+
+    def reset(self, session):
+        """Called once before the first turn of a run"""
+        pass
+
+    def next_action(self, session):
+        """Get the action for this turn, or None to end the run"""
+        raise NotImplementedError
+
+class RandomInputProvider(InputProvider):
+    """Picks uniformly random moves, with an occasional item use"""
+
+    def __init__(self, seed=None, use_item_chance=0.02):
+        self.rng = random.Random(seed)
+        self.use_item_chance = use_item_chance
+
+    def next_action(self, session):
+        if self.rng.random() < self.use_item_chance:
+            return "use_item"
+        return self.rng.choice(("up", "down", "left", "right"))
+
+class IdleInputProvider(InputProvider):
+    """Never moves; useful for measuring how the world runs on its own"""
+
+    def next_action(self, session):
+        return "wait"
+
+class ScriptedInputProvider(InputProvider):
+    """Plays back a fixed list of actions, then ends the run"""
+
+    def __init__(self, actions):
+        for action in actions:
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown action: {action}")
+        self.actions = list(actions)
+        self.position = 0
+
+    def reset(self, session):
+        self.position = 0
+
+    def next_action(self, session):
+        if self.position >= len(self.actions):
+            return None
+        action = self.actions[self.position]
+        self.position += 1
+        return action
+
+def run_simulation(provider, max_turns=1000, seed=None, floor=1, visual_effects=False, record_path=None):
+    """
+    Play one game without a display
+
+    Args:
+        provider: InputProvider choosing the player's actions
+        max_turns: Stop after this many turns even if the player is alive
+        seed: Seed for the game's random number generator (None for random)
+        floor: Floor to start on
+        visual_effects: Also update particles and floating text
+        record_path: Save an input recording of the run here (see game.replay)
+
+    Returns:
+        Dictionary summarising the run (see GameSession.get_summary)
+    """
+    recorder = InputRecorder() if record_path else None
+    session = GameSession(visual_effects=visual_effects, seed=seed, recorder=recorder)
+    session.current_floor = floor
+    session.new_game()
+    provider.reset(session)
+
+    start_time = time.perf_counter()
+    while session.turn < max_turns and not session.game_over:
+        action = provider.next_action(session)
+        if action is None:
+            break
+        # Applied at the start of the tick, exactly as the windowed game does
+        session.queue_action(action)
+        session.update()
+
+    if recorder:
+        recorder.save(record_path, session)
+
+    summary = session.get_summary()
+    summary["seed"] = seed
+    summary["elapsed"] = time.perf_counter() - start_time
+    return summary
+
+def make_provider(policy, seed):
+    """Create an input provider from a command line policy name"""
+    if policy == "random":
+        return RandomInputProvider(seed)
+    elif policy == "idle":
+        return IdleInputProvider()
+    raise ValueError(f"Unknown policy: {policy}")
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run Epic Dungeon Crawler without a display")
+    parser.add_argument("--runs", type=int, default=1, help="number of games to play")
+    parser.add_argument("--turns", type=int, default=1000, help="maximum turns per game")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the first game")
+    parser.add_argument("--floor", type=int, default=1, help="floor to start on")
+    parser.add_argument("--policy", choices=("random", "idle"), default="random",
+                        help="how the player chooses actions")
+    parser.add_argument("--effects", action="store_true",
+                        help="also simulate particles and floating text")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="save an input recording of each run to this directory")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    parser.add_argument("--verbose", action="store_true", help="show game log output")
+    args = parser.parse_args(argv)
+
+    # Keep game log messages out of the results unless asked
+    if not args.verbose:
+        configure_logging(level="warning")
+
+    results = []
+    for run in range(args.runs):
+        seed = args.seed + run if args.seed is not None else None
+        provider = make_provider(args.policy, seed)
+
+        record_path = os.path.join(args.record, f"run_{run + 1}.json") if args.record else None
+        result = run_simulation(provider, args.turns, seed, args.floor, args.effects, record_path)
+        results.append(result)
+
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"Run {run + 1}: {result['turns']} turns, floor {result['floor']}, "
+                  f"level {result['level']}, score {result['score']}, "
+                  f"health {result['health']}, "
+                  f"{'died' if result['game_over'] else 'alive'} "
+                  f"({result['elapsed']:.2f}s)")
+
+    return results
+
+if __name__ == "__main__":
+    main()
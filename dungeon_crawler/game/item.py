@@ -3,6 +3,9 @@ import random
 import math
 from .entity import Entity
 from .settings import *
+from .log import get_logger
+
+log = get_logger("items")
 
 class Item(Entity):
     """Game item that can be picked up and used by the player"""
@@ -204,8 +207,8 @@ class Item(Entity):
             screen.blit(glow_surface, (screen_x, screen_y))
             
     @classmethod
-    def create_random_item(cls, x, y, level=1, force_type=None, biome_name="CAVERN"):
-        """Create a random item appropriate for the given level"""
+    def create_random_item(cls, x, y, level=1, force_type=None, biome_name="CAVERN", rng=None):
+        """Create a random item appropriate for the given level (rolled with rng, default the random module)"""
         item_pool = []
         
         # Filter items by level
@@ -259,7 +262,7 @@ class Item(Entity):
         item_names = [name for name, _ in item_pool]
         
         try:
-            selected_item = random.choices(item_names, weights=weights, k=1)[0]
+            selected_item = (rng or random).choices(item_names, weights=weights, k=1)[0]
             item_data = ITEM_EFFECTS[selected_item]
             
             # Determine item type and effect value based on the selected item
@@ -290,7 +293,7 @@ class Item(Entity):
             return item
             
         except (IndexError, ValueError) as e:
-            print(f"Error creating random item: {e}")
+            log.error("Error creating random item: %s", e)
             # Fallback to a basic health potion
             return cls(x, y, "HEALTH_POTION", 50, "health_potion_small", "common")
     
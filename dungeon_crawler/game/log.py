@@ -0,0 +1,299 @@
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from .settings import *
+
+# Log levels, lowest first
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR", OFF: "OFF"}
+LEVELS = {name.lower(): level for level, name in LEVEL_NAMES.items()}
+
+def parse_level(level):
+    """Get a numeric level from a number or a name such as "debug" """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}")
+
+class LogWriter:
+    """
+    Background thread writing log lines from a bounded ring buffer
+
+    Callers only append to an in-memory deque; the thread drains it in
+    batches and does the actual stream writes. If the buffer fills faster
+    than it drains, the oldest lines are dropped and counted rather than
+    blocking the game.
+    """
+
+    def __init__(self, stream=None, capacity=4096):
+        self.stream = stream
+        self.buffer = deque(maxlen=capacity)
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.busy = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the writer thread if it is not running"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, line):
+        """Queue a line for writing"""
+        with self.condition:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(line)
+            self.condition.notify_all()
+
+    def take(self):
+        """Remove and return everything queued (caller holds the condition)"""
+        lines = list(self.buffer)
+        self.buffer.clear()
+        if self.dropped:
+            lines.insert(0, f"[log] {self.dropped} messages dropped (log buffer full)")
+            self.dropped = 0
+        return lines
+
+    def run(self):
+        """Writer thread: drain the buffer in batches until stopped"""
+        while True:
+            with self.condition:
+                while not self.buffer and self.running:
+                    self.condition.wait()
+                if not self.buffer:
+                    return
+                lines = self.take()
+                self.busy = True
+            self.emit(lines)
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def emit(self, lines):
+        """Write a batch of lines to the stream"""
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def flush(self, timeout=2.0):
+        """Wait until everything queued so far has been written"""
+        if not self.running:
+            # No writer thread: write synchronously
+            with self.condition:
+                lines = self.take()
+            if lines:
+                self.emit(lines)
+            return
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.buffer or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+    def stop(self):
+        """Write what is left and stop the thread"""
+        if self.running:
+            with self.condition:
+                self.running = False
+                self.condition.notify_all()
+            self.thread.join(timeout=2.0)
+        self.flush()
+
+class RateLimiter:
+    """Allows a burst of identical messages per interval and counts the rest"""
+
+    def __init__(self, burst=5, interval=1.0):
+        self.burst = burst
+        self.interval = interval
+        self.windows = {}  # key -> [window start, count, suppressed]
+
+    def check(self, key, now):
+        """
+        Decide whether a message may be logged
+
+        Returns:
+            (allowed, suppressed), where suppressed is how many copies were
+            dropped in the previous window (reported once it closes)
+        """
+        window = self.windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self.windows[key] = [now, 1, 0]
+            if len(self.windows) > 1024:
+                self.windows.clear()
+                self.windows[key] = [now, 1, 0]
+            return True, suppressed
+        if window[1] < self.burst:
+            window[1] += 1
+            return True, 0
+        window[2] += 1
+        return False, 0
+
+class LogManager:
+    """
+    Project-wide logging configuration
+
+    Each module gets a Logger for its category. A message is only
+    formatted and queued when its level is at or above the category's
+    level (or the default level), so debug calls in hot paths cost a
+    single comparison while debugging is off.
+    """
+
+    def __init__(self):
+        self.level = INFO
+        self.category_levels = {}
+        self.loggers = {}
+        self.writer = LogWriter()
+        self.limiter = RateLimiter()
+        self.lock = threading.Lock()
+        self.show_time = True
+
+    def get_logger(self, category):
+        """Get the logger for a category"""
+        logger = self.loggers.get(category)
+        if logger is None:
+            logger = Logger(self, category)
+            self.loggers[category] = logger
+        return logger
+
+    def level_for(self, category):
+        """Get the effective level for a category"""
+        return self.category_levels.get(category, self.level)
+
+    def configure(self, level=None, categories=None, stream=None, rate_limit=None):
+        """
+        Change logging settings
+
+        Args:
+            level: Default level (number or name)
+            categories: Dictionary of category -> level overriding the default
+            stream: File-like object to write to (default: sys.stdout at write time)
+            rate_limit: (burst, interval) for identical messages
+        """
+        if level is not None:
+            self.level = parse_level(level)
+        if categories is not None:
+            self.category_levels = {name: parse_level(value) for name, value in categories.items()}
+        if stream is not None:
+            self.writer.flush()
+            self.writer.stream = stream
+        if rate_limit is not None:
+            self.limiter = RateLimiter(*rate_limit)
+        for logger in self.loggers.values():
+            logger.level = self.level_for(logger.category)
+
+    def configure_from_string(self, spec):
+        """Apply a spec like "debug" or "info,world=debug,sound=off" """
+        level = None
+        categories = dict(self.category_levels)
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if "=" in part:
+                name, value = part.split("=", 1)
+                categories[name.strip()] = value
+            else:
+                level = part
+        self.configure(level, categories)
+
+    def log(self, category, level, message, args, exc_text=None):
+        """Format and queue a message (called by Logger after the level check)"""
+        now = time.time()
+        with self.lock:
+            allowed, suppressed = self.limiter.check((category, level, message), now)
+        if not allowed:
+            return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = " ".join(str(part) for part in (message,) + tuple(args))
+        prefix = time.strftime("%H:%M:%S ", time.localtime(now)) if self.show_time else ""
+        line = f"{prefix}{LEVEL_NAMES.get(level, level)} [{category}] {message}"
+        if suppressed:
+            line += f" ({suppressed} similar messages suppressed)"
+        if exc_text:
+            line += "\n" + exc_text.rstrip()
+        self.writer.start()
+        self.writer.write(line)
+
+    def flush(self):
+        """Wait for queued messages to be written"""
+        self.writer.flush()
+
+    def shutdown(self):
+        """Write remaining messages and stop the writer thread"""
+        self.writer.stop()
+
+class Logger:
+    """Logger for one category; messages use %-style arguments formatted lazily"""
+
+    __slots__ = ("manager", "category", "level")
+
+    def __init__(self, manager, category):
+        self.manager = manager
+        self.category = category
+        self.level = manager.level_for(category)
+
+    def is_enabled(self, level):
+        """Check whether messages at a level would be logged"""
+        return level >= self.level
+
+    def debug(self, message, *args):
+        if DEBUG >= self.level:
+            self.manager.log(self.category, DEBUG, message, args)
+
+    def info(self, message, *args):
+        if INFO >= self.level:
+            self.manager.log(self.category, INFO, message, args)
+
+    def warning(self, message, *args):
+        if WARNING >= self.level:
+            self.manager.log(self.category, WARNING, message, args)
+
+    def error(self, message, *args):
+        if ERROR >= self.level:
+            self.manager.log(self.category, ERROR, message, args)
+
+    def exception(self, message, *args):
+        """Log an error with the traceback of the exception being handled"""
+        if ERROR >= self.level:
+            self.manager.log(self.category, ERROR, message, args, traceback.format_exc())
+
+# Shared manager for the whole game
+LOG_MANAGER = LogManager()
+LOG_MANAGER.configure(ADVANCED_SETTINGS.get("LOG_LEVEL", "info"),
+                      ADVANCED_SETTINGS.get("LOG_CATEGORIES", {}))
+if os.environ.get("DUNGEON_LOG"):
+    LOG_MANAGER.configure_from_string(os.environ["DUNGEON_LOG"])
+atexit.register(LOG_MANAGER.shutdown)
+
+def get_logger(category):
+    """Get the shared logger for a category"""
+    return LOG_MANAGER.get_logger(category)
+
+def configure(level=None, categories=None, stream=None, rate_limit=None):
+    """Change the shared logging settings (see LogManager.configure)"""
+    LOG_MANAGER.configure(level, categories, stream, rate_limit)
@@ -1,97 +1,1086 @@
 import heapq
 import math
+from array import array
+from collections import OrderedDict
+
+# Distance of cells not reached by a search
+INFINITY = float("inf")
 
 def heuristic(a, b):
     """Manhattan distance heuristic"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+class PathFinder:
+    """
+    Reusable A* search over a flat walkable mask
+
+    Score buffers are flat arrays indexed by y * width + x and are shared
+    between searches; a generation counter marks which entries belong to
+    the current search so nothing has to be cleared. Results are kept in a
+    small LRU cache keyed by (start, goal, grid version).
+    """
+
+    def __init__(self, width, height, cache_size=256):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cache_size = cache_size
+
+        # Per-search buffers, reused across calls
+        self.g_score = array('I', bytes(4 * self.size))
+        self.came_from = array('i', bytes(4 * self.size))
+        self.seen = array('I', bytes(4 * self.size))
+        self.closed = array('I', bytes(4 * self.size))
+        self.generation = 0
+
+        # Walkable mask and the map version it was taken from
+        self.walkable = bytearray(self.size)
+        self.version = None
+
+        # Recent search results
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Statistics for the most recent search
+        self.last_expanded = 0
+
+    def set_walkable(self, walkable, version=None):
+        """
+        Load the walkable mask to search on
+
+        Args:
+            walkable: Flat mask (y * width + x) where truthy means walkable
+            version: Map version the mask belongs to. Results are only
+                cached when a version is given.
+        """
+        if version is not None and version == self.version:
+            return
+        self.walkable = walkable
+        self.version = version
+        self.cache.clear()
+
+    def find_path(self, start, goal, blocked=None):
+        """
+        Find the shortest path from start to goal
+
+        Args:
+            start: Tuple (x, y) of starting position
+            goal: Tuple (x, y) of goal position
+            blocked: Optional set of flat indices to treat as walls for this
+                search only (such results are not cached)
+
+        Returns:
+            List of (x, y) tuples representing the path from start to goal,
+            or empty list if no path found
+        """
+        width = self.width
+        height = self.height
+
+        if (not (0 <= start[0] < width and 0 <= start[1] < height) or
+            not (0 <= goal[0] < width and 0 <= goal[1] < height)):
+            return []
+
+        if start == goal:
+            return [start]
+
+        goal_index = goal[1] * width + goal[0]
+        walkable = self.walkable
+        if not walkable[goal_index] or (blocked and goal_index in blocked):
+            return []
+
+        use_cache = self.version is not None and not blocked
+        if use_cache:
+            key = (start, goal, self.version)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.cache_hits += 1
+                return list(cached)
+            self.cache_misses += 1
+
+        path = self._search(start, goal, blocked)
+
+        if use_cache:
+            self.cache[key] = tuple(path)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return path
+
+    def _search(self, start, goal, blocked):
+        """Run A* with lazy-deletion heap entries"""
+        width = self.width
+        size = self.size
+        walkable = self.walkable
+        g_score = self.g_score
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+
+        self.generation += 1
+        generation = self.generation
+
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        goal_x, goal_y = goal
+
+        # Direction of the straight line from start to goal, used to break
+        # ties between equally good nodes in favour of the straight route
+        line_dx = start[0] - goal_x
+        line_dy = start[1] - goal_y
+
+        g_score[start_index] = 0
+        seen[start_index] = generation
+        came_from[start_index] = -1
+
+        h = abs(line_dx) + abs(line_dy)
+        open_set = [(h, 0, h, start_index)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
+
+        while open_set:
+            _, _, _, current = heappop(open_set)
+
+            # Skip stale entries for nodes that were already expanded
+            if closed[current] == generation:
+                continue
+            closed[current] = generation
+            expanded += 1
+
+            if current == goal_index:
+                self.last_expanded = expanded
+                return self._reconstruct(current)
+
+            tentative_g = g_score[current] + 1
+            x = current % width
+
+            for neighbor in (current - width if current >= width else -1,
+                             current + 1 if x < width - 1 else -1,
+                             current + width if current < size - width else -1,
+                             current - 1 if x > 0 else -1):
+                if neighbor < 0 or not walkable[neighbor] or closed[neighbor] == generation:
+                    continue
+                if blocked and neighbor in blocked:
+                    continue
+                if seen[neighbor] == generation and tentative_g >= g_score[neighbor]:
+                    continue
+
+                seen[neighbor] = generation
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+
+                nx = neighbor % width
+                ny = neighbor // width
+                h = abs(nx - goal_x) + abs(ny - goal_y)
+                cross = abs((nx - goal_x) * line_dy - (ny - goal_y) * line_dx)
+                heappush(open_set, (tentative_g + h, cross, h, neighbor))
+
+        self.last_expanded = expanded
+        return []
+
+    def _reconstruct(self, index):
+        """Walk the came_from chain back to the start"""
+        width = self.width
+        came_from = self.came_from
+        path = []
+        while index != -1:
+            path.append((index % width, index // width))
+            index = came_from[index]
+        path.reverse()
+        return path
+
+class IncrementalPathFinder:
+    """
+    Lifelong Planning A* (LPA*) search that repairs its tree between calls
+
+    The search is rooted at the searcher's start and keeps its g and rhs
+    values between calls. Distances from the root do not depend on the
+    goal, so when the goal moves the search carries on from where it
+    stopped; as in D* Lite, a key modifier keeps the old open list keys
+    valid as lower bounds, and they are corrected as they are popped
+    instead of re-sorting the list. When a cell becomes blocked or free,
+    only the part of the tree that depended on it is repaired, and the
+    walk back from the goal stops where it meets the previous path.
+    While the searcher walks along its own path, the tree stays
+    rooted where it started and the path is cut at the searcher's
+    position; the search is only rebuilt when the searcher leaves the
+    path, has walked reroot_after steps from the root, or the map changes.
+
+    D* Lite keeps the goal fixed and lets the start move; here it is the
+    goal (the player) that keeps moving, so the tree is rooted at the
+    start instead.
+    """
+
+    def __init__(self, width, height, reroot_after=64):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.reroot_after = reroot_after
+
+        # Walkable mask and the map version it was taken from
+        self.walkable = bytearray(self.size)
+        self.version = None
+
+        # Search state: root and goal indices, cells blocked for this
+        # searcher only, and the LPA* values of the cells seen so far
+        self.root = None
+        self.goal = None
+        self.blocked = frozenset()
+        self.g = {}
+        self.rhs = {}
+        self.open = {}   # index -> key of its live heap entry
+        self.heap = []   # (key, index)
+        self.key_modifier = 0  # Total distance the goal moved since the tree was started
+
+        # Last path found (cell indices from the root), while it is still valid
+        self.last_path = None
+        self.last_steps = None  # index -> position in last_path
+
+        # Statistics
+        self.last_expanded = 0
+        self.rebuilds = 0
+        self.repairs = 0
+
+    def set_walkable(self, walkable, version=None):
+        """Load the walkable mask to search on, dropping the tree if the map changed"""
+        if version is not None and version == self.version:
+            return
+        self.walkable = walkable
+        self.version = version
+        self.root = None
+
+    def find_path(self, start, goal, blocked=None):
+        """
+        Find the shortest path from start to goal, reusing the previous search
+
+        Args:
+            start: Tuple (x, y) of starting position
+            goal: Tuple (x, y) of goal position
+            blocked: Optional set of flat indices to treat as walls (for
+                example a tile another enemy is standing on)
+
+        Returns:
+            List of (x, y) tuples representing the path from start to goal,
+            or empty list if no path found
+        """
+        width = self.width
+        if (not (0 <= start[0] < width and 0 <= start[1] < self.height) or
+            not (0 <= goal[0] < width and 0 <= goal[1] < self.height)):
+            return []
+        if start == goal:
+            return [start]
+
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        blocked = frozenset(blocked) if blocked else frozenset()
+        self.last_expanded = 0
+
+        if self.root is None or self.root in blocked:
+            # No tree yet, or its root is now a wall: start over from here
+            self.reset(start_index, goal_index, blocked)
+        else:
+            if blocked != self.blocked:
+                changed = blocked ^ self.blocked
+                self.blocked = blocked
+                for index in changed:
+                    self.update_cell(index)
+            if goal_index != self.goal:
+                self.move_goal(goal_index)
+            self.repairs += 1
+
+        path = self.search()
+        if start_index != self.root:
+            # Walked on from the root: reuse the tree if we are still on the path
+            if (not path and self.g.get(goal_index, INFINITY) == INFINITY
+                    and self.g.get(start_index, INFINITY) != INFINITY):
+                return []  # The root reaches us but not the goal, so neither can we
+            position = path.index(start) if start in path else -1
+            if 0 < position <= self.reroot_after:
+                return path[position:]
+            self.reset(start_index, goal_index, blocked)
+            path = self.search()
+        return path
+
+    def reset(self, root, goal, blocked):
+        """Start a new search tree at a root"""
+        self.root = root
+        self.goal = goal
+        self.blocked = blocked
+        self.g = {}
+        self.rhs = {root: 0}
+        self.open = {}
+        self.heap = []
+        self.key_modifier = 0
+        self.last_path = None
+        self.push(root)
+        self.rebuilds += 1
+
+    def passable(self, index):
+        """Check whether a cell can be entered in this search"""
+        return self.walkable[index] and index not in self.blocked
+
+    def key(self, index):
+        """Get the LPA* priority of a cell"""
+        best = min(self.g.get(index, INFINITY), self.rhs.get(index, INFINITY))
+        goal = self.goal
+        width = self.width
+        h = abs(index % width - goal % width) + abs(index // width - goal // width)
+        return (best + h + self.key_modifier, best)
+
+    def push(self, index):
+        """Put a cell on the open list with its current key"""
+        key = self.key(index)
+        self.open[index] = key
+        heapq.heappush(self.heap, (key, index))
+
+    def update_vertex(self, index):
+        """Recompute a cell's one-step lookahead value and its place on the open list"""
+        g = self.g
+        rhs = self.rhs
+        if index != self.root:
+            if self.walkable[index] and index not in self.blocked:
+                width = self.width
+                x = index % width
+                best = INFINITY
+                for neighbor in (index - width if index >= width else -1,
+                                 index + 1 if x < width - 1 else -1,
+                                 index + width if index < self.size - width else -1,
+                                 index - 1 if x > 0 else -1):
+                    if neighbor >= 0:
+                        distance = g.get(neighbor, INFINITY)
+                        if distance < best:
+                            best = distance
+                rhs[index] = best + 1
+            else:
+                rhs[index] = INFINITY
+        if g.get(index, INFINITY) != rhs.get(index, INFINITY):
+            self.push(index)
+        else:
+            self.open.pop(index, None)
+
+    def update_cell(self, index):
+        """Repair the tree after a cell became blocked or free"""
+        if index != self.root:
+            self.update_vertex(index)
+            self.last_path = None  # Distances along it may have changed
+
+    def move_goal(self, goal):
+        """Aim the search at a new goal without re-sorting the open list"""
+        width = self.width
+        old = self.goal
+        self.key_modifier += abs(goal % width - old % width) + abs(goal // width - old // width)
+        self.goal = goal
+
+    def search(self):
+        """Expand cells until the goal's distance is settled, then walk back to the root"""
+        goal = self.goal
+        if not self.passable(goal):
+            return []
+
+        g = self.g
+        rhs = self.rhs
+        open_cells = self.open
+        heap = self.heap
+        heappop = heapq.heappop
+        expanded = 0
+
+        width = self.width
+        size = self.size
+        walkable = self.walkable
+        blocked = self.blocked
+        root = self.root
+        goal_x = goal % width
+        goal_y = goal // width
+        key_modifier = self.key_modifier
+        heappush = heapq.heappush
+
+        while heap:
+            key, index = heap[0]
+            if open_cells.get(index) != key:
+                heappop(heap)  # Stale entry
+                continue
+            goal_g = g.get(goal, INFINITY)
+            goal_rhs = rhs.get(goal, INFINITY)
+            if goal_g == goal_rhs and key >= (goal_g + key_modifier, goal_g):
+                break
+            g_value = g.get(index, INFINITY)
+            rhs_value = rhs.get(index, INFINITY)
+            best = g_value if g_value < rhs_value else rhs_value
+            x = index % width
+            new_key = (best + abs(x - goal_x) + abs(index // width - goal_y) + key_modifier, best)
+            if key < new_key:
+                # Keyed before the goal moved: put it back in its right place
+                open_cells[index] = new_key
+                heapq.heapreplace(heap, (new_key, index))
+                continue
+            heappop(heap)
+            del open_cells[index]
+            expanded += 1
+
+            if g_value > rhs_value:
+                # Overconsistent: the cell's distance went down, settle it and
+                # offer the shorter route to its neighbours
+                g[index] = rhs_value
+                distance = rhs_value + 1
+                for neighbor in (index - width if index >= width else -1,
+                                 index + 1 if x < width - 1 else -1,
+                                 index + width if index < size - width else -1,
+                                 index - 1 if x > 0 else -1):
+                    if (neighbor < 0 or neighbor == root or not walkable[neighbor]
+                            or neighbor in blocked or distance >= rhs.get(neighbor, INFINITY)):
+                        continue
+                    rhs[neighbor] = distance
+                    if g.get(neighbor, INFINITY) != distance:
+                        new_key = (distance + abs(neighbor % width - goal_x) + abs(neighbor // width - goal_y)
+                                   + key_modifier, distance)
+                        open_cells[neighbor] = new_key
+                        heappush(heap, (new_key, neighbor))
+                    else:
+                        open_cells.pop(neighbor, None)
+            else:
+                # Underconsistent: the cell's distance went up, start it over
+                # along with the neighbours whose route ran through it
+                g[index] = INFINITY
+                self.update_vertex(index)
+                through = g_value + 1
+                for neighbor in (index - width if index >= width else -1,
+                                 index + 1 if x < width - 1 else -1,
+                                 index + width if index < size - width else -1,
+                                 index - 1 if x > 0 else -1):
+                    if neighbor >= 0 and neighbor != root and rhs.get(neighbor) == through:
+                        self.update_vertex(neighbor)
+
+        self.last_expanded += expanded
+        if g.get(goal, INFINITY) == INFINITY:
+            return []
+        return self.extract()
+
+    def extract(self):
+        """
+        Follow decreasing distances from the goal back to the root
+
+        Distances from the root only change when cells do, so until then
+        the walk stops as soon as it meets the previous path and reuses
+        that path's start.
+        """
+        width = self.width
+        g = self.g
+        root = self.root
+        last_steps = self.last_steps if self.last_path is not None else None
+        index = self.goal
+        distance = g[index]
+        walked = [index]
+        while index != root:
+            if last_steps is not None and index in last_steps:
+                walked.pop()
+                cells = self.last_path[:last_steps[index] + 1]
+                break
+            x = index % width
+            best = None
+            best_distance = distance
+            for neighbor in (index - width if index >= width else -1,
+                             index + 1 if x < width - 1 else -1,
+                             index + width if index < self.size - width else -1,
+                             index - 1 if x > 0 else -1):
+                if neighbor >= 0 and self.passable(neighbor):
+                    neighbor_distance = g.get(neighbor, INFINITY)
+                    if neighbor_distance < best_distance:
+                        best = neighbor
+                        best_distance = neighbor_distance
+            if best is None:
+                return []  # Not a settled chain of distances; should not happen
+            index = best
+            distance = best_distance
+            walked.append(index)
+        else:
+            cells = []
+
+        walked.reverse()
+        cells.extend(walked)
+        self.last_path = cells
+        self.last_steps = {cell: i for i, cell in enumerate(cells)}
+        return [(cell % width, cell // width) for cell in cells]
+
+class HierarchicalPathFinder:
+    """
+    Two-level search over rooms and the corridors between them
+
+    Rooms are regions and every run of room cells that opens onto a
+    corridor is a portal. Distances between the portals of a room, and
+    along the corridors from one portal to the next, are found once per
+    map version together with the tiles they run over. A long query first
+    links its start and goal to the portals of the room or corridor they
+    are in, then searches the small portal graph, and the path is put
+    together from the stored tiles, so no tile-level search is needed
+    between the two ends. Short queries, and anything the portal graph
+    cannot answer, go to the tile-level finder. The graph is only built
+    once a query is long enough to use it.
+
+    Routes are only optimal between portals, so a path can be longer than
+    the shortest one; joined paths are shortcut so no tile is visited twice.
+    """
+
+    def __init__(self, finder, local_range=24):
+        self.finder = finder            # PathFinder for short searches
+        self.width = finder.width
+        self.height = finder.height
+        self.size = finder.size
+        self.local_range = local_range  # Manhattan distance up to which the tile search is used
+
+        # Map the graph is for, and whether it has been built yet
+        self.walkable = finder.walkable
+        self.version = None
+        self.regions = []
+        self.built = False
+
+        # Portal graph
+        self.region_of = array('h', [-1]) * self.size  # Cell -> room index, -1 outside rooms
+        self.portals = []          # Portal -> representative cell
+        self.portal_at = {}        # Exit cell -> portal of its run
+        self.run_steps = {}        # Exit cell -> next cell toward its portal's representative (-1 there)
+        self.runs = []             # Portal -> exit cells of its run, nearest the representative first
+        self.region_portals = []   # Room -> its portals
+        self.edges = []            # Portal -> [(other portal, cost, cells after this portal)]
+
+        # Statistics
+        self.last_expanded = 0
+        self.graph_searches = 0
+        self.local_searches = 0
+
+    def set_walkable(self, walkable, version=None, regions=()):
+        """
+        Load the map to search on, rebuilding the portal graph if it changed
+
+        Args:
+            walkable: Flat mask (y * width + x) where truthy means walkable
+            version: Map version the mask belongs to
+            regions: Rooms as (x, y, width, height) rectangles
+        """
+        self.finder.set_walkable(walkable, version)
+        if version is not None and version == self.version:
+            return
+        self.walkable = walkable
+        self.version = version
+        self.regions = list(regions)
+        self.built = False
+
+    def build(self, regions):
+        """Find the portals and the distances between them"""
+        self.built = True
+        width = self.width
+        walkable = self.walkable
+        region_of = array('h', [-1]) * self.size
+        for region, (x0, y0, w, h) in enumerate(regions):
+            for y in range(max(0, y0), min(self.height, y0 + h)):
+                row = y * width
+                for x in range(max(0, x0), min(width, x0 + w)):
+                    region_of[row + x] = region
+        self.region_of = region_of
+        self.portals = []
+        self.portal_at = {}
+        self.run_steps = {}
+        self.runs = []
+        self.region_portals = [[] for _ in regions]
+
+        # Room cells with a walkable neighbour outside the room, grouped
+        # into connected runs; each run is one portal
+        for region, (x0, y0, w, h) in enumerate(regions):
+            exits = set()
+            for y in range(max(0, y0), min(self.height, y0 + h)):
+                row = y * width
+                for x in range(max(0, x0), min(width, x0 + w)):
+                    i = row + x
+                    if walkable[i] and any(region_of[n] != region and walkable[n] for n in self.neighbors(i)):
+                        exits.add(i)
+            for i in sorted(exits):
+                if i in self.portal_at:
+                    continue
+                run = [i]
+                seen = {i}
+                for cell in run:
+                    for n in self.neighbors(cell):
+                        if n in exits and n not in seen:
+                            seen.add(n)
+                            run.append(n)
+                run.sort()
+                self.add_portal(region, run[len(run) // 2], seen)
+
+        # Room edges: walk from each portal to the others of its room
+        self.edges = [[] for _ in self.portals]
+        for region, portals in enumerate(self.region_portals):
+            for portal in portals:
+                parents = self.flood(self.portals[portal], lambda n: region_of[n] == region)
+                for other in portals:
+                    target = self.portals[other]
+                    if other != portal and target in parents:
+                        cells = self.trace(parents, target)
+                        self.edges[portal].append((other, len(cells), cells))
+
+        # Corridor edges: walk the corridors leaving each portal's run
+        for portal, cell in enumerate(self.portals):
+            for other, cells in self.corridor_links(cell, portal).items():
+                self.edges[portal].append((other, len(cells), cells))
+
+    def add_portal(self, region, cell, run):
+        """Add a portal for a run of exit cells, with steps from each to the representative"""
+        portal = len(self.portals)
+        self.portals.append(cell)
+        self.region_portals[region].append(portal)
+        self.run_steps[cell] = -1
+        self.portal_at[cell] = portal
+        frontier = [cell]
+        for current in frontier:
+            for n in self.neighbors(current):
+                if n in run and n not in self.portal_at:
+                    self.portal_at[n] = portal
+                    self.run_steps[n] = current
+                    frontier.append(n)
+        self.runs.append(frontier)
+
+    def neighbors(self, index):
+        """Get the orthogonal neighbours of a cell inside the map"""
+        width = self.width
+        x = index % width
+        result = []
+        if index >= width:
+            result.append(index - width)
+        if x < width - 1:
+            result.append(index + 1)
+        if index < self.size - width:
+            result.append(index + width)
+        if x > 0:
+            result.append(index - 1)
+        return result
+
+    def flood(self, source, inside):
+        """
+        Breadth-first search over walkable cells accepted by inside()
+
+        Returns:
+            Dictionary of reached cell -> previous cell (-1 for sources)
+        """
+        walkable = self.walkable
+        parents = {source: -1}
+        frontier = list(parents)
+        for current in frontier:
+            for n in self.neighbors(current):
+                if n not in parents and walkable[n] and inside(n):
+                    parents[n] = current
+                    frontier.append(n)
+        self.last_expanded += len(parents)
+        return parents
+
+    def trace(self, parents, cell):
+        """Get the cells from a flood's source (exclusive) to a cell (inclusive)"""
+        cells = []
+        while parents[cell] != -1:
+            cells.append(cell)
+            cell = parents[cell]
+        cells.reverse()
+        return cells
+
+    def corridor_links(self, cell, portal=None):
+        """
+        Find the portals reachable through the corridors next to a cell
+
+        Starts from the corridor cells beside the cell, or beside every
+        cell of the portal's run when a portal is given.
+
+        Returns:
+            Dictionary of portal -> cells from the start (exclusive) to
+            that portal's representative (inclusive), shortest first found
+        """
+        region_of = self.region_of
+        walkable = self.walkable
+        portal_at = self.portal_at
+        if portal is None:
+            parents = {cell: -1}
+            frontier = [cell]
+        else:
+            # Leave through any cell of the run, walking along the run first
+            parents = {c: self.run_steps[c] for c in self.runs[portal]}
+            frontier = []
+            for c in self.runs[portal]:
+                for n in self.neighbors(c):
+                    if n not in parents and walkable[n] and region_of[n] == -1:
+                        parents[n] = c
+                        frontier.append(n)
+
+        links = {}
+        for current in frontier:
+            for n in self.neighbors(current):
+                if n in parents or not walkable[n]:
+                    continue
+                if region_of[n] == -1:
+                    parents[n] = current
+                    frontier.append(n)
+                else:
+                    other = portal_at.get(n)
+                    if other is not None and other != portal and other not in links:
+                        cells = self.trace(parents, current) + [n]
+                        while self.run_steps[n] != -1:
+                            n = self.run_steps[n]
+                            cells.append(n)
+                        links[other] = cells
+        self.last_expanded += len(parents)
+        return links
+
+    def links(self, cell):
+        """Get the portals a cell can reach without passing another portal, with the cells to each"""
+        region = self.region_of[cell]
+        if region == -1:
+            return self.corridor_links(cell)
+        parents = self.flood(cell, lambda n: self.region_of[n] == region)
+        links = {}
+        for portal in self.region_portals[region]:
+            target = self.portals[portal]
+            if target in parents:
+                links[portal] = self.trace(parents, target)
+        return links
+
+    def find_path(self, start, goal, blocked=None):
+        """
+        Find a path from start to goal, over the portal graph when they are far apart
+
+        Args:
+            start: Tuple (x, y) of starting position
+            goal: Tuple (x, y) of goal position
+            blocked: Optional set of flat indices to treat as walls; the
+                path is repaired around them with a short tile search
+
+        Returns:
+            List of (x, y) tuples representing the path from start to goal,
+            or empty list if no path found
+        """
+        self.last_expanded = 0
+        width = self.width
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        if heuristic(start, goal) <= self.local_range:
+            return self.local_search(start, goal, blocked)
+        if not self.built:
+            self.build(self.regions)  # Counted in last_expanded, like a search
+        if (not self.portals
+                or not (0 <= start[0] < width and 0 <= start[1] < self.height)
+                or not (0 <= goal[0] < width and 0 <= goal[1] < self.height)
+                or not self.walkable[start_index] or not self.walkable[goal_index]
+                or (self.region_of[start_index] == self.region_of[goal_index] != -1)):
+            return self.local_search(start, goal, blocked)
+
+        cells = self.search(start_index, goal_index)
+        if cells is None:
+            return self.local_search(start, goal, blocked)
+        self.graph_searches += 1
+        if not cells:
+            return []
+        cells = self.shortcut([start_index] + cells)
+        path = [(cell % width, cell // width) for cell in cells]
+
+        if blocked:
+            # Step around blocked cells with a short search to just past the last one
+            last = max((i for i, cell in enumerate(cells) if cell in blocked), default=-1)
+            if last >= 0:
+                if last + 1 >= len(cells):
+                    return []  # The goal itself is blocked
+                detour = self.local_search(start, path[last + 1], blocked)
+                if not detour or len(detour) > last + 6:
+                    # No way past nearby (a blocked corridor): plan the whole path around it
+                    return self.local_search(start, goal, blocked)
+                cells = self.shortcut([x + y * width for x, y in detour] + cells[last + 2:])
+                path = [(cell % width, cell // width) for cell in cells]
+        return path
+
+    def shortcut(self, cells):
+        """
+        Drop detours from a joined path
+
+        Pieces joined at portal representatives can walk into a run and
+        back, or into a room and out again. From each cell, jump to the
+        last cell further on that is the same tile or next to it, so no
+        tile is visited twice.
+        """
+        last = {cell: i for i, cell in enumerate(cells)}
+        result = []
+        i = 0
+        end = len(cells) - 1
+        while True:
+            cell = cells[i]
+            i = last[cell]  # Skip any loop back to this tile
+            result.append(cell)
+            if i == end:
+                return result
+            furthest = i + 1
+            for neighbor in self.neighbors(cell):
+                later = last.get(neighbor, -1)
+                if later > furthest:
+                    furthest = later
+            i = furthest
+
+    def local_search(self, start, goal, blocked):
+        """Search tile by tile"""
+        self.local_searches += 1
+        self.finder.last_expanded = 0
+        path = self.finder.find_path(start, goal, blocked)
+        self.last_expanded += self.finder.last_expanded
+        return path
+
+    def search(self, start, goal):
+        """
+        A* over the portal graph between two cells
+
+        Returns:
+            Cells after the start up to and including the goal, an empty
+            list if there is no path, or None if an end is not linked to
+            the portal graph (a corridor that leads to no room)
+        """
+        start_links = self.links(start)
+        goal_links = self.links(goal)
+        if not start_links or not goal_links:
+            return None
+
+        width = self.width
+        goal_x = goal % width
+        goal_y = goal // width
+        portals = self.portals
+        goal_cost = {portal: len(cells) for portal, cells in goal_links.items()}
+
+        # Node -1 stands for the goal
+        best = {}
+        came_from = {}
+        open_set = []
+        for portal, cells in start_links.items():
+            cost = len(cells)
+            best[portal] = cost
+            came_from[portal] = (None, cells)
+            cell = portals[portal]
+            heapq.heappush(open_set, (cost + abs(cell % width - goal_x) + abs(cell // width - goal_y), cost, portal))
+
+        expanded = 0
+        while open_set:
+            _, cost, portal = heapq.heappop(open_set)
+            if portal == -1:
+                break
+            if cost > best.get(portal, INFINITY):
+                continue
+            expanded += 1
+            if portal in goal_cost:
+                total = cost + goal_cost[portal]
+                if total < best.get(-1, INFINITY):
+                    best[-1] = total
+                    came_from[-1] = (portal, self.reverse_link(goal_links[portal], goal))
+                    heapq.heappush(open_set, (total, total, -1))
+            for other, edge_cost, cells in self.edges[portal]:
+                total = cost + edge_cost
+                if total < best.get(other, INFINITY):
+                    best[other] = total
+                    came_from[other] = (portal, cells)
+                    cell = portals[other]
+                    heapq.heappush(open_set, (total + abs(cell % width - goal_x) + abs(cell // width - goal_y),
+                                              total, other))
+        self.last_expanded += expanded
+        if -1 not in came_from:
+            # Both ends are linked and the graph holds every link between
+            # rooms, so nothing connects them
+            return []
+
+        # Join the stored cells of each step, goal first
+        pieces = []
+        node = -1
+        while node is not None:
+            node, cells = came_from[node]
+            pieces.append(cells)
+        result = []
+        for cells in reversed(pieces):
+            result.extend(cells)
+        return result
+
+    def reverse_link(self, cells, goal):
+        """Turn the cells from the goal to a portal into the cells from that portal to the goal"""
+        if not cells:
+            return []  # The goal is the portal itself
+        return list(reversed(cells[:-1])) + [goal]
+
+class PathService:
+    """
+    Queue of path requests answered within a per-tick search budget
+
+    Requesters submit a start and goal and collect the path on a later
+    tick, so a crowd that starts chasing at once spreads its searches over
+    several ticks instead of all running in one. Requests are answered
+    nearest first. A requester has at most one pending request, and
+    asking again for the same goal keeps it; once a path is found, every
+    other request for the same goal whose start lies on it is answered
+    with the rest of that path.
+
+    The budget is counted in A* node expansions rather than milliseconds,
+    so the same requests are answered on the same ticks on every machine
+    and replays stay deterministic. A search is never split: one that
+    overruns the budget is finished and the overrun is taken from the
+    next tick's budget.
+
+    With incremental set, each requester keeps an IncrementalPathFinder
+    between requests, so chasing a goal that moves a tile at a time, or
+    stepping around a tile another enemy is standing on, repairs the
+    previous search instead of starting over. Requests longer than
+    incremental_range go to the shared finder instead (which is cheaper
+    for long paths when it is a HierarchicalPathFinder).
+    """
+
+    def __init__(self, get_finder, budget=2000, incremental=False, incremental_range=None):
+        self.get_finder = get_finder  # Callable returning a path finder loaded with the current map
+        self.budget = budget          # Node expansions per tick
+        self.incremental = incremental
+        self.incremental_range = incremental_range
+        self.debt = 0                 # Expansions overspent on earlier ticks
+        self.queue = []               # Heap of (priority, sequence, requester)
+        self.pending = {}             # requester -> (start, goal, avoid, sequence)
+        self.by_goal = {}             # goal -> requesters waiting on it
+        self.results = {}             # requester -> path found for it
+        self.planners = {}            # requester -> its IncrementalPathFinder
+        self.sequence = 0
+
+        # Statistics
+        self.searches = 0
+        self.shared = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def request(self, requester, start, goal, avoid=()):
+        """
+        Ask for a path from start to goal; collect it with take() on a later tick
+
+        Args:
+            requester: Any hashable owner of the request (an enemy)
+            start: Tuple (x, y) of starting position
+            goal: Tuple (x, y) of goal position
+            avoid: Positions to treat as walls for this request only
+        """
+        avoid = tuple(avoid)
+        entry = self.pending.get(requester)
+        if entry is not None:
+            if entry[:3] == (start, goal, avoid):
+                return
+            self.cancel(requester)
+        self.results.pop(requester, None)
+        self.sequence += 1
+        self.pending[requester] = (start, goal, avoid, self.sequence)
+        self.by_goal.setdefault(goal, set()).add(requester)
+        heapq.heappush(self.queue, (heuristic(start, goal), self.sequence, requester))
+
+    def is_pending(self, requester):
+        """Check whether a requester is still waiting for a path"""
+        return requester in self.pending
+
+    def take(self, requester):
+        """Collect a requester's path, or None if it has not been found yet"""
+        return self.results.pop(requester, None)
+
+    def cancel(self, requester):
+        """Drop a requester's pending request and any path waiting for it"""
+        self.results.pop(requester, None)
+        entry = self.pending.pop(requester, None)
+        if entry is not None:
+            waiting = self.by_goal.get(entry[1])
+            if waiting is not None:
+                waiting.discard(requester)
+                if not waiting:
+                    del self.by_goal[entry[1]]
+
+    def release(self, requester):
+        """Forget a requester entirely, including its incremental search"""
+        self.cancel(requester)
+        self.planners.pop(requester, None)
+
+    def clear(self):
+        """Drop every request, result and incremental search"""
+        self.queue = []
+        self.pending.clear()
+        self.by_goal.clear()
+        self.results.clear()
+        self.planners.clear()
+        self.debt = 0
+
+    def update(self):
+        """Answer requests in priority order until this tick's budget is spent"""
+        budget = self.budget - self.debt
+        queue = self.queue
+        finder = None
+        while queue and budget > 0:
+            _, sequence, requester = heapq.heappop(queue)
+            entry = self.pending.get(requester)
+            if entry is None or entry[3] != sequence:
+                continue  # Cancelled or replaced
+
+            start, goal, avoid, _ = entry
+            if finder is None:
+                finder = self.get_finder()
+            searcher = finder
+            if self.incremental and (self.incremental_range is None
+                                     or heuristic(start, goal) <= self.incremental_range):
+                searcher = self.get_planner(requester, finder)
+            blocked = {y * finder.width + x for x, y in avoid} if avoid else None
+            searcher.last_expanded = 0
+            path = searcher.find_path(start, goal, blocked)
+            budget -= searcher.last_expanded
+            self.searches += 1
+            self.answer(requester, path)
+
+            # Others heading for the same goal from a tile on this path share it
+            if len(path) > 2 and goal in self.by_goal:
+                steps = {position: i for i, position in enumerate(path)}
+                for other in sorted(self.by_goal[goal], key=lambda r: self.pending[r][3]):
+                    i = steps.get(self.pending[other][0])
+                    if i is not None:
+                        self.answer(other, path[i:])
+                        self.shared += 1
+        self.debt = max(0, -budget)
+
+    def get_planner(self, requester, finder):
+        """Get a requester's incremental search, loaded with the finder's map"""
+        planner = self.planners.get(requester)
+        if planner is None:
+            planner = IncrementalPathFinder(finder.width, finder.height)
+            self.planners[requester] = planner
+        planner.set_walkable(finder.walkable, finder.version)
+        return planner
+
+    def answer(self, requester, path):
+        """Hand a found path to a requester and retire its request"""
+        self.cancel(requester)
+        self.results[requester] = path
+
+# Search engines shared by astar() calls, keyed by grid size, with the grid each last loaded
+_shared_finders = {}
+
 def astar(grid, start, goal):
     """
     A* pathfinding algorithm to find the shortest path from start to goal
-    
+
     Args:
         grid: 2D array where True means walkable, False means wall
         start: Tuple (x, y) of starting position
         goal: Tuple (x, y) of goal position
-        
+
     Returns:
         List of (x, y) tuples representing the path from start to goal,
         or empty list if no path found
+
+    The walkable mask is only rebuilt when a different grid object is
+    passed, so pass a new grid (not the same one edited) after the map changes.
     """
-    # Check if start or goal are invalid
     grid_height = len(grid)
     grid_width = len(grid[0]) if grid_height > 0 else 0
-    
-    if (not (0 <= start[0] < grid_width and 0 <= start[1] < grid_height) or
-        not (0 <= goal[0] < grid_width and 0 <= goal[1] < grid_height)):
+    if grid_width == 0:
         return []
-        
-    if start == goal:
-        return [start]
-        
-    # If goal is not walkable, cannot reach it
-    if not grid[goal[1]][goal[0]]:
-        return []
-        
-    # Initialize open and closed sets
-    open_set = []
-    closed_set = set()
-    
-    # Store g_score (cost from start) and f_score (g_score + heuristic)
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-    
-    # Store parent nodes to reconstruct path
-    came_from = {}
-    
-    # Add start node to open set with priority f_score
-    heapq.heappush(open_set, (f_score[start], start))
-    
-    # Define possible movement directions (up, right, down, left)
-    directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-    
-    while open_set:
-        # Get node with lowest f_score
-        _, current = heapq.heappop(open_set)
-        
-        # Check if goal reached
-        if current == goal:
-            # Reconstruct path
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            path.reverse()
-            return path
-            
-        # Mark node as processed
-        closed_set.add(current)
-        
-        # Check all neighbors
-        for dx, dy in directions:
-            neighbor = (current[0] + dx, current[1] + dy)
-            
-            # Skip if out of bounds
-            if not (0 <= neighbor[0] < grid_width and 0 <= neighbor[1] < grid_height):
-                continue
-                
-            # Skip if not walkable or already processed
-            if not grid[neighbor[1]][neighbor[0]] or neighbor in closed_set:
-                continue
-                
-            # Calculate tentative g_score
-            tentative_g_score = g_score[current] + 1
-            
-            # If neighbor not in open set or new path is better
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                # Update path and scores
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                
-                # Add to open set if not already there
-                if neighbor not in [n for _, n in open_set]:
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-                    
-    # No path found
-    return [] 
\ No newline at end of file
+
+    finder, loaded = _shared_finders.get((grid_width, grid_height), (None, None))
+    if finder is None:
+        finder = PathFinder(grid_width, grid_height)
+
+    # A plain 2D grid carries no version, so these searches are not cached
+    if loaded is not grid:
+        finder.set_walkable(bytearray(1 if cell else 0 for row in grid for cell in row))
+        _shared_finders[(grid_width, grid_height)] = (finder, grid)
+    return finder.find_path(tuple(start), tuple(goal))
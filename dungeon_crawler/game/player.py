@@ -1,12 +1,17 @@
 import pygame
-import random
 import math
+import heapq
 from .settings import *
 from .entity import Entity
+from .rng import get_stream
+from .log import get_logger
+
+log = get_logger("player")
 
 class Player(Entity):
-    def __init__(self, x, y):
+    def __init__(self, x, y, rngs=None):
         super().__init__(x, y)
+        self.rngs = rngs  # RNGService of the run, or None for the global random module
         self.health = HEALTH_BASE
         self.max_health = HEALTH_BASE
         self.score = 0
@@ -26,12 +31,17 @@ class Player(Entity):
             "ring": None
         }
         self.buffs = []
+        self.buff_expiry = []  # Heap of (expires, sequence, buff)
+        self.buff_sequence = 0
         self.skills = []
         self.direction = "down"  # For animation
         self.animation_frame = 0
         self.moving = False
-        self.attack_cooldown = 0
-        self.footstep_cooldown = 0
+        
+        # Cooldowns are stored as the tick they end on, so waiting costs nothing
+        self.clock = 0
+        self.attack_ready = 0
+        self.footstep_ready = 0
         
         # Initialize animations
         self.animations = {}
@@ -66,10 +76,9 @@ class Player(Entity):
             # Check if the destination is valid for movement
             if dungeon.is_position_valid(new_x, new_y):
                 # Check if there's an enemy at the destination
-                for enemy in dungeon.enemies:
-                    if enemy.x == new_x and enemy.y == new_y:
-                        # Don't move into enemies, attack them instead
-                        return False
+                if dungeon.entity_at(new_x, new_y) is not None:
+                    # Don't move into enemies, attack them instead
+                    return False
                 
                 # Move player
                 self.x = new_x
@@ -84,11 +93,11 @@ class Player(Entity):
             
             return False
         except Exception as e:
-            print(f"Error during player movement: {e}")
+            log.error("Error during player movement: %s", e)
             return False
         
-    def get_attack_damage(self):
-        """Calculate the player's total attack damage including equipment and buffs"""
+    def get_damage_rating(self):
+        """Get the player's attack damage from equipment and buffs, without critical hits"""
         # Base damage + weapon damage + buff effects
         total_damage = self.base_damage
         
@@ -101,35 +110,71 @@ class Player(Entity):
             if buff["type"] == "damage":
                 total_damage += buff["value"]
                 
+        return total_damage
+        
+    def get_attack_damage(self):
+        """Calculate the player's total attack damage including equipment and buffs"""
+        total_damage = self.get_damage_rating()
+        
         # Add critical hit chance
-        if random.random() < 0.1:  # 10% critical hit chance
+        if get_stream(self.rngs, "combat").random() < 0.1:  # 10% critical hit chance
             total_damage = int(total_damage * 1.5)
             
         return total_damage
         
-    def update(self):
+    @property
+    def attack_cooldown(self):
+        """Ticks until the player may attack again"""
+        return max(0, self.attack_ready - self.clock)
+        
+    @attack_cooldown.setter
+    def attack_cooldown(self, ticks):
+        self.attack_ready = self.clock + ticks
+        
+    @property
+    def footstep_cooldown(self):
+        """Ticks until the next footstep sound"""
+        return max(0, self.footstep_ready - self.clock)
+        
+    @footstep_cooldown.setter
+    def footstep_cooldown(self, ticks):
+        self.footstep_ready = self.clock + ticks
+        
+    def update(self, tick=None):
         """Update player state each turn"""
-        # Reduce cooldowns
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-            
-        if self.footstep_cooldown > 0:
-            self.footstep_cooldown -= 1
+        # Cooldowns run down as the clock advances
+        self.clock = tick if tick is not None else self.clock + 1
             
+        # Regeneration buffs heal at the end of each turn, including their last
+        for buff in self.buffs:
+            elapsed = self.clock - buff["started"]
+            if buff["type"] == "health_regen" and elapsed and elapsed % BUFF_TURN_TICKS == 0:
+                self.health = min(self.max_health, self.health + buff["value"])
+                
         # Update buffs
-        self.update_buffs()
+        if self.buff_expiry:
+            self.update_buffs()
         
         # Reset movement flag for animation
         self.moving = False
         
+    def add_buff(self, buff_type, value, duration):
+        """Apply a buff for a number of ticks, starting with the tick being processed"""
+        # Actions are applied before update moves the clock on to their tick
+        started = self.clock + 1
+        buff = {"type": buff_type, "value": value, "started": started, "expires": started + duration}
+        self.buffs.append(buff)
+        self.buff_sequence += 1
+        heapq.heappush(self.buff_expiry, (buff["expires"], self.buff_sequence, buff))
+        return buff
+        
     def update_buffs(self):
-        """Update active buffs and remove expired ones"""
-        active_buffs = []
-        for buff in self.buffs:
-            buff["duration"] -= 1
-            if buff["duration"] > 0:
-                active_buffs.append(buff)
-        self.buffs = active_buffs
+        """Remove buffs that have expired (only the expired ones are looked at)"""
+        expired = set()
+        while self.buff_expiry and self.buff_expiry[0][0] <= self.clock:
+            expired.add(id(heapq.heappop(self.buff_expiry)[2]))
+        if expired:
+            self.buffs = [buff for buff in self.buffs if id(buff) not in expired]
         
     def regen_mana(self, amount):
         """Regenerate mana"""
@@ -166,6 +211,16 @@ class Player(Entity):
         if item.item_type == "HEALTH_POTION":
             self.health = min(self.max_health, self.health + item.effect_value)
             
+        elif "duration" in item.properties:
+            # Timed potions heal at once and grant damage and regeneration as
+            # buffs; nothing reads speed or stealth yet, so those do nothing
+            duration = item.properties["duration"] * BUFF_TURN_TICKS
+            for effect, value in item.properties.items():
+                if effect == "health":
+                    self.health = min(self.max_health, self.health + value)
+                elif effect in ("damage", "health_regen"):
+                    self.add_buff(effect, value, duration)
+                    
         elif item.item_type == "WEAPON":
             # Equip the weapon, replacing any existing one
             old_weapon = self.equipment["weapon"]
@@ -221,8 +276,6 @@ class Player(Entity):
         
     def get_status(self):
         """Get player's current status for UI display"""
-        # Debug message to check if this method is being called
-        print("Player.get_status() called - providing stats to HUD")
         
         # Return all player stats needed by the HUD with safe defaults
         return {
@@ -235,7 +288,7 @@ class Player(Entity):
             "xp_to_level_up": getattr(self, 'xp_to_level_up', 100),
             "score": getattr(self, 'score', 0),
             "gold": getattr(self, 'gold', 0),
-            "damage": self.get_attack_damage() if hasattr(self, 'get_attack_damage') else 10,
+            "damage": self.get_damage_rating(),
             "defense": getattr(self, 'defense', 0),
             "inventory_count": len(getattr(self, 'inventory', [])),
             "buffs": getattr(self, 'buffs', []),
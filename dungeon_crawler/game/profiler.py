@@ -0,0 +1,242 @@
+import json
+import os
+import time
+import pygame
+from collections import deque
+from .settings import *
+from .ui.fonts import get_font, render_text
+
+# Frame budget drawn as a guide line on the overlay graph (ms)
+FRAME_BUDGET_MS = 1000.0 / FPS
+
+# Main loop scopes stacked in the overlay graph, with their colors
+GRAPH_SCOPES = (
+    ("events", (120, 170, 255)),
+    ("update", (110, 220, 120)),
+    ("render", (250, 190, 80)),
+    ("tick", (70, 75, 90)),
+)
+
+class _NullScope:
+    """Shared do-nothing scope returned while profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    """Times one named block and reports it to the profiler"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+class FrameProfiler:
+    """
+    Named-scope frame profiler
+
+    Code wraps work in `with PROFILER.scope("name"):`. While disabled,
+    scope() returns a shared no-op object, so instrumentation costs one
+    method call. While enabled, time per scope is summed for each frame
+    and the last `history` frames are kept for rolling percentiles and the
+    overlay graph. While tracing, every scope is also recorded as a Chrome
+    trace_event "complete" event for chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, history=240, max_trace_events=500000):
+        self.enabled = False
+        self.tracing = False
+        self.history = history
+        self.max_trace_events = max_trace_events
+
+        # Per-frame totals in ms: the frame being measured and recent frames
+        self.current = {}
+        self.frames = deque(maxlen=history)
+        self.frame_start = None
+        self.frame_count = 0
+
+        # Chrome trace events and the clock origin they are relative to
+        self.trace_events = []
+        self.trace_origin = time.perf_counter()
+
+        # Overlay state
+        self.show_overlay = False
+        self.summary = []
+        self.summary_frame = -1
+
+    def enable(self, enabled=True):
+        """Turn timing on or off"""
+        self.enabled = enabled
+        if not enabled:
+            self.current = {}
+            self.frame_start = None
+
+    def toggle_overlay(self):
+        """Show or hide the overlay, profiling whenever it is shown"""
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enable(True)
+        elif not self.tracing:
+            self.enable(False)
+        return self.show_overlay
+
+    def scope(self, name):
+        """Get a context manager timing a named block"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def record(self, name, start, end):
+        """Add a timed block to the current frame (and the trace)"""
+        self.current[name] = self.current.get(name, 0.0) + (end - start) * 1000.0
+        if self.tracing and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append({
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": (start - self.trace_origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+            })
+
+    def mark(self, name, **args):
+        """Record an instant event, such as a floor change, in the trace"""
+        if self.tracing and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append({
+                "name": name,
+                "ph": "i",
+                "s": "g",
+                "ts": (time.perf_counter() - self.trace_origin) * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": args,
+            })
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Finish the current frame and add it to the history"""
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.record("frame", self.frame_start, end)
+        self.frames.append(self.current)
+        self.current = {}
+        self.frame_start = None
+        self.frame_count += 1
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """Get rolling percentiles (ms) of a scope over the recent frames"""
+        values = sorted(frame.get(name, 0.0) for frame in self.frames)
+        if not values:
+            return tuple(0.0 for _ in points)
+        last = len(values) - 1
+        return tuple(values[min(last, int(round(point / 100.0 * last)))] for point in points)
+
+    def get_summary(self):
+        """Get (name, p50, p95, p99, max) for every scope seen recently, slowest first"""
+        names = set()
+        for frame in self.frames:
+            names.update(frame)
+        rows = []
+        for name in names:
+            p50, p95, p99 = self.percentiles(name)
+            peak = max(frame.get(name, 0.0) for frame in self.frames)
+            rows.append((name, p50, p95, p99, peak))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def start_trace(self):
+        """Start recording trace events"""
+        self.trace_events = []
+        self.trace_origin = time.perf_counter()
+        self.tracing = True
+        self.enable(True)
+
+    def stop_trace(self, path=None):
+        """
+        Stop recording and optionally write the trace
+
+        Returns:
+            The path written to, or None
+        """
+        self.tracing = False
+        if not self.show_overlay:
+            self.enable(False)
+        if path:
+            self.export_trace(path)
+            return path
+        return None
+
+    def export_trace(self, path):
+        """Write recorded events as Chrome trace_event JSON"""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+
+    def draw_overlay(self, screen):
+        """Draw the frame time graph and the per-scope percentile table"""
+        if not self.show_overlay:
+            return
+        graph_height = 100
+        width = self.history
+        x0 = screen.get_width() - width - 20
+        y0 = 20
+        rows_shown = 14
+        panel = pygame.Rect(x0 - 10, y0 - 10, width + 20, graph_height + 40 + rows_shown * 16)
+        screen.fill((10, 12, 18), panel)
+        pygame.draw.rect(screen, (90, 100, 120), panel, 1)
+
+        # Stacked bars of the main loop scopes; the graph spans two frame budgets
+        scale = graph_height / (FRAME_BUDGET_MS * 2)
+        bottom = y0 + graph_height
+        for i, frame in enumerate(self.frames):
+            x = x0 + width - len(self.frames) + i
+            y = bottom
+            for name, color in GRAPH_SCOPES:
+                height = frame.get(name, 0.0) * scale
+                if height >= 1:
+                    top = max(y0, int(y - height))
+                    screen.fill(color, (x, top, 1, int(y) - top))
+                    y -= height
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, (255, 80, 80), (x0, budget_y), (x0 + width, budget_y))
+
+        # Refresh the table a few times a second so it stays readable
+        if self.frame_count - self.summary_frame >= 15 or self.summary_frame < 0:
+            self.summary = self.get_summary()[:rows_shown]
+            self.summary_frame = self.frame_count
+
+        font = get_font(16)
+        columns = (("scope", 0), ("p50", 130), ("p95", 170), ("p99", 210))
+        y = bottom + 8
+        for label, offset in columns:
+            screen.blit(render_text(font, label, (200, 200, 210)), (x0 + offset, y))
+        for name, p50, p95, p99, peak in self.summary:
+            y += 16
+            color = (255, 120, 120) if p95 > FRAME_BUDGET_MS else (220, 220, 220)
+            values = (name[:22], f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}")
+            for value, (_, offset) in zip(values, columns):
+                screen.blit(render_text(font, value, color), (x0 + offset, y))
+
+# Shared profiler used by the whole game
+PROFILER = FrameProfiler()
@@ -1,5 +1,5 @@
-import random
 from enum import Enum
+from .rng import get_stream
 
 class QuestType(Enum):
     """Quest type enumeration"""
@@ -56,7 +56,8 @@ class Quest:
 class QuestManager:
     """Manager for all player quests"""
     
-    def __init__(self):
+    def __init__(self, rngs=None):
+        self.rngs = rngs  # RNGService of the run, or None for the global random module
         self.active_quest = None
         self.completed_quests = []
         self.available_quests = []
@@ -137,6 +138,7 @@ class QuestManager:
         
     def generate_quest(self, dungeon_level=1, biome=None):
         """Generate a new quest based on dungeon level and biome"""
+        rng = get_stream(self.rngs, "quest")
         if not self.quest_pool:
             self.initialize_quest_pool()
             
@@ -147,7 +149,7 @@ class QuestManager:
         else:
             types = [QuestType.KILL, QuestType.COLLECT, QuestType.EXPLORE]
             weights = [0.6, 0.3, 0.1]  # Adjust probability
-            quest_type = random.choices(types, weights=weights, k=1)[0]
+            quest_type = rng.choices(types, weights=weights, k=1)[0]
             
         # Filter quest templates by chosen type
         templates = [q for q in self.quest_pool if q["type"] == quest_type]
@@ -156,7 +158,7 @@ class QuestManager:
             templates = self.quest_pool
             
         # Choose a template
-        template = random.choice(templates)
+        template = rng.choice(templates)
         
         # Determine target based on biome if applicable
         if biome and quest_type == QuestType.KILL:
@@ -173,13 +175,13 @@ class QuestManager:
             target_options = template["target_options"]
             
         # Select target and count
-        target = random.choice(target_options)
-        count = random.randint(*template["count_range"])
+        target = rng.choice(target_options)
+        count = rng.randint(*template["count_range"])
         
         # Scale rewards based on level
         level_multiplier = 1 + (dungeon_level - 1) * 0.2
-        gold = int(random.randint(*template["reward_gold_range"]) * level_multiplier)
-        xp = int(random.randint(*template["reward_xp_range"]) * level_multiplier)
+        gold = int(rng.randint(*template["reward_gold_range"]) * level_multiplier)
+        xp = int(rng.randint(*template["reward_xp_range"]) * level_multiplier)
         
         # Create quest name and description
         name = template["name_template"].format(target=target.capitalize(), count=count)
@@ -236,7 +238,7 @@ class QuestManager:
         """Update quest progress based on game state"""
         if not self.active_quest:
             # Generate a new quest if we don't have one
-            if random.random() < 0.5:  # 50% chance to get a new quest
+            if get_stream(self.rngs, "quest").random() < 0.5:  # 50% chance to get a new quest
                 self.active_quest = self.generate_quest(dungeon.level, dungeon.biome)
             return None
             
@@ -268,10 +270,10 @@ class QuestManager:
                     
         elif quest_type == QuestType.EXPLORE or quest_type == QuestType.EXPLORE.value:
             # Count explored rooms
+            explored = dungeon.grid.explored
             explored_count = sum(1 for room in dungeon.rooms if 
-                               all(dungeon.grid[y][x].explored 
-                                   for y in range(room.y, room.y + room.height)
-                                   for x in range(room.x, room.x + room.width)))
+                               all(all(explored[y * dungeon.width + room.x:y * dungeon.width + room.x + room.width])
+                                   for y in range(room.y, room.y + room.height)))
                                    
             # Set progress directly
             old_progress = self.active_quest.progress
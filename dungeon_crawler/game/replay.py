@@ -0,0 +1,201 @@
+"""
+Input recording and replay
+
+A replay is the run seed, the starting floor and the list of player
+actions with the simulation tick each was applied on. Since all game
+randomness comes from the run seed (see game.rng), feeding the same
+actions back on the same ticks reproduces the run exactly, with no
+window and no clock:
+
+    python -m game.replay recordings/*.json --render 120,450 --frames frames/
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import time
+from .session import GameSession, ACTIONS
+from .log import get_logger, configure as configure_logging
+
+log = get_logger("session")
+
+# Replay file format version
+REPLAY_VERSION = 1
+
+# Summary fields that must match for a replay to count as reproduced
+VERIFIED_FIELDS = ("turns", "floor", "game_over", "health", "level", "score", "gold", "enemies_killed")
+
+class InputRecorder:
+    """Records the actions a session applies, tick by tick"""
+
+    def __init__(self):
+        self.seed = None
+        self.floor = 1
+        self.events = []  # [tick, action] pairs in the order applied
+
+    def start(self, session):
+        """Begin a new recording for a game that is just starting"""
+        self.seed = session.rngs.seed
+        self.floor = session.current_floor
+        self.events = []
+
+    def record(self, tick, action):
+        """Record an action applied on a tick"""
+        self.events.append([tick, action])
+
+    def to_dict(self, session=None):
+        """Get the recording as a JSON-compatible dictionary"""
+        replay = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "floor": self.floor,
+            "events": self.events,
+        }
+        if session is not None:
+            replay["ticks"] = session.turn
+            replay["summary"] = session.get_summary()
+        return replay
+
+    def save(self, path, session=None):
+        """Write the recording (gzip-compressed if the path ends in .gz)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = json.dumps(self.to_dict(session), separators=(",", ":"))
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt") as f:
+            f.write(data)
+        log.info("Saved input recording (%s actions) to %s", len(self.events), path)
+        return path
+
+def load_replay(path):
+    """Read a replay written by InputRecorder.save"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        replay = json.load(f)
+    if replay.get("version") != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version in {path}: {replay.get('version')}")
+    for tick, action in replay["events"]:
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action in {path} at tick {tick}: {action}")
+    return replay
+
+def run_replay(replay, render_ticks=(), frame_dir=None):
+    """
+    Play a replay back as fast as possible
+
+    Args:
+        replay: Dictionary from load_replay or InputRecorder.to_dict
+        render_ticks: Ticks to render to images after they are simulated
+        frame_dir: Directory for rendered frames (tick_<n>.png)
+
+    Returns:
+        Summary of the replayed run with "matches" (True, False or None
+        when the replay has no recorded summary) and "mismatches"
+    """
+    session = GameSession(visual_effects=False, seed=replay["seed"])
+    session.current_floor = replay["floor"]
+    session.new_game()
+
+    # Group the actions by tick
+    actions = {}
+    for tick, action in replay["events"]:
+        actions.setdefault(tick, []).append(action)
+    last_tick = replay.get("ticks", max(actions, default=0))
+
+    render_ticks = set(render_ticks)
+    renderer = FrameRenderer(frame_dir) if render_ticks else None
+
+    start_time = time.perf_counter()
+    while session.turn < last_tick and not session.game_over:
+        for action in actions.get(session.turn + 1, ()):
+            session.queue_action(action)
+        session.update()
+        if renderer and session.turn in render_ticks:
+            renderer.render(session)
+
+    summary = session.get_summary()
+    summary["elapsed"] = time.perf_counter() - start_time
+    expected = replay.get("summary")
+    if expected:
+        summary["mismatches"] = [field for field in VERIFIED_FIELDS
+                                 if field in expected and expected[field] != summary[field]]
+        summary["matches"] = not summary["mismatches"]
+    else:
+        summary["mismatches"] = []
+        summary["matches"] = None
+    return summary
+
+class FrameRenderer:
+    """Renders selected ticks of a replay to image files, without a window"""
+
+    def __init__(self, frame_dir=None):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from .settings import SCREEN_WIDTH, SCREEN_HEIGHT
+        from .ui.hud import HUD
+        pygame.display.init()
+        pygame.font.init()
+        self.pygame = pygame
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.hud = HUD(self.screen)
+        self.frame_dir = frame_dir or "."
+        os.makedirs(self.frame_dir, exist_ok=True)
+
+    def render(self, session):
+        """Draw the session's current state and save it as tick_<n>.png"""
+        self.screen.fill((0, 0, 0))
+        session.dungeon.render(self.screen, session.player)
+        self.hud.render(session.player, session.quest_manager.active_quest, session.current_floor)
+        path = os.path.join(self.frame_dir, f"tick_{session.turn}.png")
+        self.pygame.image.save(self.screen, path)
+        return path
+
+def parse_ticks(text):
+    """Parse a tick list like "100,250,400" """
+    if not text:
+        return ()
+    return tuple(int(part) for part in text.split(",") if part.strip())
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Replay recorded Epic Dungeon Crawler runs without a display")
+    parser.add_argument("paths", nargs="+", help="replay files or glob patterns")
+    parser.add_argument("--render", default="", help="comma-separated ticks to render to images")
+    parser.add_argument("--frames", default="frames", help="directory for rendered frames")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    parser.add_argument("--verbose", action="store_true", help="show game log output")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        configure_logging(level="warning")
+
+    paths = []
+    for pattern in args.paths:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    render_ticks = parse_ticks(args.render)
+    failures = 0
+    for path in paths:
+        frame_dir = os.path.join(args.frames, os.path.splitext(os.path.basename(path))[0])
+        result = run_replay(load_replay(path), render_ticks, frame_dir)
+        result["path"] = path
+        if result["matches"] is False:
+            failures += 1
+
+        if args.json:
+            print(json.dumps(result))
+        else:
+            status = {True: "ok", False: "MISMATCH", None: "unverified"}[result["matches"]]
+            detail = f" ({', '.join(result['mismatches'])})" if result["mismatches"] else ""
+            print(f"{path}: {status}{detail} - {result['turns']} ticks, floor {result['floor']}, "
+                  f"score {result['score']} ({result['elapsed']:.2f}s)")
+
+    if len(paths) > 1 and not args.json:
+        print(f"{len(paths) - failures}/{len(paths)} replays reproduced")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+import hashlib
+import random
+
+# Named streams used by the game, one per subsystem
+STREAMS = (
+    "layout",   # Rooms, corridors, doors and floor variants
+    "spawn",    # Enemy and item placement
+    "loot",     # Item rolls and enemy drops
+    "ai",       # Enemy wandering
+    "combat",   # Damage rolls and critical hits
+    "quest",    # Quest selection and rewards
+    "effects",  # Particles and other purely visual randomness
+)
+
+def derive_seed(*parts):
+    """
+    Derive a 64-bit seed from a sequence of values
+
+    The derivation is a hash of the parts, so it is the same in every
+    process and Python version (unlike hash(), which is salted per process).
+    """
+    key = ":".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+def get_stream(rngs, name):
+    """Get a named stream from a service, or the global random module without one"""
+    return rngs.stream(name) if rngs is not None else random
+
+class RNGService:
+    """
+    Seeded random number streams
+
+    Each subsystem draws from its own named stream, so adding a random call
+    in one (say, a new particle effect) never changes what another (say,
+    the dungeon layout) produces. Streams are seeded from the service seed
+    and their name, and for_floor() derives an independent service per
+    floor, so floor N is the same whatever happened on the floors before it.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        """Get the random.Random for a named stream"""
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = random.Random(derive_seed(self.seed, "stream", name))
+            self.streams[name] = rng
+        return rng
+
+    def for_floor(self, level):
+        """Get the service for one floor of this run"""
+        return RNGService(self.floor_seed(level))
+
+    def floor_seed(self, level):
+        """Get the seed of one floor of this run"""
+        return derive_seed(self.seed, "floor", level)
+
+    def getstate(self):
+        """Get the state of every stream created so far"""
+        return {name: rng.getstate() for name, rng in self.streams.items()}
+
+    def setstate(self, state):
+        """Restore stream states saved by getstate"""
+        for name, value in state.items():
+            self.stream(name).setstate(value)
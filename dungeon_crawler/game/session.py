@@ -0,0 +1,379 @@
+import random
+from .world.dungeon import Dungeon
+from .world.prefetch import build_floor
+from .player import Player
+from .quest_manager import QuestManager
+from .settings import *
+from .profiler import PROFILER
+from .log import get_logger
+from .rng import RNGService
+
+log = get_logger("session")
+
+# Player actions understood by GameSession.handle_action
+ACTION_MOVES = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+ACTIONS = ("wait", "up", "down", "left", "right", "use_item")
+
+class GameSession:
+    """
+    Game rules and world state for one run, independent of any display
+
+    Owns the dungeon, player and quest manager and advances them one turn
+    at a time. The windowed game drives a session from its event loop; the
+    headless runner drives one from an input provider. Sound is optional.
+
+    All randomness comes from named streams of the run's RNGService, and
+    every floor is generated from a seed derived from the run seed. With a
+    FloorPrefetcher the next floor is generated in the background while the
+    current one is played.
+    """
+
+    def __init__(self, sound_manager=None, visual_effects=True, seed=None, prefetcher=None, recorder=None):
+        self.sound_manager = sound_manager
+        self.visual_effects = visual_effects  # Particles, floating text and animation timers
+        self.seed = seed  # Fixed run seed, or None for a new one each game
+        self.rngs = RNGService(seed)
+        self.prefetcher = prefetcher
+        self.recorder = recorder  # InputRecorder logging applied actions, or None
+
+        self.current_floor = 1
+        self.dungeon = None
+        self.player = None
+        self.quest_manager = QuestManager()
+
+        self.turn = 0
+        self.game_over = False
+        self.enemies_killed = 0
+
+        # Player actions waiting to be applied at the start of the next tick
+        self.pending_actions = []
+
+    def play_sound(self, sound_name):
+        """Play a sound effect if a sound manager is attached"""
+        if self.sound_manager:
+            self.sound_manager.play_sound(sound_name)
+
+    def play_music(self, track_name):
+        """Play a music track if a sound manager is attached"""
+        if self.sound_manager:
+            self.sound_manager.play_music(track_name)
+
+    def add_floating_text(self, x, y, text, color, lifetime=20, velocity=-0.2):
+        """Show a floating text message in the dungeon"""
+        if self.visual_effects and self.dungeon.floating_texts is not None:
+            self.dungeon.floating_texts.append({
+                "x": x,
+                "y": y,
+                "text": text,
+                "color": color,
+                "lifetime": lifetime,
+                "velocity": velocity
+            })
+
+    def new_game(self):
+        """Initialize a new game on the current floor"""
+        log.debug("Initializing new game at floor %s...", self.current_floor)
+        self.turn = 0
+        self.game_over = False
+        self.enemies_killed = 0
+        self.pending_actions = []
+        self.rngs = RNGService(self.seed if self.seed is not None else random.getrandbits(32))
+        if self.recorder:
+            self.recorder.start(self)
+
+        # Create a dungeon for the current floor
+        self.dungeon = Dungeon(GRID_WIDTH, GRID_HEIGHT,
+                              max_rooms=12,
+                              room_min_size=6,
+                              room_max_size=12,
+                              level=max(1, self.current_floor),
+                              seed=self.get_floor_seed(max(1, self.current_floor)))
+
+        # Determine biome type based on current floor
+        self.dungeon.determine_biome()
+        log.debug("Dungeon created with biome: %s", self.dungeon.biome.name)
+
+        # Initialize biome-specific features
+        if self.visual_effects:
+            self.dungeon.init_biome_features()
+
+        # Create player at a valid position
+        valid_room = self.dungeon.rooms[0]  # Use first room for player
+        player_x, player_y = valid_room.center()
+        self.player = Player(player_x, player_y, rngs=self.rngs)
+        self.player.dungeon = self.dungeon  # Give player reference to dungeon
+        log.debug("Player created at position %s, %s", player_x, player_y)
+
+        # Generate enemies and items in the dungeon
+        self.dungeon.place_entities()
+
+        # Initialize quest for this floor
+        self.quest_manager = QuestManager(rngs=self.rngs)
+        new_quest = self.quest_manager.generate_quest(self.current_floor, self.dungeon.biome)
+        self.quest_manager.active_quest = new_quest
+
+        # Start dungeon background music
+        self.play_music("dungeon")
+
+        # Start building the next floor while this one is played
+        self.prefetch_next_floor()
+
+        log.debug("Game initialized successfully")
+
+    def get_floor_seed(self, level):
+        """Get the generation seed of a floor in this run"""
+        return self.rngs.floor_seed(level)
+
+    def prefetch_next_floor(self):
+        """Ask the prefetcher, if any, to generate the floor below this one"""
+        if self.prefetcher:
+            level = self.current_floor + 1
+            self.prefetcher.request(level, self.get_floor_seed(level))
+
+    def build_floor(self, level):
+        """Get the dungeon for a floor, prefetched if available"""
+        seed = self.get_floor_seed(level)
+        if self.prefetcher:
+            return self.prefetcher.take(level, seed)
+        return build_floor(level, seed)
+
+    def handle_action(self, action):
+        """
+        Apply a player action
+
+        Args:
+            action: One of ACTIONS ("wait", "up", "down", "left", "right", "use_item")
+
+        Returns:
+            The move result (True, False or "next_floor") for moves, otherwise None
+        """
+        try:
+            if action in ACTION_MOVES:
+                dx, dy = ACTION_MOVES[action]
+                result = self.player.move(dx, dy, self.dungeon)
+                self.handle_move_result(result)
+                return result
+            elif action == "use_item":
+                self.player.use_item()
+        except Exception as e:
+            log.exception("Error handling player action: %s", e)
+        return None
+
+    def queue_action(self, action):
+        """Queue a player action to be applied at the start of the next tick"""
+        self.pending_actions.append(action)
+
+    def handle_move_result(self, result):
+        """Handle the result of a player movement attempt"""
+        if result == True:
+            self.play_sound("step")
+        elif result == "next_floor":
+            self.advance_floor()
+
+    def update(self):
+        """Advance the world by one fixed simulation tick (1 / SIMULATION_TICK_RATE seconds)"""
+        if self.game_over:
+            return
+        try:
+            self.turn += 1
+
+            # Positions at the start of the tick, used to interpolate rendering
+            if self.player:
+                self.player.begin_tick()
+            for enemy in self.dungeon.enemies:
+                enemy.begin_tick()
+
+            # Apply input that arrived since the last tick
+            if self.pending_actions:
+                actions = self.pending_actions
+                self.pending_actions = []
+                for action in actions:
+                    if self.recorder:
+                        self.recorder.record(self.turn, action)
+                    self.handle_action(action)
+
+            # Update dungeon elements
+            if self.dungeon and self.visual_effects:
+                with PROFILER.scope("dungeon.update"):
+                    self.dungeon.update()
+
+            # Update player
+            if self.player:
+                with PROFILER.scope("player.update"):
+                    self.player.update(self.turn)
+
+            # Update enemies
+            with PROFILER.scope("enemy.ai"):
+                if ADVANCED_SETTINGS.get("AI_SCHEDULER", True):
+                    self.dungeon.ai_scheduler.update(self.player, self.dungeon)
+                else:
+                    self.dungeon.ai_scheduler.update_all(self.player, self.dungeon)
+
+            # Run the path searches enemies asked for, within the tick's budget
+            with PROFILER.scope("enemy.paths"):
+                self.dungeon.path_service.update()
+
+            # Check for combat
+            with PROFILER.scope("combat"):
+                self.check_combat()
+
+            # Check for item pickup
+            with PROFILER.scope("pickup"):
+                self.check_item_pickup()
+
+            # Update quest
+            with PROFILER.scope("quest.update"):
+                self.quest_manager.update_quest(self.player, self.dungeon)
+
+            # Check if floor is cleared
+            if not self.dungeon.enemies:
+                self.advance_floor()
+
+            # Check player health
+            if self.player.health <= 0:
+                self.game_over = True
+                self.play_sound("game_over")
+                self.play_music("game_over")
+        except Exception as e:
+            log.exception("Error during game update: %s", e)
+
+    def check_combat(self):
+        """Check for combat between player and adjacent enemies"""
+        px, py = self.player.x, self.player.y
+        for enemy in self.dungeon.entities_in_rect(px - 1, py - 1, px + 1, py + 1):
+            if enemy.alive:
+                # Player attacks enemy
+                damage_to_enemy = self.player.get_attack_damage()
+                enemy.health -= damage_to_enemy
+
+                # Show damage numbers
+                self.add_floating_text(enemy.x, enemy.y, str(damage_to_enemy), (255, 0, 0))
+
+                # Play attack sound
+                self.play_sound("attack")
+
+                # The noise of the fight wakes nearby enemies
+                self.dungeon.ai_scheduler.wake(self.dungeon, enemy.x, enemy.y)
+
+                if enemy.health <= 0:
+                    enemy.alive = False
+                    self.dungeon.remove_enemy(enemy)
+                    self.player.add_xp(50)
+                    self.player.add_score(50)
+                    self.enemies_killed += 1
+                    self.play_sound("enemy_die")
+                else:
+                    # Enemy counterattacks
+                    damage_to_player = max(0, enemy.base_damage - self.player.defense)
+                    self.player.health -= damage_to_player
+
+                    # Show damage numbers
+                    self.add_floating_text(self.player.x, self.player.y,
+                                           str(damage_to_player), (255, 255, 0))
+
+                    if damage_to_player > 0:
+                        self.play_sound("player_hurt")
+
+    def check_item_pickup(self):
+        """Check for item pickup by player"""
+        for item in self.dungeon.item_index.entities_at(self.player.x, self.player.y):
+            self.player.pickup_item(item)
+            self.dungeon.remove_item(item)
+            self.play_sound("pickup")
+
+    def advance_floor(self):
+        """Advance to the next dungeon floor"""
+        with PROFILER.scope("floor.advance"):
+            self.change_floor()
+        PROFILER.mark("floor.changed", floor=self.current_floor, biome=self.dungeon.biome.name)
+
+    def change_floor(self):
+        """Build the next floor and carry the player over to it"""
+        try:
+            self.current_floor += 1
+
+            # Save player state before creating new dungeon
+            player_health = self.player.health
+            player_max_health = self.player.max_health
+            player_level = self.player.level
+            player_xp = self.player.xp
+            player_inventory = self.player.inventory.copy() if hasattr(self.player, 'inventory') else []
+
+            # Handle equipment items safely
+            player_equipment = {}
+            if hasattr(self.player, 'equipment'):
+                player_equipment = self.player.equipment.copy()
+
+            player_score = self.player.score
+
+            # Create new dungeon (usually already generated in the background)
+            self.dungeon = self.build_floor(self.current_floor)
+
+            # Verify player start position
+            if not hasattr(self.dungeon, 'player_start') or not self.dungeon.player_start:
+                self.dungeon.player_start = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+
+            # Create new player at the start position but maintain stats from previous floor
+            self.player = Player(*self.dungeon.player_start, rngs=self.rngs)
+            self.player.health = player_health
+            self.player.max_health = player_max_health
+            self.player.level = player_level
+            self.player.xp = player_xp
+            self.player.inventory = player_inventory
+
+            # Set equipment items
+            if hasattr(self.player, 'equipment') and player_equipment:
+                self.player.equipment = player_equipment
+
+            self.player.score = player_score
+
+            # Give player a reference to the dungeon for minimap
+            self.player.dungeon = self.dungeon
+
+            # Update equipment stats if method exists
+            if hasattr(self.player, 'recalculate_stats'):
+                self.player.recalculate_stats()
+
+            # Play sound effect and briefly heal player
+            self.play_sound("level_up")
+            self.player.health = min(self.player.max_health, self.player.health + 20)
+
+            # Add a message about reaching a new floor
+            self.add_floating_text(self.player.x, self.player.y, f"Floor {self.current_floor}",
+                                   (255, 255, 0), lifetime=60, velocity=-0.1)
+
+            # Change music based on floor number for variety
+            if self.current_floor % 5 == 0:  # Boss floors
+                self.play_music("boss")
+            else:
+                self.play_music("dungeon")
+
+            self.prefetch_next_floor()
+
+        except Exception as e:
+            log.exception("Error advancing floor: %s", e)
+            # Emergency fallback - create a simple viable dungeon
+            self.current_floor += 1
+            self.dungeon = Dungeon(GRID_WIDTH, GRID_HEIGHT, level=self.current_floor)
+            self.player.x, self.player.y = self.dungeon.player_start
+            self.player.dungeon = self.dungeon
+
+    def get_summary(self):
+        """Get the outcome of the run so far"""
+        return {
+            "turns": self.turn,
+            "floor": self.current_floor,
+            "game_over": self.game_over,
+            "health": self.player.health if self.player else 0,
+            "level": self.player.level if self.player else 0,
+            "score": self.player.score if self.player else 0,
+            "gold": self.player.gold if self.player else 0,
+            "enemies_killed": self.enemies_killed,
+            "quest_completed": bool(self.quest_manager.active_quest and
+                                    self.quest_manager.active_quest.completed),
+        }
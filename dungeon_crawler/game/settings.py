@@ -8,6 +8,11 @@ SCREEN_WIDTH = TILE_SIZE * GRID_WIDTH
 SCREEN_HEIGHT = TILE_SIZE * GRID_HEIGHT
 FPS = 60
 
+# Simulation timing: the game advances in fixed ticks independent of the frame rate
+SIMULATION_TICK_RATE = 60        # Ticks per second (enemy cooldowns are counted in ticks)
+MAX_CATCH_UP_TICKS = 5           # Most ticks run in one frame before simulation time is dropped
+MAX_FRAME_TIME = 0.25            # Longest frame (seconds) fed to the simulation, e.g. after a stall
+
 # Camera and Viewport
 VIEWPORT_WIDTH = GRID_WIDTH
 VIEWPORT_HEIGHT = GRID_HEIGHT
@@ -292,7 +297,18 @@ ENEMY_STATS = {
     }
 }
 
-# Item effects
+# Enemy AI scheduling: enemies near the player think every tick, farther ones
+# less often and distant ones not at all until the player or a noise comes near
+AI_ACTIVE_RADIUS = 16            # Tiles; at least the aggro range and the largest view radius
+AI_DORMANT_RADIUS = 32           # Tiles; beyond this enemies sleep
+AI_DORMANT_INTERVAL = 4          # Dormant enemies think once every this many ticks
+AI_NOISE_RADIUS = 20             # Combat wakes enemies within this many tiles
+AI_WAKE_TICKS = 180              # Woken enemies stay active this long
+PATH_SEARCH_BUDGET = 500         # A* node expansions per tick for enemy path requests (about 1 ms)
+PATH_LOCAL_RANGE = 24            # Tiles; longer paths are planned over the room graph first
+
+# Item effects (durations are in turns of BUFF_TURN_TICKS ticks)
+BUFF_TURN_TICKS = SIMULATION_TICK_RATE
 ITEM_EFFECTS = {
     # Consumables
     "health_potion_small": {
@@ -687,5 +703,13 @@ ADVANCED_SETTINGS = {
     "AUTO_PICKUP_GOLD": True,           # Automatically pick up gold
     "SCREEN_SHAKE_INTENSITY": 0.5,      # Screen shake effect intensity (0.0-1.0)
     "COMBAT_TEXT_SIZE": 1.0,            # Size of combat text (0.5-1.5)
-    "SHOW_HINTS": True                  # Show tutorial hints
+    "SHOW_HINTS": True,                 # Show tutorial hints
+    "FOV_ALGORITHM": "shadowcast",      # shadowcast (symmetric) or shadowcast_asymmetric
+    "RENDER_INTERPOLATION": True,       # Smooth entity movement between simulation ticks
+    "AI_SCHEDULER": True,               # Only update enemies near the player every tick
+    "INCREMENTAL_PATHS": True,          # Repair each enemy's last path search instead of starting over
+    "HIERARCHICAL_PATHS": True,         # Plan long paths room to room over a precomputed portal graph
+    "FLOOR_PREFETCH": "thread",         # Generate the next floor in the background: thread, process or off
+    "LOG_LEVEL": "info",                # debug, info, warning, error or off (DUNGEON_LOG env var overrides)
+    "LOG_CATEGORIES": {}                # Per-category levels, e.g. {"world": "debug"}
 } 
\ No newline at end of file
@@ -1,5 +1,8 @@
 import pygame
 import os
+from .log import get_logger
+
+log = get_logger("sound")
 
 def resolve_path(relative_path):
     """Resolve a relative path to an absolute path based on the script location"""
@@ -14,9 +17,9 @@ class SoundManager:
         if not pygame.mixer.get_init():
             try:
                 pygame.mixer.init(44100, -16, 2, 1024)
-                print("Sound manager initialized audio system successfully")
+                log.debug("Sound manager initialized audio system successfully")
             except pygame.error as e:
-                print(f"Warning: Unable to initialize audio system: {e}")
+                log.warning("Unable to initialize audio system: %s", e)
                 self.sound_enabled = False
                 self.music_enabled = False
                 return
@@ -50,7 +53,7 @@ class SoundManager:
             return
             
         sounds_dir = resolve_path(os.path.join("assets", "sounds"))
-        print(f"Loading sounds from directory: {sounds_dir}")
+        log.debug("Loading sounds from directory: %s", sounds_dir)
         
         # Default sounds if files are missing
         self.sounds = {
@@ -79,13 +82,13 @@ class SoundManager:
                     try:
                         self.sounds[sound_name] = pygame.mixer.Sound(sound_path)
                         self.sounds[sound_name].set_volume(self.sound_volume)
-                        print(f"Loaded sound: {sound_name}")
+                        log.debug("Loaded sound: %s", sound_name)
                     except pygame.error as e:
-                        print(f"Could not load sound: {sound_path} - {e}")
+                        log.warning("Could not load sound: %s - %s", sound_path, e)
                 else:
-                    print(f"Warning: Sound file not found: {sound_path}")
+                    log.warning("Sound file not found: %s", sound_path)
         else:
-            print(f"Warning: Sound directory not found: {sounds_dir}")
+            log.warning("Sound directory not found: %s", sounds_dir)
         
     def load_music(self):
         """Load all music tracks"""
@@ -93,7 +96,7 @@ class SoundManager:
             return
             
         music_dir = resolve_path(os.path.join("assets", "music"))
-        print(f"Loading music from directory: {music_dir}")
+        log.debug("Loading music from directory: %s", music_dir)
         
         # Define music tracks
         music_tracks = {
@@ -112,11 +115,11 @@ class SoundManager:
                 track_path = os.path.join(music_dir, filename)
                 if os.path.exists(track_path):
                     self.music[track_name] = track_path
-                    print(f"Found music track: {track_name}")
+                    log.debug("Found music track: %s", track_name)
                 else:
-                    print(f"Warning: Music file not found: {track_path}")
+                    log.warning("Music file not found: %s", track_path)
         else:
-            print(f"Warning: Music directory not found: {music_dir}")
+            log.warning("Music directory not found: %s", music_dir)
         
     def play_sound(self, sound_name):
         """Play a sound effect"""
@@ -127,7 +130,7 @@ class SoundManager:
             if sound_name in self.sounds and self.sounds[sound_name]:
                 self.sounds[sound_name].play()
         except Exception as e:
-            print(f"Error playing sound '{sound_name}': {e}")
+            log.error("Error playing sound '%s': %s", sound_name, e)
             
     def play_music(self, track_name, loops=-1, fade_ms=500):
         """Play a music track with optional fading"""
@@ -137,14 +140,14 @@ class SoundManager:
         try:
             if track_name in self.music and self.music[track_name]:
                 if self.current_music != track_name:
-                    print(f"Playing music track: {track_name}")
+                    log.debug("Playing music track: %s", track_name)
                     pygame.mixer.music.fadeout(fade_ms)
                     pygame.mixer.music.load(self.music[track_name])
                     pygame.mixer.music.set_volume(self.music_volume)
                     pygame.mixer.music.play(loops, fade_ms=fade_ms)
                     self.current_music = track_name
         except Exception as e:
-            print(f"Error playing music track '{track_name}': {e}")
+            log.error("Error playing music track '%s': %s", track_name, e)
             
     def stop_music(self, fade_ms=500):
         """Stop the currently playing music with optional fading"""
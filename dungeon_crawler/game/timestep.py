@@ -0,0 +1,56 @@
+from .settings import *
+
+class FixedTimestep:
+    """
+    Fixed-timestep accumulator decoupling simulation from rendering
+
+    Each frame, the real time that passed is added to an accumulator and
+    the simulation runs as many fixed ticks as fit in it, so game speed no
+    longer depends on the frame rate. A slow frame is paid back with extra
+    ticks, up to max_ticks; beyond that simulation time is dropped rather
+    than letting the game spiral into ever longer frames. The leftover
+    fraction of a tick is exposed as alpha for render interpolation.
+    """
+
+    def __init__(self, tick_rate=SIMULATION_TICK_RATE, max_ticks=MAX_CATCH_UP_TICKS,
+                 max_frame_time=MAX_FRAME_TIME):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+        # Statistics
+        self.total_ticks = 0
+        self.dropped_ticks = 0
+
+    @property
+    def alpha(self):
+        """Fraction of the next tick already elapsed (0.0-1.0), for interpolation"""
+        return min(1.0, self.accumulator / self.dt)
+
+    def reset(self):
+        """Forget accumulated time, e.g. after loading or unpausing"""
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """
+        Add a frame's elapsed time and get the number of ticks to simulate
+
+        Args:
+            frame_time: Real time in seconds since the previous frame
+
+        Returns:
+            Number of fixed ticks to run this frame (0 to max_ticks)
+        """
+        self.accumulator += min(max(0.0, frame_time), self.max_frame_time)
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks:
+            # Too far behind to catch up: run what we can and drop the rest
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.dt
+        self.total_ticks += ticks
+        return ticks
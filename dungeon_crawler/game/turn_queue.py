@@ -0,0 +1,60 @@
+import heapq
+
+class TurnQueue:
+    """
+    Priority queue of actors keyed by the tick their next turn is due
+
+    Actors that are waiting cost nothing per tick: each tick only the
+    actors whose turn has come are popped. Rescheduling an actor pushes a
+    new entry and leaves the old one in the heap, where it is recognised
+    as stale and skipped when it surfaces. Ties are broken by scheduling
+    order, so turns come out in a deterministic order.
+    """
+
+    def __init__(self):
+        self.heap = []   # (tick, sequence, actor)
+        self.due = {}    # actor -> (tick, sequence) of its live entry
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.due)
+
+    def __contains__(self, actor):
+        return actor in self.due
+
+    def schedule(self, actor, tick):
+        """Give an actor its next turn on a tick, replacing any turn already scheduled"""
+        self.sequence += 1
+        self.due[actor] = (tick, self.sequence)
+        heapq.heappush(self.heap, (tick, self.sequence, actor))
+
+        # Drop stale entries once they outnumber the live ones
+        if len(self.heap) > 2 * len(self.due) + 64:
+            self.heap = [(due, sequence, other) for other, (due, sequence) in self.due.items()]
+            heapq.heapify(self.heap)
+
+    def due_tick(self, actor):
+        """Get the tick an actor's next turn is due, or None if it has none"""
+        entry = self.due.get(actor)
+        return entry[0] if entry else None
+
+    def cancel(self, actor):
+        """Remove an actor's scheduled turn"""
+        self.due.pop(actor, None)
+
+    def pop_due(self, tick):
+        """Remove and return the actors whose turns are due by a tick, in turn order"""
+        heap = self.heap
+        due = self.due
+        ready = []
+        while heap and heap[0][0] <= tick:
+            entry_tick, sequence, actor = heapq.heappop(heap)
+            if due.get(actor) == (entry_tick, sequence):
+                del due[actor]
+                ready.append(actor)
+        return ready
+
+    def clear(self):
+        """Remove every scheduled turn"""
+        self.heap = []
+        self.due.clear()
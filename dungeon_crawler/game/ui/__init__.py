@@ -4,4 +4,6 @@
 """UI module containing menu and HUD components."""
 
 from .menu import MainMenu, OptionsMenu, Button
-from .hud import HUD 
\ No newline at end of file
+from .hud import HUD
+from .minimap import Minimap
+from .fonts import FontRegistry, TextCache, get_font, render_text 
\ No newline at end of file
@@ -0,0 +1,90 @@
+import pygame
+from collections import OrderedDict
+
+class FontRegistry:
+    """Shared pygame fonts, created once per (name, size)"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        """Get the font for a name and size, loading it on first use"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces
+
+    Surfaces are keyed by (font, text, color, antialias, alpha), so a
+    string that is drawn every frame is only rasterised once. Returned
+    surfaces are shared and must not be modified by the caller.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True, alpha=None):
+        """
+        Get a rendered text surface
+
+        Args:
+            font: Font to render with (use FontRegistry.get for shared fonts)
+            text: String to render
+            color: Text color
+            antialias: Whether to antialias the glyphs
+            alpha: Optional surface alpha (0-255) baked into the cached copy
+
+        Returns:
+            Rendered pygame Surface
+        """
+        key = (font, text, tuple(color), antialias, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces"""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+# Shared instances used by all UI code
+FONTS = FontRegistry()
+TEXT_CACHE = TextCache()
+
+def get_font(size, name=None):
+    """Get a shared font"""
+    return FONTS.get(size, name)
+
+def render_text(font, text, color, antialias=True, alpha=None):
+    """Render text through the shared surface cache"""
+    return TEXT_CACHE.render(font, text, color, antialias, alpha)
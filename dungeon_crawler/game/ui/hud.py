@@ -1,7 +1,34 @@
 import pygame
 from ..settings import *
+from .fonts import get_font, render_text
+from .minimap import Minimap
 import math
 
+class HUDWidget:
+    """Cached HUD element that is only redrawn when its inputs change"""
+    
+    def __init__(self, rect, draw_func):
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.draw_func = draw_func
+        self.key = None
+        self.valid = False
+        self.redraws = 0
+        
+    def render(self, screen, key, *args):
+        """Redraw the widget if its key changed, then blit it"""
+        if not self.valid or key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            self.draw_func(self.surface, *args)
+            self.key = key
+            self.valid = True
+            self.redraws += 1
+        screen.blit(self.surface, self.rect)
+        
+    def invalidate(self):
+        """Force a redraw on the next render"""
+        self.valid = False
+
 class HUD:
     """Heads-up display showing player stats and game information"""
     
@@ -11,28 +38,33 @@ class HUD:
         self.height = screen.get_height()
         
         # Define HUD regions
-        self.left_panel_rect = pygame.Rect(UI_PADDING, UI_PADDING, 
+        self.left_panel_rect = pygame.Rect(UI_PADDING, UI_PADDING,
                                       UI_ELEMENT_WIDTH, SCREEN_HEIGHT - UI_PADDING * 2)
-        self.right_panel_rect = pygame.Rect(SCREEN_WIDTH - UI_ELEMENT_WIDTH - UI_PADDING, 
-                                       UI_PADDING, UI_ELEMENT_WIDTH, 
+        self.right_panel_rect = pygame.Rect(SCREEN_WIDTH - UI_ELEMENT_WIDTH - UI_PADDING,
+                                       UI_PADDING, UI_ELEMENT_WIDTH,
                                        SCREEN_HEIGHT - UI_PADDING * 2)
-        self.bottom_panel_rect = pygame.Rect(UI_ELEMENT_WIDTH + UI_PADDING * 2, 
+        self.bottom_panel_rect = pygame.Rect(UI_ELEMENT_WIDTH + UI_PADDING * 2,
                                         SCREEN_HEIGHT - UI_ELEMENT_HEIGHT - UI_PADDING,
                                         SCREEN_WIDTH - UI_ELEMENT_WIDTH * 2 - UI_PADDING * 4,
                                         UI_ELEMENT_HEIGHT)
-                                        
+        self.quest_panel_rect = pygame.Rect(SCREEN_WIDTH - 250, SCREEN_HEIGHT - 150, 230, 130)
+        
         # Initialize fonts
-        self.title_font = pygame.font.Font(None, UI_TITLE_SIZE)
-        self.heading_font = pygame.font.Font(None, UI_HEADING_SIZE)
-        self.normal_font = pygame.font.Font(None, UI_FONT_SIZE)
-        self.small_font = pygame.font.Font(None, UI_FONT_SIZE - 6)
-        self.smaller_font = pygame.font.Font(None, UI_FONT_SIZE - 10)
+        self.title_font = get_font(UI_TITLE_SIZE)
+        self.heading_font = get_font(UI_HEADING_SIZE)
+        self.normal_font = get_font(UI_FONT_SIZE)
+        self.small_font = get_font(UI_FONT_SIZE - 6)
+        self.smaller_font = get_font(UI_FONT_SIZE - 10)
         
         # HUD element dimensions
         self.stat_bar_height = 20
         self.stat_bar_width = 200
         self.padding = UI_PADDING
         
+        # Minimap tile size and the persistent map texture for the current floor
+        self.minimap_tile_size = max(2, int(TILE_SIZE * MINIMAP_SCALE))
+        self.minimap = None
+        
         # Initialize animation variables
         self.animation_timer = 0
         self.low_health_flash = 0
@@ -41,27 +73,65 @@ class HUD:
         self.initialize_hud_elements()
         
     def initialize_hud_elements(self):
-        """Initialize static HUD elements like backgrounds"""
-        # Create semi-transparent surface for panels
-        self.panel_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        # Draw left panel background
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BACKGROUND"], 
-                        self.left_panel_rect, border_radius=5)
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BORDER"], 
-                        self.left_panel_rect, width=UI_BORDER_SIZE, border_radius=5)
-        
-        # Draw right panel background
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BACKGROUND"], 
-                        self.right_panel_rect, border_radius=5)
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BORDER"], 
-                        self.right_panel_rect, width=UI_BORDER_SIZE, border_radius=5)
-        
-        # Draw bottom panel background
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BACKGROUND"], 
-                        self.bottom_panel_rect, border_radius=5)
-        pygame.draw.rect(self.panel_surface, UI_COLORS["BORDER"], 
-                        self.bottom_panel_rect, width=UI_BORDER_SIZE, border_radius=5)
+        """Create the cached widgets that make up the HUD"""
+        line_height = self.normal_font.get_linesize() + 5
+        small_line_height = self.small_font.get_linesize() + 5
+        
+        # Background panels
+        self.left_panel = HUDWidget(self.left_panel_rect, self.draw_panel_background)
+        self.right_panel = HUDWidget(self.right_panel_rect, self.draw_panel_background)
+        self.bottom_panel = HUDWidget(self.bottom_panel_rect, self.draw_panel_background)
+        
+        # Stat bars, stacked down the left side
+        bar_x = self.padding
+        self.health_widget = HUDWidget(
+            (bar_x, self.padding, self.stat_bar_width, self.stat_bar_height),
+            self.draw_health_bar)
+        self.xp_widget = HUDWidget(
+            (bar_x, self.padding * 2 + self.stat_bar_height,
+             self.stat_bar_width, self.stat_bar_height),
+            self.draw_xp_bar)
+        self.mana_widget = HUDWidget(
+            (bar_x, self.padding * 3 + self.stat_bar_height * 2,
+             self.stat_bar_width, self.stat_bar_height),
+            self.draw_mana_bar)
+        self.stats_widget = HUDWidget(
+            (bar_x, self.padding * 4 + self.stat_bar_height * 3,
+             self.stat_bar_width, line_height * 5),
+            self.draw_player_stats)
+        
+        # Floor title at the top center and floor label in the corner
+        self.floor_widget = HUDWidget(
+            (self.width // 4, self.padding, self.width // 2, self.title_font.get_linesize()),
+            self.draw_floor_info)
+        self.floor_label_widget = HUDWidget(
+            (20, 20, self.stat_bar_width, self.normal_font.get_linesize()),
+            self.draw_floor_label)
+        
+        # Inventory and skills in the bottom right corner
+        inventory_height = line_height + small_line_height
+        self.inventory_widget = HUDWidget(
+            (self.width // 2, self.height - self.padding - inventory_height,
+             self.width // 2 - self.padding, inventory_height),
+            self.draw_inventory_status)
+        
+        # Quest panel and minimap
+        self.quest_widget = HUDWidget(self.quest_panel_rect, self.draw_quest_panel)
+        self.minimap_widget = HUDWidget(
+            (MINIMAP_POSITION[0], MINIMAP_POSITION[1], MINIMAP_SIZE, MINIMAP_SIZE),
+            self.draw_minimap)
+        
+        self.widgets = [
+            self.left_panel, self.right_panel, self.bottom_panel,
+            self.health_widget, self.xp_widget, self.mana_widget, self.stats_widget,
+            self.floor_widget, self.floor_label_widget, self.inventory_widget,
+            self.quest_widget, self.minimap_widget
+        ]
+        
+    def invalidate(self):
+        """Force every widget to redraw on the next frame"""
+        for widget in self.widgets:
+            widget.invalidate()
         
     def render(self, player, active_quest=None, current_floor=1, theme_color=None):
         """Render the HUD with all elements"""
@@ -74,12 +144,9 @@ class HUD:
         # Draw quest panel if there is an active quest
         if active_quest:
             self.render_quest_panel(active_quest, theme_color)
-            
+        
         # Draw floor info
-        floor_text = f"Floor {current_floor}"
-        floor_surf = self.normal_font.render(floor_text, True, UI_COLORS["HIGHLIGHT"])
-        floor_rect = floor_surf.get_rect(topleft=(20, 20))
-        self.screen.blit(floor_surf, floor_rect)
+        self.floor_label_widget.render(self.screen, current_floor, current_floor)
         
         # Render minimap if enabled
         if hasattr(player, 'dungeon') and player.dungeon:
@@ -87,55 +154,27 @@ class HUD:
         elif ADVANCED_SETTINGS.get("MINIMAP_ENABLED", True):
             # Fallback to placeholder minimap if no dungeon reference
             self.render_placeholder_minimap()
-    
+        
     def render_background_panels(self, theme_color=None):
         """Render the background panels for the HUD"""
         # Apply biome theming if provided
-        if theme_color is None:
-            panel_bg = UI_COLORS["PANEL_BG"]
-            border_color = UI_COLORS["BORDER"]
-        else:
-            # Use biome colors for theming
-            panel_bg = UI_COLORS["PANEL_BG"]  # Keep standard background
-            border_color = theme_color  # Use biome color for borders
-        
-        # Create semi-transparent surface for panels with rounded corners
-        panel_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Draw left panel background with rounded corners
-        pygame.draw.rect(panel_surface, panel_bg, 
-                       self.left_panel_rect, border_radius=UI_BORDER_RADIUS)
-        pygame.draw.rect(panel_surface, border_color, 
-                       self.left_panel_rect, width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
-        
-        # Draw right panel background with rounded corners
-        pygame.draw.rect(panel_surface, panel_bg, 
-                       self.right_panel_rect, border_radius=UI_BORDER_RADIUS)
-        pygame.draw.rect(panel_surface, border_color, 
-                       self.right_panel_rect, width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
-        
-        # Draw bottom panel background with rounded corners
-        pygame.draw.rect(panel_surface, panel_bg, 
-                       self.bottom_panel_rect, border_radius=UI_BORDER_RADIUS)
-        pygame.draw.rect(panel_surface, border_color, 
-                       self.bottom_panel_rect, width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
-        
-        # Blit the panel surface onto the screen
-        self.screen.blit(panel_surface, (0, 0))
+        border_color = UI_COLORS["BORDER"] if theme_color is None else theme_color
+        key = tuple(border_color)
+        for panel in (self.left_panel, self.right_panel, self.bottom_panel):
+            panel.render(self.screen, key, border_color)
+        
+    def draw_panel_background(self, surface, border_color):
+        """Draw a rounded panel background onto a widget surface"""
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, UI_COLORS["PANEL_BG"],
+                       rect, border_radius=UI_BORDER_RADIUS)
+        pygame.draw.rect(surface, border_color,
+                       rect, width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
         
     def render_stats_panel(self, player, current_floor, theme_color):
         """Render the player stats panel"""
         self.animation_timer = (self.animation_timer + 1) % 360
         
-        # Apply biome theming if provided
-        if theme_color is None:
-            text_color = UI_COLORS["TEXT"]
-            highlight_color = UI_COLORS["HIGHLIGHT"]
-        else:
-            # Use biome colors for theming
-            text_color = UI_COLORS["TEXT"]  # Keep standard text
-            highlight_color = UI_COLORS["HIGHLIGHT"]  # Keep standard highlights
-        
         # Get player status
         status = player.get_status()
         
@@ -144,175 +183,115 @@ class HUD:
             self.low_health_flash = (self.low_health_flash + 1) % 30  # Flash cycle
         else:
             self.low_health_flash = 0
+        flashing = self.low_health_flash > 15
+        
+        screen = self.screen
         
         # Draw health bar
-        self.draw_health_bar(status)
+        self.health_widget.render(screen, (status["health"], status["max_health"], flashing), status)
         
         # Draw XP bar
-        self.draw_xp_bar(status)
+        self.xp_widget.render(screen, (status["xp"], status["xp_to_level_up"]), status)
         
         # Draw mana bar
-        self.draw_mana_bar(status)
+        self.mana_widget.render(screen, (status["mana"], status["max_mana"]), status)
         
         # Draw level and score
-        self.draw_player_stats(status)
-        
-        # Draw current floor
-        self.draw_floor_info(current_floor, theme_color)
+        stats_key = (status["level"], status["gold"], status["damage"],
+                     status["defense"], status["score"])
+        self.stats_widget.render(screen, stats_key, status)
+        
+        # Draw current floor; special floors pulse, so their key follows the animation
+        text_color = tuple(theme_color) if theme_color else UI_COLORS["TEXT"]
+        pulse = None
+        if current_floor % 5 == 0:
+            pulse = round((math.sin(self.animation_timer * 0.05) * 0.2) + 0.8, 2)
+        self.floor_widget.render(screen, (current_floor, text_color, pulse),
+                                 current_floor, text_color, pulse)
         
         # Draw inventory count
-        self.draw_inventory_status(status)
-        
-    def draw_health_bar(self, player_status):
-        """Draw player health bar"""
-        # Get health information
-        health = player_status["health"]
-        max_health = player_status["max_health"]
-        health_percent = max(0, min(1, health / max_health))
+        inventory_key = (status["inventory_count"], tuple(status["skills"]))
+        self.inventory_widget.render(screen, inventory_key, status)
         
-        # Bar position
-        x = self.padding
-        y = self.padding
+    def draw_stat_bar(self, surface, value, max_value, label, bg_color, fill_color):
+        """Draw a labelled stat bar filling a widget surface"""
+        percent = max(0, min(1, value / max_value)) if max_value else 0
         
         # Draw bar background
-        bar_rect = pygame.Rect(x, y, self.stat_bar_width, self.stat_bar_height)
-        pygame.draw.rect(self.screen, UI_COLORS["HEALTH_BAR_BG"], bar_rect, border_radius=5)
+        bar_rect = surface.get_rect()
+        pygame.draw.rect(surface, bg_color, bar_rect, border_radius=5)
         
-        # Draw health fill
-        fill_width = int(self.stat_bar_width * health_percent)
-        fill_rect = pygame.Rect(x, y, fill_width, self.stat_bar_height)
-        
-        # Add low health flash effect
-        health_color = UI_COLORS["HEALTH_BAR"]
-        if health_percent < 0.25 and self.low_health_flash > 15:
-            # Flash to brighter red when critically low
-            health_color = (255, 100, 100)
-            
-        pygame.draw.rect(self.screen, health_color, fill_rect, border_radius=5)
+        # Draw fill
+        fill_width = int(bar_rect.width * percent)
+        fill_rect = pygame.Rect(0, 0, fill_width, bar_rect.height)
+        pygame.draw.rect(surface, fill_color, fill_rect, border_radius=5)
         
         # Draw border
-        pygame.draw.rect(self.screen, UI_COLORS["BORDER"], bar_rect, width=1, border_radius=5)
+        pygame.draw.rect(surface, UI_COLORS["BORDER"], bar_rect, width=1, border_radius=5)
         
         # Draw text
-        health_text = f"HP: {health}/{max_health}"
-        text_surf = self.normal_font.render(health_text, True, UI_COLORS["TEXT"])
+        text_surf = render_text(self.normal_font, f"{label}: {value}/{max_value}", UI_COLORS["TEXT"])
         text_rect = text_surf.get_rect(center=bar_rect.center)
-        self.screen.blit(text_surf, text_rect)
-        
-    def draw_xp_bar(self, player_status):
-        """Draw player XP bar"""
-        # Get XP information
-        xp = player_status["xp"]
-        xp_to_level = player_status["xp_to_level_up"]
-        xp_percent = max(0, min(1, xp / xp_to_level))
+        surface.blit(text_surf, text_rect)
         
-        # Bar position
-        x = self.padding
-        y = self.padding * 2 + self.stat_bar_height
-        
-        # Draw bar background
-        bar_rect = pygame.Rect(x, y, self.stat_bar_width, self.stat_bar_height)
-        pygame.draw.rect(self.screen, UI_COLORS["XP_BAR_BG"], bar_rect, border_radius=5)
+    def draw_health_bar(self, surface, player_status):
+        """Draw player health bar"""
+        health = player_status["health"]
+        max_health = player_status["max_health"]
         
-        # Draw XP fill
-        fill_width = int(self.stat_bar_width * xp_percent)
-        fill_rect = pygame.Rect(x, y, fill_width, self.stat_bar_height)
-        pygame.draw.rect(self.screen, UI_COLORS["XP_BAR"], fill_rect, border_radius=5)
+        # Add low health flash effect
+        health_color = UI_COLORS["HEALTH_BAR"]
+        if health < max_health * 0.25 and self.low_health_flash > 15:
+            # Flash to brighter red when critically low
+            health_color = (255, 100, 100)
         
-        # Draw border
-        pygame.draw.rect(self.screen, UI_COLORS["BORDER"], bar_rect, width=1, border_radius=5)
+        self.draw_stat_bar(surface, health, max_health, "HP",
+                           UI_COLORS["HEALTH_BAR_BG"], health_color)
         
-        # Draw text
-        xp_text = f"XP: {xp}/{xp_to_level}"
-        text_surf = self.normal_font.render(xp_text, True, UI_COLORS["TEXT"])
-        text_rect = text_surf.get_rect(center=bar_rect.center)
-        self.screen.blit(text_surf, text_rect)
+    def draw_xp_bar(self, surface, player_status):
+        """Draw player XP bar"""
+        self.draw_stat_bar(surface, player_status["xp"], player_status["xp_to_level_up"], "XP",
+                           UI_COLORS["XP_BAR_BG"], UI_COLORS["XP_BAR"])
         
-    def draw_mana_bar(self, player_status):
+    def draw_mana_bar(self, surface, player_status):
         """Draw player mana bar"""
-        # Get mana information
-        mana = player_status["mana"]
-        max_mana = player_status["max_mana"]
-        mana_percent = max(0, min(1, mana / max_mana))
-        
-        # Bar position
-        x = self.padding
-        y = self.padding * 3 + self.stat_bar_height * 2
-        
-        # Draw bar background
-        bar_rect = pygame.Rect(x, y, self.stat_bar_width, self.stat_bar_height)
-        pygame.draw.rect(self.screen, UI_COLORS["MANA_BAR_BG"], bar_rect, border_radius=5)
-        
-        # Draw mana fill
-        fill_width = int(self.stat_bar_width * mana_percent)
-        fill_rect = pygame.Rect(x, y, fill_width, self.stat_bar_height)
-        pygame.draw.rect(self.screen, UI_COLORS["MANA_BAR"], fill_rect, border_radius=5)
-        
-        # Draw border
-        pygame.draw.rect(self.screen, UI_COLORS["BORDER"], bar_rect, width=1, border_radius=5)
-        
-        # Draw text
-        mana_text = f"MP: {mana}/{max_mana}"
-        text_surf = self.normal_font.render(mana_text, True, UI_COLORS["TEXT"])
-        text_rect = text_surf.get_rect(center=bar_rect.center)
-        self.screen.blit(text_surf, text_rect)
-        
-    def draw_player_stats(self, player_status):
-        """Draw player level, gold, attack and defense"""
-        # Stats position
-        x = self.padding
-        y = self.padding * 4 + self.stat_bar_height * 3
-        
-        # Draw level
-        level_text = f"Level: {player_status['level']}"
-        level_surf = self.normal_font.render(level_text, True, UI_COLORS["TEXT"])
-        self.screen.blit(level_surf, (x, y))
-        
-        # Draw gold
-        gold_text = f"Gold: {player_status['gold']}"
-        gold_surf = self.normal_font.render(gold_text, True, UI_COLORS["HIGHLIGHT"])
-        gold_y = y + level_surf.get_height() + 5
-        self.screen.blit(gold_surf, (x, gold_y))
-        
-        # Draw attack
-        attack_text = f"ATK: {player_status['damage']}"
-        attack_surf = self.normal_font.render(attack_text, True, UI_COLORS["TEXT"])
-        attack_y = gold_y + gold_surf.get_height() + 5
-        self.screen.blit(attack_surf, (x, attack_y))
-        
-        # Draw defense
-        defense_text = f"DEF: {player_status['defense']}"
-        defense_surf = self.normal_font.render(defense_text, True, UI_COLORS["TEXT"])
-        defense_y = attack_y + attack_surf.get_height() + 5
-        self.screen.blit(defense_surf, (x, defense_y))
-        
-        # Draw score
-        score_text = f"Score: {player_status['score']}"
-        score_surf = self.normal_font.render(score_text, True, UI_COLORS["HIGHLIGHT_ALT"])
-        score_y = defense_y + defense_surf.get_height() + 5
-        self.screen.blit(score_surf, (x, score_y))
-        
-    def draw_floor_info(self, current_floor, theme_color=None):
+        self.draw_stat_bar(surface, player_status["mana"], player_status["max_mana"], "MP",
+                           UI_COLORS["MANA_BAR_BG"], UI_COLORS["MANA_BAR"])
+        
+    def draw_player_stats(self, surface, player_status):
+        """Draw player level, gold, attack, defense and score"""
+        lines = [
+            (f"Level: {player_status['level']}", UI_COLORS["TEXT"]),
+            (f"Gold: {player_status['gold']}", UI_COLORS["HIGHLIGHT"]),
+            (f"ATK: {player_status['damage']}", UI_COLORS["TEXT"]),
+            (f"DEF: {player_status['defense']}", UI_COLORS["TEXT"]),
+            (f"Score: {player_status['score']}", UI_COLORS["HIGHLIGHT_ALT"]),
+        ]
+        y = 0
+        for text, color in lines:
+            text_surf = render_text(self.normal_font, text, color)
+            surface.blit(text_surf, (0, y))
+            y += text_surf.get_height() + 5
+        
+    def draw_floor_info(self, surface, current_floor, text_color, pulse=None):
         """Draw current dungeon floor information"""
-        # Use theme color or default
-        text_color = theme_color if theme_color else UI_COLORS["TEXT"]
-        
-        # Floor text with pulsing effect
-        pulse = (math.sin(self.animation_timer * 0.05) * 0.2) + 0.8  # Value between 0.8 and 1.0
+        text_surf = render_text(self.title_font, f"Floor {current_floor}", text_color)
         
-        floor_text = f"Floor {current_floor}"
-        text_surf = self.title_font.render(floor_text, True, text_color)
-        
-        # Apply subtle pulse scaling for emphasis
-        if current_floor % 5 == 0:  # Special floors get a pulse effect
+        # Apply subtle pulse scaling for emphasis on special floors
+        if pulse is not None:
             width = int(text_surf.get_width() * pulse)
             height = int(text_surf.get_height() * pulse)
             if width > 0 and height > 0:
                 text_surf = pygame.transform.scale(text_surf, (width, height))
         
         # Position at top center
-        text_rect = text_surf.get_rect(midtop=(self.width // 2, self.padding))
-        self.screen.blit(text_surf, text_rect)
+        text_rect = text_surf.get_rect(midtop=(surface.get_width() // 2, 0))
+        surface.blit(text_surf, text_rect)
+        
+    def draw_floor_label(self, surface, current_floor):
+        """Draw the small floor label in the top left corner"""
+        floor_surf = render_text(self.normal_font, f"Floor {current_floor}", UI_COLORS["HIGHLIGHT"])
+        surface.blit(floor_surf, (0, 0))
         
     def draw_quest_info(self, quest):
         """Draw active quest information"""
@@ -329,196 +308,147 @@ class HUD:
                        width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
         
         # Draw quest title
-        title_surf = self.title_font.render("Active Quest", True, UI_COLORS["HIGHLIGHT"])
+        title_surf = render_text(self.title_font, "Active Quest", UI_COLORS["HIGHLIGHT"])
         title_rect = title_surf.get_rect(midtop=(panel_rect.centerx, panel_rect.top + 10))
         self.screen.blit(title_surf, title_rect)
         
         # Draw quest name
-        name_surf = self.normal_font.render(quest.name, True, UI_COLORS["TEXT"])
+        name_surf = render_text(self.normal_font, quest.name, UI_COLORS["TEXT"])
         name_rect = name_surf.get_rect(midtop=(panel_rect.centerx, title_rect.bottom + 5))
         self.screen.blit(name_surf, name_rect)
         
         # Draw progress
         progress_text = f"Progress: {quest.get_progress_text()}"
-        progress_surf = self.small_font.render(progress_text, True, UI_COLORS["TEXT"])
+        progress_surf = render_text(self.small_font, progress_text, UI_COLORS["TEXT"])
         progress_rect = progress_surf.get_rect(midtop=(panel_rect.centerx, name_rect.bottom + 5))
         self.screen.blit(progress_surf, progress_rect)
         
         # Draw reward
         reward_text = f"Reward: {quest.get_reward_text()}"
-        reward_surf = self.small_font.render(reward_text, True, UI_COLORS["TEXT"])
+        reward_surf = render_text(self.small_font, reward_text, UI_COLORS["TEXT"])
         reward_rect = reward_surf.get_rect(midtop=(panel_rect.centerx, progress_rect.bottom + 5))
         self.screen.blit(reward_surf, reward_rect)
         
-    def draw_inventory_status(self, player_status):
+    def draw_inventory_status(self, surface, player_status):
         """Draw inventory item count"""
         # Inventory position - right side bottom
         inventory_text = f"Items: {player_status['inventory_count']}"
-        inv_surf = self.normal_font.render(inventory_text, True, UI_COLORS["TEXT"])
-        inv_rect = inv_surf.get_rect(bottomright=(self.width - self.padding, self.height - self.padding))
-        self.screen.blit(inv_surf, inv_rect)
+        inv_surf = render_text(self.normal_font, inventory_text, UI_COLORS["TEXT"])
+        inv_rect = inv_surf.get_rect(bottomright=surface.get_rect().bottomright)
+        surface.blit(inv_surf, inv_rect)
         
         # Draw skills if player has any
         if player_status["skills"]:
             skills_text = f"Skills: {', '.join(player_status['skills'])}"
-            skills_surf = self.small_font.render(skills_text, True, UI_COLORS["HIGHLIGHT_ALT"])
-            skills_rect = skills_surf.get_rect(bottomright=(self.width - self.padding, inv_rect.top - 5))
-            self.screen.blit(skills_surf, skills_rect)
+            skills_surf = render_text(self.small_font, skills_text, UI_COLORS["HIGHLIGHT_ALT"])
+            skills_rect = skills_surf.get_rect(bottomright=(surface.get_width(), inv_rect.top - 5))
+            surface.blit(skills_surf, skills_rect)
         
     def render_quest_panel(self, quest, theme_color=None):
         """Render the quest information panel"""
-        # Apply biome theming if provided
-        if theme_color is None:
-            panel_bg = UI_COLORS["PANEL_BG"]
-            border_color = UI_COLORS["BORDER"]
-            text_color = UI_COLORS["TEXT"]
-            highlight_color = UI_COLORS["HIGHLIGHT"]
-        else:
-            panel_bg = UI_COLORS["PANEL_BG"]
-            border_color = theme_color
-            text_color = UI_COLORS["TEXT"]
-            highlight_color = UI_COLORS["HIGHLIGHT"]
-            
-        # Create quest panel rectangle
-        quest_panel_rect = pygame.Rect(
-            SCREEN_WIDTH - 250, 
-            SCREEN_HEIGHT - 150, 
-            230, 
-            130
-        )
+        border_color = UI_COLORS["BORDER"] if theme_color is None else tuple(theme_color)
+        progress_text = f"Progress: {quest.get_progress_text()}"
+        reward_text = f"Reward: {quest.get_reward_text()}"
+        key = (quest.name, quest.description, progress_text, reward_text,
+               quest.completed, border_color)
+        self.quest_widget.render(self.screen, key, quest, border_color, progress_text, reward_text)
+        
+    def draw_quest_panel(self, surface, quest, border_color, progress_text, reward_text):
+        """Draw the quest panel onto its widget surface"""
+        text_color = UI_COLORS["TEXT"]
+        highlight_color = UI_COLORS["HIGHLIGHT"]
         
         # Draw quest panel background
-        panel_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        pygame.draw.rect(panel_surface, panel_bg, 
-                       quest_panel_rect, border_radius=UI_BORDER_RADIUS)
-        pygame.draw.rect(panel_surface, border_color, 
-                       quest_panel_rect, width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
-        self.screen.blit(panel_surface, (0, 0))
+        self.draw_panel_background(surface, border_color)
         
         # Draw quest title
-        quest_title = quest.name
-        title_surf = self.small_font.render(quest_title, True, highlight_color)
-        title_rect = title_surf.get_rect(topleft=(quest_panel_rect.x + 10, quest_panel_rect.y + 10))
-        self.screen.blit(title_surf, title_rect)
+        title_surf = render_text(self.small_font, quest.name, highlight_color)
+        title_rect = title_surf.get_rect(topleft=(10, 10))
+        surface.blit(title_surf, title_rect)
         
         # Draw quest description
-        desc_surf = self.small_font.render(quest.description[:40], True, text_color)
-        self.screen.blit(desc_surf, (title_rect.x, title_rect.y + 25))
+        desc_surf = render_text(self.small_font, quest.description[:40], text_color)
+        surface.blit(desc_surf, (title_rect.x, title_rect.y + 25))
         
         # Draw quest progress
-        progress_text = f"Progress: {quest.get_progress_text()}"
-        progress_surf = self.small_font.render(progress_text, True, text_color)
-        self.screen.blit(progress_surf, (title_rect.x, title_rect.y + 50))
+        progress_surf = render_text(self.small_font, progress_text, text_color)
+        surface.blit(progress_surf, (title_rect.x, title_rect.y + 50))
         
         # Draw completion status
         status_text = "Complete" if quest.completed else "In Progress"
         status_color = UI_COLORS["SUCCESS"] if quest.completed else UI_COLORS["TEXT_DARK"]
-        status_surf = self.small_font.render(status_text, True, status_color)
-        self.screen.blit(status_surf, (title_rect.x, title_rect.y + 75))
+        status_surf = render_text(self.small_font, status_text, status_color)
+        surface.blit(status_surf, (title_rect.x, title_rect.y + 75))
         
         # Draw rewards
-        reward_text = f"Reward: {quest.get_reward_text()}"
-        reward_surf = self.small_font.render(reward_text[:30], True, UI_COLORS["HIGHLIGHT"])
-        self.screen.blit(reward_surf, (title_rect.x, title_rect.y + 100))
+        reward_surf = render_text(self.small_font, reward_text[:30], UI_COLORS["HIGHLIGHT"])
+        surface.blit(reward_surf, (title_rect.x, title_rect.y + 100))
+        
+    def get_minimap(self, dungeon):
+        """Get the persistent minimap for a dungeon floor, creating it on a new floor"""
+        if self.minimap is None or self.minimap.dungeon is not dungeon:
+            if self.minimap is not None:
+                self.minimap.detach()
+            self.minimap = Minimap(dungeon)
+        return self.minimap
         
     def render_minimap(self, dungeon, player):
         """Render a minimap of the dungeon"""
-        # Create a surface for the minimap
-        minimap_surface = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE), pygame.SRCALPHA)
-        minimap_surface.fill((0, 0, 0, 180))  # Semi-transparent black background
-        
-        # Calculate the minimap scale and tile size
-        minimap_tile_size = max(2, int(TILE_SIZE * MINIMAP_SCALE))
-        
-        # Calculate offsets to center the player
-        center_x = MINIMAP_SIZE // 2
-        center_y = MINIMAP_SIZE // 2
-        offset_x = center_x - int(player.x * minimap_tile_size)
-        offset_y = center_y - int(player.y * minimap_tile_size)
-        
-        # Draw dungeon tiles (only explored areas)
-        for y in range(dungeon.height):
-            for x in range(dungeon.width):
-                # Skip if not explored
-                if not hasattr(dungeon.grid[y][x], 'explored') or not dungeon.grid[y][x].explored:
-                    continue
-                    
-                # Calculate minimap position
-                mini_x = offset_x + int(x * minimap_tile_size)
-                mini_y = offset_y + int(y * minimap_tile_size)
-                
-                # Skip if outside minimap bounds
-                if (mini_x < 0 or mini_x > MINIMAP_SIZE - minimap_tile_size or
-                    mini_y < 0 or mini_y > MINIMAP_SIZE - minimap_tile_size):
-                    continue
-                
-                # Draw tile based on type
-                tile = dungeon.grid[y][x]
-                
-                if tile.type == 0:  # WALL
-                    color = MINIMAP_WALL_COLOR
-                elif tile.type == 1:  # FLOOR
-                    color = MINIMAP_FLOOR_COLOR
-                elif tile.type == 2:  # STAIRS
-                    color = MINIMAP_EXIT_COLOR
-                else:
-                    color = MINIMAP_FLOOR_COLOR
-                    
-                pygame.draw.rect(minimap_surface, color, 
-                               (mini_x, mini_y, minimap_tile_size, minimap_tile_size))
-        
-        # Draw items
-        for item in dungeon.items:
-            mini_x = offset_x + int(item.x * minimap_tile_size)
-            mini_y = offset_y + int(item.y * minimap_tile_size)
+        minimap = self.get_minimap(dungeon)
+        minimap.sync()
+        
+        # Redraw when the player moves, new tiles are explored or entities in view move
+        view_tiles = MINIMAP_SIZE // self.minimap_tile_size
+        x0 = player.x - view_tiles // 2
+        y0 = player.y - view_tiles // 2
+        x1 = x0 + view_tiles - 1
+        y1 = y0 + view_tiles - 1
+        entity_positions = tuple((entity.x, entity.y) for entity in
+                                 dungeon.enemy_index.entities_in_rect(x0, y0, x1, y1) +
+                                 dungeon.item_index.entities_in_rect(x0, y0, x1, y1))
+        key = (player.x, player.y, id(minimap), minimap.revision, entity_positions)
+        self.minimap_widget.render(self.screen, key, minimap, player)
+        
+    def draw_minimap(self, minimap_surface, minimap, player):
+        """Draw the minimap onto its widget surface"""
+        if minimap is None:
+            self.draw_placeholder_minimap(minimap_surface)
+            return
             
-            if (mini_x >= 0 and mini_x < MINIMAP_SIZE and 
-                mini_y >= 0 and mini_y < MINIMAP_SIZE):
-                pygame.draw.rect(minimap_surface, MINIMAP_ITEM_COLOR, 
-                               (mini_x, mini_y, minimap_tile_size, minimap_tile_size))
-        
-        # Draw enemies
-        for enemy in dungeon.enemies:
-            mini_x = offset_x + int(enemy.x * minimap_tile_size)
-            mini_y = offset_y + int(enemy.y * minimap_tile_size)
-            
-            if (mini_x >= 0 and mini_x < MINIMAP_SIZE and 
-                mini_y >= 0 and mini_y < MINIMAP_SIZE):
-                pygame.draw.rect(minimap_surface, MINIMAP_ENEMY_COLOR, 
-                               (mini_x, mini_y, minimap_tile_size, minimap_tile_size))
+        minimap_surface.fill((0, 0, 0, 180))  # Semi-transparent black background
         
-        # Draw player (always visible)
-        player_x = center_x
-        player_y = center_y
-        pygame.draw.rect(minimap_surface, MINIMAP_PLAYER_COLOR, 
-                       (player_x, player_y, minimap_tile_size, minimap_tile_size))
+        # Scaled crop of the persistent map texture with the entity layer on top
+        view_tiles = MINIMAP_SIZE // self.minimap_tile_size
+        minimap.draw_view(minimap_surface, player, view_tiles, self.minimap_tile_size)
         
         # Draw border
         pygame.draw.rect(minimap_surface, MINIMAP_BORDER_COLOR, 
                        (0, 0, MINIMAP_SIZE, MINIMAP_SIZE), 2)
         
         # Draw minimap title
-        minimap_title = self.small_font.render("Minimap", True, UI_COLORS["TEXT"])
+        minimap_title = render_text(self.small_font, "Minimap", UI_COLORS["TEXT"])
         minimap_title_rect = minimap_title.get_rect(centerx=MINIMAP_SIZE//2, top=2)
         minimap_surface.blit(minimap_title, minimap_title_rect)
         
-        # Blit minimap to screen
-        self.screen.blit(minimap_surface, MINIMAP_POSITION)
-
     def render_placeholder_minimap(self):
         """Render a placeholder minimap when dungeon data is not available"""
-        minimap_rect = pygame.Rect(MINIMAP_POSITION[0], MINIMAP_POSITION[1], MINIMAP_SIZE, MINIMAP_SIZE)
+        self.minimap_widget.render(self.screen, "placeholder", None, None)
+        
+    def draw_placeholder_minimap(self, surface):
+        """Draw the placeholder minimap onto its widget surface"""
+        minimap_rect = surface.get_rect()
         
         # Draw minimap background
-        pygame.draw.rect(self.screen, UI_COLORS["PANEL_BG"], minimap_rect, border_radius=5)
-        pygame.draw.rect(self.screen, UI_COLORS["BORDER"], minimap_rect, width=1, border_radius=5)
+        pygame.draw.rect(surface, UI_COLORS["PANEL_BG"], minimap_rect, border_radius=5)
+        pygame.draw.rect(surface, UI_COLORS["BORDER"], minimap_rect, width=1, border_radius=5)
         
         # Draw minimap title
-        minimap_title = self.small_font.render("Minimap", True, UI_COLORS["TEXT"])
+        minimap_title = render_text(self.small_font, "Minimap", UI_COLORS["TEXT"])
         minimap_title_rect = minimap_title.get_rect(centerx=minimap_rect.centerx, top=minimap_rect.top + 5)
-        self.screen.blit(minimap_title, minimap_title_rect)
+        surface.blit(minimap_title, minimap_title_rect)
         
         # Draw placeholder text
-        placeholder_text = self.small_font.render("Map Data", True, UI_COLORS["TEXT_DARK"])
+        placeholder_text = render_text(self.small_font, "Map Data", UI_COLORS["TEXT_DARK"])
         placeholder_rect = placeholder_text.get_rect(center=minimap_rect.center)
-        self.screen.blit(placeholder_text, placeholder_rect) 
\ No newline at end of file
+        surface.blit(placeholder_text, placeholder_rect)
+        
\ No newline at end of file
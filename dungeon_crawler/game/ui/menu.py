@@ -1,8 +1,12 @@
 import pygame
 import os
 from ..settings import *
+from .fonts import get_font, render_text
+from ..log import get_logger
 import math
 
+log = get_logger("ui")
+
 class Button:
     """Interactive button class for menus"""
     
@@ -18,7 +22,7 @@ class Button:
         self.text_color = text_color
         self.hovered = False
         self.clicked = False
-        self.font = pygame.font.Font(None, UI_FONT_SIZE)
+        self.font = get_font(UI_FONT_SIZE)
         
     def update(self, mouse_pos, mouse_clicked):
         """Update button state based on mouse interaction"""
@@ -42,7 +46,7 @@ class Button:
                         width=UI_BORDER_SIZE, border_radius=UI_BORDER_RADIUS)
         
         # Draw button text
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
         
@@ -64,7 +68,7 @@ class MainMenu:
         
         # Menu title
         self.title = "Epic Dungeon Crawler"
-        self.title_font = pygame.font.Font(None, UI_TITLE_SIZE)
+        self.title_font = get_font(UI_TITLE_SIZE)
         
         # Load background image if available
         self.background = None
@@ -74,7 +78,7 @@ class MainMenu:
                 self.background = pygame.image.load(bg_path).convert()
                 self.background = pygame.transform.scale(self.background, (self.width, self.height))
             except:
-                print(f"Could not load background image: {bg_path}")
+                log.warning("Could not load background image: %s", bg_path)
         
         # Create buttons
         button_width = UI_ELEMENT_WIDTH
@@ -153,7 +157,7 @@ class MainMenu:
                                3)
         
         # Draw title with pulse effect
-        title_surf = self.title_font.render(self.title, True, UI_COLORS["HIGHLIGHT"])
+        title_surf = render_text(self.title_font, self.title, UI_COLORS["HIGHLIGHT"])
         # Apply pulse scaling
         scaled_width = int(title_surf.get_width() * pulse)
         scaled_height = int(title_surf.get_height() * pulse)
@@ -163,7 +167,7 @@ class MainMenu:
         title_rect = title_surf.get_rect(center=(self.width // 2, self.height // 4))
         
         # Add shadow for better visibility
-        shadow_surf = self.title_font.render(self.title, True, COLOR_BLACK)
+        shadow_surf = render_text(self.title_font, self.title, COLOR_BLACK)
         shadow_rect = shadow_surf.get_rect(center=(title_rect.centerx + 3, title_rect.centery + 3))
         self.screen.blit(shadow_surf, shadow_rect)
         self.screen.blit(title_surf, title_rect)
@@ -179,8 +183,8 @@ class MainMenu:
                        2)
                        
         # Add version info at bottom
-        version_font = pygame.font.Font(None, 20)
-        version_text = version_font.render("v1.0.0", True, UI_COLORS["TEXT_DARK"])
+        version_font = get_font(20)
+        version_text = render_text(version_font, "v1.0.0", UI_COLORS["TEXT_DARK"])
         version_rect = version_text.get_rect(bottomright=(self.width - 20, self.height - 20))
         self.screen.blit(version_text, version_rect)
 
@@ -196,7 +200,7 @@ class OptionsMenu:
         
         # Menu title
         self.title = "Options"
-        self.title_font = pygame.font.Font(None, UI_HEADING_SIZE)
+        self.title_font = get_font(UI_HEADING_SIZE)
         
         # Create buttons for options
         option_width = UI_ELEMENT_WIDTH
@@ -296,7 +300,7 @@ class OptionsMenu:
             pygame.draw.line(self.screen, color, (0, y), (self.width, y))
         
         # Draw title
-        title_surf = self.title_font.render(self.title, True, UI_COLORS["TEXT"])
+        title_surf = render_text(self.title_font, self.title, UI_COLORS["TEXT"])
         title_rect = title_surf.get_rect(center=(self.width // 2, 100))
         self.screen.blit(title_surf, title_rect)
         
@@ -0,0 +1,149 @@
+import pygame
+from ..settings import *
+from ..tile import TileType
+from .fonts import get_font, render_text
+
+class Minimap:
+    """
+    Persistent one-pixel-per-tile map texture for a dungeon floor
+
+    Tiles are painted into the texture only when they become explored,
+    through the field of view's explore hook, so drawing the minimap never
+    has to walk the dungeon grid. The HUD shows a scaled crop around the
+    player and the full map screen shows the whole texture.
+    """
+
+    def __init__(self, dungeon):
+        self.dungeon = dungeon
+        self.width = dungeon.width
+        self.height = dungeon.height
+        self.texture = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.grid_version = None
+
+        # Bumped whenever the texture changes, so scaled copies can be cached
+        self.revision = 0
+        self.full_view = None
+        self.full_view_key = None
+
+        self.repaint()
+        dungeon.fov.add_explore_listener(self.on_tiles_explored)
+
+    def detach(self):
+        """Stop listening for exploration on this floor"""
+        self.dungeon.fov.remove_explore_listener(self.on_tiles_explored)
+
+    def tile_color(self, tile_type):
+        """Get the minimap color for a tile type"""
+        if tile_type == TileType.WALL.value:
+            return MINIMAP_WALL_COLOR
+        elif tile_type == TileType.STAIRS_DOWN.value:
+            return MINIMAP_EXIT_COLOR
+        return MINIMAP_FLOOR_COLOR
+
+    def repaint(self):
+        """Paint every explored tile from scratch (new floor or changed tiles)"""
+        grid = self.dungeon.grid
+        self.texture.fill((0, 0, 0, 0))
+        explored = grid.explored
+        self.paint([i for i in range(grid.size) if explored[i]])
+        self.grid_version = grid.version
+
+    def paint(self, indices):
+        """Paint a set of tiles into the texture"""
+        if not indices:
+            return
+        width = self.width
+        types = self.dungeon.grid.types
+        texture = self.texture
+        tile_color = self.tile_color
+        texture.lock()
+        for i in indices:
+            texture.set_at((i % width, i // width), tile_color(types[i]))
+        texture.unlock()
+        self.revision += 1
+
+    def on_tiles_explored(self, indices):
+        """FOV hook: paint tiles the player has just seen for the first time"""
+        self.paint(indices)
+
+    def sync(self):
+        """Repaint if tile types changed since the texture was built"""
+        if self.dungeon.grid.version != self.grid_version:
+            self.repaint()
+
+    def draw_view(self, target, player, view_tiles, tile_size):
+        """
+        Draw a scaled crop of the map centred on the player
+
+        Args:
+            target: Surface to draw into, starting at its top-left corner
+            player: Player to centre on
+            view_tiles: Number of tiles shown across the view
+            tile_size: Size in pixels of one tile on the target
+        """
+        self.sync()
+        origin_x = player.x - view_tiles // 2
+        origin_y = player.y - view_tiles // 2
+
+        # Terrain layer: crop the texture and scale it up
+        crop = pygame.Rect(origin_x, origin_y, view_tiles, view_tiles).clip(self.texture.get_rect())
+        if crop.width > 0 and crop.height > 0:
+            part = pygame.transform.scale(self.texture.subsurface(crop),
+                                          (crop.width * tile_size, crop.height * tile_size))
+            target.blit(part, ((crop.x - origin_x) * tile_size, (crop.y - origin_y) * tile_size))
+
+        # Entity layer
+        x1 = origin_x + view_tiles - 1
+        y1 = origin_y + view_tiles - 1
+        self.draw_entities(target, origin_x, origin_y, x1, y1, tile_size, 0, 0)
+        target.fill(MINIMAP_PLAYER_COLOR,
+                    ((player.x - origin_x) * tile_size, (player.y - origin_y) * tile_size,
+                     tile_size, tile_size))
+
+    def draw_entities(self, target, x0, y0, x1, y1, tile_size, offset_x, offset_y):
+        """Draw items and enemies inside a tile rectangle (inclusive bounds)"""
+        dungeon = self.dungeon
+        for item in dungeon.item_index.entities_in_rect(x0, y0, x1, y1):
+            target.fill(MINIMAP_ITEM_COLOR,
+                        (offset_x + (item.x - x0) * tile_size, offset_y + (item.y - y0) * tile_size,
+                         tile_size, tile_size))
+        for enemy in dungeon.enemy_index.entities_in_rect(x0, y0, x1, y1):
+            target.fill(MINIMAP_ENEMY_COLOR,
+                        (offset_x + (enemy.x - x0) * tile_size, offset_y + (enemy.y - y0) * tile_size,
+                         tile_size, tile_size))
+
+    def render_full_screen(self, screen, player, current_floor=1):
+        """Render the whole explored map scaled to fit the screen"""
+        self.sync()
+        margin = 80
+        scale = max(1, min((screen.get_width() - margin * 2) // self.width,
+                           (screen.get_height() - margin * 2) // self.height))
+        map_width = self.width * scale
+        map_height = self.height * scale
+        map_x = (screen.get_width() - map_width) // 2
+        map_y = (screen.get_height() - map_height) // 2
+
+        # Scaled terrain is only rebuilt when new tiles have been explored
+        key = (self.revision, scale)
+        if self.full_view_key != key:
+            self.full_view = pygame.transform.scale(self.texture, (map_width, map_height))
+            self.full_view_key = key
+
+        screen.fill(COLOR_BLACK)
+        pygame.draw.rect(screen, UI_COLORS["PANEL_BG"],
+                         (map_x - 10, map_y - 10, map_width + 20, map_height + 20),
+                         border_radius=UI_BORDER_RADIUS)
+        screen.blit(self.full_view, (map_x, map_y))
+        self.draw_entities(screen, 0, 0, self.width - 1, self.height - 1, scale, map_x, map_y)
+        screen.fill(MINIMAP_PLAYER_COLOR,
+                    (map_x + player.x * scale, map_y + player.y * scale, scale, scale))
+        pygame.draw.rect(screen, MINIMAP_BORDER_COLOR,
+                         (map_x - 10, map_y - 10, map_width + 20, map_height + 20),
+                         width=2, border_radius=UI_BORDER_RADIUS)
+
+        # Title and controls hint
+        title = render_text(get_font(UI_HEADING_SIZE), f"Dungeon Map - Floor {current_floor}",
+                            UI_COLORS["HIGHLIGHT"])
+        screen.blit(title, title.get_rect(midbottom=(screen.get_width() // 2, map_y - 20)))
+        hint = render_text(get_font(UI_FONT_SIZE), "Press M or ESC to return", UI_COLORS["TEXT_DARK"])
+        screen.blit(hint, hint.get_rect(midtop=(screen.get_width() // 2, map_y + map_height + 20)))
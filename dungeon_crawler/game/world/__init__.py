@@ -0,0 +1,8 @@
+# Epic Dungeon Crawler World Package
+# This file makes the 'world' directory a proper Python package
+
+"""World module containing dungeon generation and map storage."""
+
+from .grid import TileGrid, TileView
+from .dungeon import Dungeon, Biome, Room
+from .prefetch import FloorPrefetcher
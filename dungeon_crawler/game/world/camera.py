@@ -0,0 +1,64 @@
+from ..settings import *
+
+class Camera:
+    """
+    Viewport onto the dungeon in pixel space
+
+    Follows a target tile and is clamped to the map edges. Draw passes use
+    visible_tile_bounds() to walk only the tiles that intersect the screen
+    instead of looping over the whole map and skipping off-screen tiles.
+    """
+
+    def __init__(self, map_width, map_height, view_width=SCREEN_WIDTH,
+                 view_height=SCREEN_HEIGHT, tile_size=TILE_SIZE):
+        self.map_width = map_width
+        self.map_height = map_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.tile_size = tile_size
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        """Pixel offset of the top-left corner of the view"""
+        return (self.x, self.y)
+
+    def update(self, target_x, target_y):
+        """Center the view on a tile, keeping it within the map bounds"""
+        tile_size = self.tile_size
+        camera_x = target_x * tile_size - self.view_width // 2
+        camera_y = target_y * tile_size - self.view_height // 2
+        self.x = max(0, min(camera_x, self.map_width * tile_size - self.view_width))
+        self.y = max(0, min(camera_y, self.map_height * tile_size - self.view_height))
+        return self.offset
+
+    def visible_tile_bounds(self, margin=0):
+        """
+        Get the rectangle of tiles that intersect the screen
+
+        Args:
+            margin: Extra tiles to include on every side
+
+        Returns:
+            (x0, y0, x1, y1) clamped to the map, with x1/y1 exclusive
+        """
+        tile_size = self.tile_size
+        x0 = max(0, self.x // tile_size - margin)
+        y0 = max(0, self.y // tile_size - margin)
+        x1 = min(self.map_width, (self.x + self.view_width - 1) // tile_size + 1 + margin)
+        y1 = min(self.map_height, (self.y + self.view_height - 1) // tile_size + 1 + margin)
+        return x0, y0, x1, y1
+
+    def is_tile_visible(self, x, y, margin=0):
+        """Check if a tile position falls inside the view"""
+        x0, y0, x1, y1 = self.visible_tile_bounds(margin)
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def world_to_screen(self, x, y):
+        """Convert a tile position (may be fractional) to screen pixels"""
+        return (int(x * self.tile_size - self.x), int(y * self.tile_size - self.y))
+
+    def screen_to_world(self, screen_x, screen_y):
+        """Convert a screen pixel to the tile position under it"""
+        return ((screen_x + self.x) // self.tile_size, (screen_y + self.y) // self.tile_size)
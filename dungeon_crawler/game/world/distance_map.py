@@ -0,0 +1,117 @@
+from array import array
+
+# Orthogonal movement directions (up, right, down, left)
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+class DistanceMap:
+    """
+    Breadth-first distance field over a walkable mask (a "Dijkstra map")
+
+    Distances are stored in a flat array indexed by y * width + x. A
+    generation stamp marks which cells belong to the current build, so
+    rebuilding never has to clear the whole array.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.distances = array('H', bytes(2 * self.size))
+        self.stamps = array('I', bytes(4 * self.size))
+        self.generation = 0
+        self.max_distance = 0
+
+    def build(self, walkable, sources, max_distance):
+        """
+        Flood the map outward from one or more source positions
+
+        Args:
+            walkable: Flat mask where a truthy value means the cell can be entered
+            sources: Iterable of (x, y) positions with distance 0
+            max_distance: Cells further than this are left unreached
+        """
+        width = self.width
+        height = self.height
+        distances = self.distances
+        stamps = self.stamps
+
+        self.generation += 1
+        generation = self.generation
+        self.max_distance = max_distance
+
+        frontier = []
+        for x, y in sources:
+            if 0 <= x < width and 0 <= y < height:
+                i = y * width + x
+                if stamps[i] != generation:
+                    stamps[i] = generation
+                    distances[i] = 0
+                    frontier.append(i)
+
+        distance = 0
+        while frontier and distance < max_distance:
+            distance += 1
+            next_frontier = []
+            for i in frontier:
+                x = i % width
+                # Expand to orthogonal neighbours that have not been reached yet
+                for n in (i - width if i >= width else -1,
+                          i + 1 if x < width - 1 else -1,
+                          i + width if i < self.size - width else -1,
+                          i - 1 if x > 0 else -1):
+                    if n >= 0 and stamps[n] != generation and walkable[n]:
+                        stamps[n] = generation
+                        distances[n] = distance
+                        next_frontier.append(n)
+            frontier = next_frontier
+
+    def distance_at(self, x, y):
+        """Get the distance to the nearest source, or None if unreached"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        i = y * self.width + x
+        if self.stamps[i] != self.generation:
+            return None
+        return self.distances[i]
+
+    def next_step(self, x, y, is_occupied=None):
+        """
+        Pick the neighbouring cell that leads downhill toward a source
+
+        When every downhill cell is occupied, an entity sidesteps to an
+        equally distant cell only if that cell has a free downhill cell of
+        its own; otherwise it waits its turn. Sidesteps that lead nowhere
+        would just bounce it between two cells.
+
+        Args:
+            x, y: Current position
+            is_occupied: Optional callable (x, y) -> bool for dynamic blockers
+
+        Returns:
+            (x, y) of the next free cell to move to, or None to stay put
+        """
+        here = self.distance_at(x, y)
+        if here is None or here <= 1:
+            return None
+
+        def free(nx, ny):
+            return is_occupied is None or not is_occupied(nx, ny)
+
+        sidesteps = []
+        for dx, dy in DIRECTIONS:
+            nx = x + dx
+            ny = y + dy
+            distance = self.distance_at(nx, ny)
+            if distance == here - 1 and free(nx, ny):
+                return (nx, ny)
+            if distance == here:
+                sidesteps.append((nx, ny))
+
+        # Blocked downhill: only sidestep toward a free way down
+        for nx, ny in sidesteps:
+            if not free(nx, ny):
+                continue
+            for dx, dy in DIRECTIONS:
+                if self.distance_at(nx + dx, ny + dy) == here - 1 and free(nx + dx, ny + dy):
+                    return (nx, ny)
+        return None
@@ -1,12 +1,27 @@
 import pygame
 import random
 import math
+import numpy as np
 from enum import Enum
-from ..tile import Tile, TileType
+from ..tile import TileType
+from .grid import TileGrid
+from .fov import FieldOfView
+from .distance_map import DistanceMap
+from .spatial import SpatialIndex
+from .renderer import DungeonRenderer
+from .camera import Camera
+from .particles import ParticleSystem
+from ..pathfinding import PathFinder, HierarchicalPathFinder, PathService
+from ..ui.fonts import get_font, render_text
+from ..profiler import PROFILER
+from ..log import get_logger
 from ..enemy import Enemy
 from ..item import Item
+from ..rng import RNGService, derive_seed
+from ..ai_scheduler import AIScheduler
 from ..settings import *
-import traceback  # For better error reporting
+
+log = get_logger("world")
 
 class Biome(Enum):
     """Dungeon biome/theme"""
@@ -38,10 +53,10 @@ class Room:
         """Get the center coordinates of the room"""
         return (self.x + self.width // 2, self.y + self.height // 2)
         
-    def random_position(self, edge_buffer=0):
+    def random_position(self, edge_buffer=0, rng=random):
         """Get a random position within the room"""
-        x = random.randint(self.x + edge_buffer, self.x + self.width - 1 - edge_buffer)
-        y = random.randint(self.y + edge_buffer, self.y + self.height - 1 - edge_buffer)
+        x = rng.randint(self.x + edge_buffer, self.x + self.width - 1 - edge_buffer)
+        y = rng.randint(self.y + edge_buffer, self.y + self.height - 1 - edge_buffer)
         return (x, y)
         
     def overlaps(self, other, buffer=0):
@@ -51,80 +66,109 @@ class Room:
                 self.y < other.y + other.height + buffer and
                 self.y + self.height + buffer > other.y)
                 
-    def get_random_wall_position(self):
+    def get_random_wall_position(self, rng=random):
         """Get a random position along the room's walls"""
         # Decide which wall to use
-        wall = random.randint(0, 3)
+        wall = rng.randint(0, 3)
         
         if wall == 0:  # North wall
-            return (random.randint(self.x + 1, self.x + self.width - 2), self.y)
+            return (rng.randint(self.x + 1, self.x + self.width - 2), self.y)
         elif wall == 1:  # East wall
-            return (self.x + self.width - 1, random.randint(self.y + 1, self.y + self.height - 2))
+            return (self.x + self.width - 1, rng.randint(self.y + 1, self.y + self.height - 2))
         elif wall == 2:  # South wall
-            return (random.randint(self.x + 1, self.x + self.width - 2), self.y + self.height - 1)
+            return (rng.randint(self.x + 1, self.x + self.width - 2), self.y + self.height - 1)
         else:  # West wall
-            return (self.x, random.randint(self.y + 1, self.y + self.height - 2))
+            return (self.x, rng.randint(self.y + 1, self.y + self.height - 2))
 
 class Dungeon:
     """Dungeon map generator and manager"""
     
-    def __init__(self, width, height, max_rooms=15, room_min_size=6, room_max_size=12, level=1):
-        """Initialize a new dungeon level"""
+    def __init__(self, width, height, max_rooms=15, room_min_size=6, room_max_size=12, level=1, seed=None):
+        """Initialize a new dungeon level
+        
+        All randomness is drawn from named streams seeded with seed (see
+        RNGService), so the same seed always yields the same floor. Without a
+        seed one is drawn from the global random module.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rngs = RNGService(seed)
+        self.rng = self.rngs.stream("layout")
         try:
-            print(f"Creating new dungeon (level {level}, size: {width}x{height})")
+            log.debug("Creating new dungeon (level %s, size: %sx%s, seed %s)", level, width, height, seed)
             self.width = width
             self.height = height
             self.level = level
             self.rooms = []
-            self.grid = [[Tile() for _ in range(width)] for _ in range(height)]
+            self.grid = TileGrid(width, height)
             self.enemies = []
             self.items = []
+            self.enemy_index = SpatialIndex()
+            self.item_index = SpatialIndex()
             self.doors = []
-            self.particles = []
+            self.particles = ParticleSystem(rng=np.random.default_rng(derive_seed(seed, "particles")))
             self.floating_texts = []
             self.crystal_formations = []
             self.stairs_down = None
             self.player_start = None
             
+            # Decides which enemies think each tick
+            self.ai_scheduler = AIScheduler()
+            
             # Animation variables
             self.animation_timer = 0
             
+            # Viewport and layered renderer (created on first draw once a display exists)
+            self.camera = Camera(width, height)
+            self.renderer = None
+            
             # Field of view variables
             self.visibility_radius = VISIBILITY_RADIUS
             
             # Determine biome based on level
-            print("Determining dungeon biome...")
+            log.debug("Determining dungeon biome...")
             self.biome = self.determine_biome()
-            print(f"Selected biome: {self.biome.name}")
+            log.debug("Selected biome: %s", self.biome.name)
             
             # Initialize biome-specific features
-            print("Initializing biome features...")
+            log.debug("Initializing biome features...")
             self.init_biome_features()
             
             # Generate the dungeon layout
-            print("Generating dungeon layout...")
+            log.debug("Generating dungeon layout...")
             self.generate(max_rooms, room_min_size, room_max_size)
-            print(f"Dungeon generated with {len(self.rooms)} rooms")
+            log.debug("Dungeon generated with %s rooms", len(self.rooms))
             
             # Field of view variables
+            self.fov = FieldOfView(self.grid, ADVANCED_SETTINGS.get("FOV_ALGORITHM", "shadowcast"))
             self.visible_tiles = set()
             self.explored_tiles = set()
+            
+            # Shared enemy navigation data
+            self.init_navigation()
         except Exception as e:
-            print(f"Error during dungeon creation: {e}")
-            traceback.print_exc()
+            log.exception("Error during dungeon creation: %s", e)
             # Set defaults to prevent crashes
             self.width = width
             self.height = height
             self.level = level
             self.rooms = []
-            self.grid = [[Tile() for _ in range(width)] for _ in range(height)]
+            self.grid = TileGrid(width, height)
+            self.fov = FieldOfView(self.grid)
+            self.init_navigation()
             self.enemies = []
             self.items = []
+            self.enemy_index = SpatialIndex()
+            self.item_index = SpatialIndex()
             self.doors = []
-            self.particles = []
+            self.particles = ParticleSystem()
             self.floating_texts = []
             self.animation_timer = 0
+            self.camera = Camera(width, height)
+            self.renderer = None
             self.visibility_radius = VISIBILITY_RADIUS
+            self.ai_scheduler = AIScheduler()
             self.biome = Biome.CAVERN  # Default biome
             self.stairs_down = (width // 2, height // 2)
             self.player_start = (width // 2, height // 2)
@@ -152,7 +196,7 @@ class Dungeon:
                     
             return level_to_biome[chosen_level]
         except Exception as e:
-            print(f"Error determining biome: {e}")
+            log.error("Error determining biome: %s", e)
             return Biome.CAVERN  # Default to CAVERN on error
             
     def init_biome_features(self):
@@ -160,13 +204,13 @@ class Dungeon:
         try:
             # Get biome configurations
             biome_name = self.biome.name
-            print(f"Initializing features for biome: {biome_name}")
+            log.debug("Initializing features for biome: %s", biome_name)
             
             # Set visibility radius based on biome
             if biome_name in BIOME_FEATURES:
                 light_mod = BIOME_FEATURES[biome_name].get("LIGHT_RADIUS", 0)
                 self.visibility_radius = max(3, VISIBILITY_RADIUS + light_mod)
-                print(f"Setting visibility radius to {self.visibility_radius}")
+                log.debug("Setting visibility radius to %s", self.visibility_radius)
             
             # Add environmental particles based on biome
             if biome_name == "CAVERN":
@@ -194,46 +238,43 @@ class Dungeon:
                 self.create_particle_emitters(15, "light")
                 self.add_crystal_formations(10)
                 
-            print(f"Biome features initialized for {biome_name}")
+            log.debug("Biome features initialized for %s", biome_name)
         except Exception as e:
-            print(f"Error initializing biome features: {e}")
+            log.error("Error initializing biome features: %s", e)
             # Continue without biome features if there's an error
             
     def create_particle_emitters(self, count, particle_type):
         """Create particle emitters around the dungeon for ambient effects"""
+        fx = self.rngs.stream("effects")
         for _ in range(count):
             if self.rooms:
-                room = random.choice(self.rooms)
-                x, y = room.random_position(1)
-                self.particles.append({
-                    "type": particle_type,
-                    "x": x,
-                    "y": y,
-                    "lifetime": random.randint(50, 200),
-                    "max_lifetime": random.randint(50, 200),
-                    "velocity_x": random.uniform(-0.1, 0.1),
-                    "velocity_y": random.uniform(-0.1, 0.1),
-                    "size": random.uniform(1, 3),
-                    "color": self.get_particle_color(particle_type)
-                })
+                room = fx.choice(self.rooms)
+                x, y = room.random_position(1, rng=fx)
+                self.particles.spawn(particle_type, x, y,
+                                     lifetime=fx.randint(50, 200),
+                                     velocity_x=fx.uniform(-0.1, 0.1),
+                                     velocity_y=fx.uniform(-0.1, 0.1),
+                                     size=fx.uniform(1, 3),
+                                     color=self.get_particle_color(particle_type))
                 
     def get_particle_color(self, particle_type):
         """Get appropriate color for a particle based on type and biome"""
+        fx = self.rngs.stream("effects")
         biome_name = self.biome.name
         if particle_type == "dust":
             base_color = BIOME_COLORS[biome_name]["ACCENT"]
-            return (base_color[0], base_color[1], base_color[2], random.randint(100, 180))
+            return (base_color[0], base_color[1], base_color[2], fx.randint(100, 180))
         elif particle_type == "leaf":
-            return (random.randint(20, 80), random.randint(100, 180), random.randint(20, 60), random.randint(150, 200))
+            return (fx.randint(20, 80), fx.randint(100, 180), fx.randint(20, 60), fx.randint(150, 200))
         elif particle_type == "snow":
-            return (random.randint(200, 255), random.randint(200, 255), random.randint(220, 255), random.randint(150, 200))
+            return (fx.randint(200, 255), fx.randint(200, 255), fx.randint(220, 255), fx.randint(150, 200))
         elif particle_type == "ember":
-            r = random.randint(200, 255)
-            g = random.randint(100, 180)
-            b = random.randint(0, 50)
-            return (r, g, b, random.randint(150, 200))
+            r = fx.randint(200, 255)
+            g = fx.randint(100, 180)
+            b = fx.randint(0, 50)
+            return (r, g, b, fx.randint(150, 200))
         elif particle_type == "shadow":
-            return (random.randint(0, 50), random.randint(0, 50), random.randint(0, 50), random.randint(150, 200))
+            return (fx.randint(0, 50), fx.randint(0, 50), fx.randint(0, 50), fx.randint(150, 200))
         elif particle_type == "light":
             return (255, 255, 255, 150)  # Default white
         else:
@@ -241,71 +282,76 @@ class Dungeon:
             
     def add_crystal_formations(self, count):
         """Add crystal formations for crystal biome"""
+        fx = self.rngs.stream("effects")
         if self.biome == Biome.CRYSTAL and self.rooms:
             for _ in range(count):
-                room = random.choice(self.rooms)
-                x, y = room.random_position(1)
+                room = fx.choice(self.rooms)
+                x, y = room.random_position(1, rng=fx)
                 self.crystal_formations.append({
                     "type": "crystal_formation",
                     "x": x,
                     "y": y,
-                    "size": random.randint(1, 3),
+                    "size": fx.randint(1, 3),
                     "color": (
-                        random.randint(150, 220),
-                        random.randint(170, 230),
-                        random.randint(200, 255)
+                        fx.randint(150, 220),
+                        fx.randint(170, 230),
+                        fx.randint(200, 255)
                     ),
-                    "glow_radius": random.randint(2, 5)
+                    "glow_radius": fx.randint(2, 5)
                 })
                 
                 # Add light source for the crystal
                 self.light_sources.append({
                     "x": x,
                     "y": y,
-                    "radius": random.randint(3, 6),
-                    "intensity": random.uniform(0.5, 1.0),
+                    "radius": fx.randint(3, 6),
+                    "intensity": fx.uniform(0.5, 1.0),
                     "color": (150, 200, 255),
                     "flicker": 0.1
                 })
                 
     def generate(self, max_rooms, room_min_size, room_max_size):
         """Generate a complete dungeon level"""
-        # Initialize grid with walls
-        self.grid = [[Tile(TileType.WALL) for _ in range(self.width)] for _ in range(self.height)]
-        
         # Set minimum successful rooms and maximum generation attempts
         min_rooms = 5
-        rooms_created = 0
         max_attempts = max_rooms * 5
+        max_layouts = 20
         
-        # Keep generating until we have enough rooms
-        for _ in range(max_attempts):
-            if rooms_created >= max_rooms:
-                break
-                
-            # Generate random room dimensions and position
-            w = random.randint(room_min_size, room_max_size)
-            h = random.randint(room_min_size, room_max_size)
-            x = random.randint(1, self.width - w - 2)
-            y = random.randint(1, self.height - h - 2)
-            
-            # Create room
-            new_room = Room(x, y, w, h)
+        # Keep generating until we have enough rooms, starting over from a
+        # blank map each time so rooms from a failed attempt are not kept
+        for layout in range(max_layouts):
+            self.grid.fill(TileType.WALL)
+            self.rooms = []
             
-            # Check if room overlaps with existing rooms
-            if not any(new_room.overlaps(room, buffer=1) for room in self.rooms):
-                self.add_room(new_room)
-                rooms_created += 1
-                
-                # Connect to previous room if not the first room
-                if len(self.rooms) > 1:
-                    prev_room = random.choice(self.rooms[:-1])
-                    self.connect_rooms(new_room, prev_room)
+            for _ in range(max_attempts):
+                if len(self.rooms) >= max_rooms:
+                    break
                     
-        # If we don't have enough rooms, start over
-        if len(self.rooms) < min_rooms:
-            self.generate(max_rooms, room_min_size, room_max_size)
-            return
+                # Generate random room dimensions and position
+                w = self.rng.randint(room_min_size, room_max_size)
+                h = self.rng.randint(room_min_size, room_max_size)
+                x = self.rng.randint(1, self.width - w - 2)
+                y = self.rng.randint(1, self.height - h - 2)
+                
+                # Create room
+                new_room = Room(x, y, w, h)
+                
+                # Check if room overlaps with existing rooms
+                if not any(new_room.overlaps(room, buffer=1) for room in self.rooms):
+                    self.add_room(new_room)
+                    
+                    # Connect to previous room if not the first room
+                    if len(self.rooms) > 1:
+                        prev_room = self.rng.choice(self.rooms[:-1])
+                        self.connect_rooms(new_room, prev_room)
+                        
+            if len(self.rooms) >= min_rooms:
+                break
+        else:
+            # The map is too small for min_rooms: settle for what fits
+            if not self.rooms:
+                raise ValueError(f"No room fits in a {self.width}x{self.height} dungeon")
+            log.warning("Only %s rooms fit after %s layouts", len(self.rooms), max_layouts)
             
         # Make sure all rooms are connected
         self.ensure_connectivity()
@@ -320,7 +366,7 @@ class Dungeon:
             self.rooms[-1].room_type = "exit"
             x, y = self.rooms[-1].center()
             self.stairs_down = (x, y)
-            self.grid[y][x] = Tile(TileType.STAIRS_DOWN)
+            self.grid.set_type(x, y, TileType.STAIRS_DOWN)
             
         # Add some doors between rooms
         self.add_doors()
@@ -333,9 +379,7 @@ class Dungeon:
         
     def add_room(self, room):
         """Add a room to the dungeon by carving it out of the walls"""
-        for y in range(room.y, room.y + room.height):
-            for x in range(room.x, room.x + room.width):
-                self.grid[y][x] = Tile(TileType.FLOOR)
+        self.grid.fill_rect(room.x, room.y, room.width, room.height, TileType.FLOOR)
                 
         self.rooms.append(room)
         
@@ -346,7 +390,7 @@ class Dungeon:
         x2, y2 = room2.center()
         
         # Randomly decide if horizontal then vertical, or vertical then horizontal
-        if random.choice([True, False]):
+        if self.rng.choice([True, False]):
             self.create_h_tunnel(x1, x2, y1)
             self.create_v_tunnel(y1, y2, x2)
         else:
@@ -360,12 +404,12 @@ class Dungeon:
     def create_h_tunnel(self, x1, x2, y):
         """Create a horizontal tunnel between x1 and x2 at y"""
         for x in range(min(x1, x2), max(x1, x2) + 1):
-            self.grid[y][x] = Tile(TileType.FLOOR)
+            self.grid.set_type(x, y, TileType.FLOOR)
             
     def create_v_tunnel(self, y1, y2, x):
         """Create a vertical tunnel between y1 and y2 at x"""
         for y in range(min(y1, y2), max(y1, y2) + 1):
-            self.grid[y][x] = Tile(TileType.FLOOR)
+            self.grid.set_type(x, y, TileType.FLOOR)
             
     def ensure_connectivity(self):
         """Make sure all rooms are connected to the dungeon"""
@@ -409,58 +453,71 @@ class Dungeon:
                 self.connect_rooms(closest_pair[0], closest_pair[1])
             else:
                 # Fallback to random connection if something went wrong
-                self.connect_rooms(random.choice(connected_rooms), random.choice(unconnected_rooms))
+                self.connect_rooms(self.rng.choice(connected_rooms), self.rng.choice(unconnected_rooms))
                 
         # Add some extra connections for better map flow (10% of room count)
         extra_connections = max(1, len(self.rooms) // 10)
         for _ in range(extra_connections):
-            room1 = random.choice(self.rooms)
-            room2 = random.choice(self.rooms)
+            room1 = self.rng.choice(self.rooms)
+            room2 = self.rng.choice(self.rooms)
             if room1 != room2:
                 self.connect_rooms(room1, room2)
             
     def add_doors(self):
         """Add doors between rooms and corridors"""
+        types = self.grid.types
+        width = self.width
+        floor = TileType.FLOOR.value
+        wall = TileType.WALL.value
+        
         # Find potential door locations (floor tiles with exactly 2 orthogonally adjacent wall tiles)
         for y in range(1, self.height - 1):
-            for x in range(1, self.width - 1):
-                if self.grid[y][x].type == TileType.FLOOR.value:
+            row = y * width
+            for x in range(1, width - 1):
+                i = row + x
+                if types[i] == floor:
                     # Count orthogonal walls
-                    wall_count = sum(1 for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)] 
-                                    if self.grid[y + dy][x + dx].type == TileType.WALL.value)
+                    wall_count = ((types[i - width] == wall) + (types[i + 1] == wall) +
+                                  (types[i + width] == wall) + (types[i - 1] == wall))
                                     
                     # Check if this is potentially a corridor tile between rooms
-                    if wall_count == 2 and random.random() < 0.2:  # 20% chance of door
+                    if wall_count == 2 and self.rng.random() < 0.2:  # 20% chance of door
                         # Check diagonal walls to confirm it's a corridor
-                        diag_wall_count = sum(1 for dx, dy in [(1, 1), (-1, 1), (1, -1), (-1, -1)] 
-                                            if self.grid[y + dy][x + dx].type == TileType.WALL.value)
+                        diag_wall_count = ((types[i + width + 1] == wall) + (types[i + width - 1] == wall) +
+                                           (types[i - width + 1] == wall) + (types[i - width - 1] == wall))
                                             
                         if diag_wall_count >= 2:
-                            self.grid[y][x] = Tile(TileType.DOOR)
+                            self.grid.set_type_at(i, TileType.DOOR)
                             
     def add_floor_variants(self):
         """Add floor variants for visual variety"""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x].type == TileType.FLOOR.value and random.random() < 0.1:
-                    self.grid[y][x].variant = random.randint(1, 2)
+        types = self.grid.types
+        variants = self.grid.variants
+        floor = TileType.FLOOR.value
+        for i in range(self.grid.size):
+            if types[i] == floor and self.rng.random() < 0.1:
+                variants[i] = self.rng.randint(1, 2)
                     
     def place_entities(self):
         """Place enemies and items in the dungeon"""
         self.enemies = []
         self.items = []
+        self.enemy_index.clear()
+        self.item_index.clear()
+        spawn = self.rngs.stream("spawn")
+        loot = self.rngs.stream("loot")
         
         # Place enemies in all rooms except the first (entrance)
         for room in self.rooms[1:]:
             # More enemies in later rooms
-            num_enemies = random.randint(0, 3 + min(self.level // 2, 3))
+            num_enemies = spawn.randint(0, 3 + min(self.level // 2, 3))
             
             # Skip exit room sometimes for breathing room
-            if room.room_type == "exit" and random.random() < 0.5:
+            if room.room_type == "exit" and spawn.random() < 0.5:
                 num_enemies = 0
                 
             for _ in range(num_enemies):
-                x, y = room.random_position(edge_buffer=1)
+                x, y = room.random_position(edge_buffer=1, rng=spawn)
                 
                 # Determine enemy type based on biome and level
                 enemy_types = {
@@ -473,76 +530,56 @@ class Dungeon:
                 
                 # Choose enemy type, weighted toward biome-specific enemies
                 biome_enemies = enemy_types.get(self.biome, ["goblin"])
-                enemy_type = random.choices(
+                enemy_type = spawn.choices(
                     [biome_enemies[0], biome_enemies[1], biome_enemies[2]],
                     weights=[0.6, 0.3, 0.1],
                     k=1
                 )[0]
                 
                 # Create enemy with level scaling
-                enemy = Enemy(x, y, enemy_type, level=self.level)
-                self.enemies.append(enemy)
+                enemy = Enemy(x, y, enemy_type, level=self.level, rngs=self.rngs)
+                self.add_enemy(enemy)
                 
         # Place items in rooms
         for room in self.rooms:
             # Health potions are common
-            if random.random() < 0.4:
-                x, y = room.random_position(edge_buffer=1)
-                potion = Item.create_random_item(x, y, level=self.level, force_type="HEALTH_POTION")
-                self.items.append(potion)
+            if spawn.random() < 0.4:
+                x, y = room.random_position(edge_buffer=1, rng=spawn)
+                potion = Item.create_random_item(x, y, level=self.level, force_type="HEALTH_POTION", rng=loot)
+                self.add_item(potion)
                 
             # Weapons and armor are less common
-            if random.random() < 0.15 * self.level / 5:
-                x, y = room.random_position(edge_buffer=1)
-                item_type = random.choice(["WEAPON", "ARMOR"])
-                item = Item.create_random_item(x, y, level=self.level, force_type=item_type)
-                self.items.append(item)
+            if spawn.random() < 0.15 * self.level / 5:
+                x, y = room.random_position(edge_buffer=1, rng=spawn)
+                item_type = spawn.choice(["WEAPON", "ARMOR"])
+                item = Item.create_random_item(x, y, level=self.level, force_type=item_type, rng=loot)
+                self.add_item(item)
                 
             # Gold piles
-            if random.random() < 0.3:
-                x, y = room.random_position(edge_buffer=1)
-                gold = Item.create_random_item(x, y, level=self.level, force_type="GOLD")
-                self.items.append(gold)
+            if spawn.random() < 0.3:
+                x, y = room.random_position(edge_buffer=1, rng=spawn)
+                gold = Item.create_random_item(x, y, level=self.level, force_type="GOLD", rng=loot)
+                self.add_item(gold)
                 
         # Place a quest item if level is divisible by 5
         if self.level % 5 == 0:
-            quest_room = random.choice(self.rooms[1:-1])  # Not in entrance or exit
-            x, y = quest_room.random_position(edge_buffer=2)
+            quest_room = spawn.choice(self.rooms[1:-1])  # Not in entrance or exit
+            x, y = quest_room.random_position(edge_buffer=2, rng=spawn)
             quest_item = Item(x, y, "QUEST_ITEM", None, f"artifact_{self.level}", rarity="legendary")
-            self.items.append(quest_item)
+            self.add_item(quest_item)
             
     def compute_fov(self, player_x, player_y, radius):
-        """Compute field of view for the player"""
-        # Reset visibility
-        for y in range(self.height):
-            for x in range(self.width):
-                self.grid[y][x].visible = False
-                
-        # Set player's position as visible and explored
-        self.grid[player_y][player_x].visible = True
-        self.grid[player_y][player_x].explored = True
-        
-        # Create a set to store visible tiles
-        visible_tiles = set()
-        visible_tiles.add((player_x, player_y))
-        
-        # Check visibility in a square around the player
-        for y in range(max(0, player_y - radius), min(self.height, player_y + radius + 1)):
-            for x in range(max(0, player_x - radius), min(self.width, player_x + radius + 1)):
-                # Skip if outside circular radius
-                if math.sqrt((x - player_x)**2 + (y - player_y)**2) > radius:
-                    continue
-                    
-                # Cast ray from player to this position
-                if self.has_line_of_sight(player_x, player_y, x, y):
-                    self.grid[y][x].visible = True
-                    self.grid[y][x].explored = True
-                    visible_tiles.add((x, y))
-                    
-        return visible_tiles
+        """Compute field of view for the player.
+        
+        Only recalculated when the player moves, the radius changes or the map
+        changes; otherwise the cached visible set is returned.
+        """
+        return self.fov.compute(player_x, player_y, radius)
         
     def has_line_of_sight(self, x0, y0, x1, y1):
         """Check if there is a clear line of sight between two points using Bresenham's line algorithm"""
+        types = self.grid.types
+        wall = TileType.WALL.value
         dx = abs(x1 - x0)
         dy = abs(y1 - y0)
         sx = 1 if x0 < x1 else -1
@@ -552,7 +589,7 @@ class Dungeon:
         while x0 != x1 or y0 != y1:
             # Check if current position blocks sight
             if 0 <= x0 < self.width and 0 <= y0 < self.height:
-                if not self.grid[y0][x0].is_transparent() and (x0 != x1 or y0 != y1):
+                if types[y0 * self.width + x0] == wall:
                     return False
                     
             e2 = 2 * err
@@ -577,26 +614,11 @@ class Dungeon:
             if text["lifetime"] <= 0:
                 self.floating_texts.remove(text)
                 
-        # Update particles
-        for particle in self.particles[:]:
-            particle["lifetime"] -= 1
-            particle["x"] += particle["velocity_x"]
-            particle["y"] += particle["velocity_y"]
-            
-            # Add some randomness to movement
-            particle["velocity_x"] += random.uniform(-0.02, 0.02)
-            particle["velocity_y"] += random.uniform(-0.02, 0.02)
-            
-            # Cap velocity
-            particle["velocity_x"] = max(-0.2, min(0.2, particle["velocity_x"]))
-            particle["velocity_y"] = max(-0.2, min(0.2, particle["velocity_y"]))
-            
-            # Remove expired particles
-            if particle["lifetime"] <= 0:
-                self.particles.remove(particle)
+        # Update particles (vectorised drift, expired particles are recycled)
+        self.particles.update()
                 
         # Periodically create new particles to replace expired ones
-        if random.random() < 0.05:
+        if self.rngs.stream("effects").random() < 0.05:
             self.create_particle_emitters(1, self.get_biome_particle_type())
                 
     def get_biome_particle_type(self):
@@ -617,8 +639,12 @@ class Dungeon:
         else:
             return "dust"
 
-    def render(self, screen, player):
-        """Render the dungeon with all its elements and apply biome-specific visual effects"""
+    def render(self, screen, player, alpha=1.0):
+        """Render the dungeon with all its elements and apply biome-specific visual effects
+        
+        alpha is how far rendering is between the last two simulation ticks
+        (0.0-1.0); moving entities are drawn interpolated by that fraction.
+        """
         # Calculate camera offset to center on player
         # Add safety checks for player position
         if player.x < 0:
@@ -630,273 +656,245 @@ class Dungeon:
         if player.y >= self.height:
             player.y = self.height - 1
             
-        # Calculate full map size in pixels
-        map_width_px = self.width * TILE_SIZE
-        map_height_px = self.height * TILE_SIZE
-        
-        # Calculate camera position (center on player)
-        camera_x = player.x * TILE_SIZE - SCREEN_WIDTH // 2
-        camera_y = player.y * TILE_SIZE - SCREEN_HEIGHT // 2
+        # Center the camera on the player; draw passes only walk the on-screen tiles
+        camera = self.camera
+        camera_offset = camera.update(player.x, player.y)
+        view_x0, view_y0, view_x1, view_y1 = camera.visible_tile_bounds(margin=1)
         
-        # Keep camera within map bounds
-        camera_offset_x = max(0, min(camera_x, map_width_px - SCREEN_WIDTH))
-        camera_offset_y = max(0, min(camera_y, map_height_px - SCREEN_HEIGHT))
-        camera_offset = (camera_offset_x, camera_offset_y)
-        
-        # Get current biome colors
+        # Get current biome
         biome_name = self.biome.name
-        biome_colors = BIOME_COLORS.get(biome_name, BIOME_COLORS["CAVERN"])
         
         # Calculate player's field of view with a fallback for safety
-        try:
-            visible_tiles = self.compute_fov(player.x, player.y, self.visibility_radius)
-            if visible_tiles is None:
+        with PROFILER.scope("dungeon.fov"):
+            try:
+                visible_tiles = self.compute_fov(player.x, player.y, self.visibility_radius)
+                if visible_tiles is None:
+                    visible_tiles = set()
+                    visible_tiles.add((player.x, player.y))
+            except Exception as e:
+                log.error("FOV calculation error: %s", e)
                 visible_tiles = set()
                 visible_tiles.add((player.x, player.y))
-        except Exception as e:
-            print(f"FOV calculation error: {e}")
-            visible_tiles = set()
-            visible_tiles.add((player.x, player.y))
-        
-        # Draw tiles
-        for y in range(self.height):
-            for x in range(self.width):
-                # Screen position
-                screen_x = x * TILE_SIZE - camera_offset[0]
-                screen_y = y * TILE_SIZE - camera_offset[1]
-                
-                # Skip tiles outside the screen
-                if (screen_x < -TILE_SIZE or screen_x > SCREEN_WIDTH or 
-                    screen_y < -TILE_SIZE or screen_y > SCREEN_HEIGHT):
-                    continue
-                
-                # Draw tile based on visibility
-                tile = self.grid[y][x]
-                if (x, y) in visible_tiles:
-                    # Visible tile
-                    if tile.type == 0:  # WALL
-                        color = biome_colors["WALL"]
-                    elif tile.type == 1:  # FLOOR
-                        color = biome_colors["FLOOR"]
-                    elif tile.type == 2:  # STAIRS_DOWN
-                        color = biome_colors["ACCENT"]
-                    else:
-                        color = biome_colors["FLOOR"]
-                        
-                    # Apply lighting variation based on distance from player
-                    distance = math.sqrt((x - player.x) ** 2 + (y - player.y) ** 2)
-                    fade_factor = max(0.5, 1.0 - distance / self.visibility_radius)
-                    
-                    # Add subtle animation to certain biome elements
-                    if biome_name == "LAVA" and tile.type == 1:
-                        # Lava pulsing effect
-                        pulse = (math.sin(self.animation_timer + x * 0.1 + y * 0.1) + 1) * 0.1
-                        fade_factor += pulse
-                    elif biome_name == "ICE" and tile.type == 1:
-                        # Ice shimmer effect
-                        shimmer = (math.sin(self.animation_timer * 2 + x * 0.2 + y * 0.2) + 1) * 0.05
-                        fade_factor += shimmer
-                    elif biome_name == "CRYSTAL":
-                        # Crystal glow effect
-                        crystal_pulse = (math.sin(self.animation_timer * 1.5 + x * 0.15 + y * 0.15) + 1) * 0.15
-                        fade_factor += crystal_pulse
-                        
-                    # Apply fade factor to color
-                    r = min(255, int(color[0] * fade_factor))
-                    g = min(255, int(color[1] * fade_factor))
-                    b = min(255, int(color[2] * fade_factor))
-                    color = (r, g, b)
-                    
-                    # Draw the base tile
-                    pygame.draw.rect(screen, color, (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
-                    
-                    # Add tile details based on biome
-                    if tile.type == 1:  # FLOOR
-                        if biome_name == "CAVERN" and random.random() < 0.02:
-                            # Draw small rocks
-                            rock_size = random.randint(2, 5)
-                            rock_x = screen_x + random.randint(5, TILE_SIZE - 5)
-                            rock_y = screen_y + random.randint(5, TILE_SIZE - 5)
-                            pygame.draw.circle(screen, biome_colors["ACCENT"], 
-                                             (rock_x, rock_y), rock_size)
-                        elif biome_name == "FOREST" and random.random() < 0.03:
-                            # Draw grass tufts
-                            grass_height = random.randint(3, 7)
-                            grass_x = screen_x + random.randint(5, TILE_SIZE - 5)
-                            grass_y = screen_y + random.randint(TILE_SIZE - 10, TILE_SIZE - 5)
-                            pygame.draw.line(screen, biome_colors["VEGETATION"], 
-                                           (grass_x, grass_y), 
-                                           (grass_x, grass_y - grass_height), 2)
-                        elif biome_name == "ICE" and random.random() < 0.02:
-                            # Draw ice crystals
-                            crystal_size = random.randint(2, 4)
-                            crystal_x = screen_x + random.randint(5, TILE_SIZE - 5)
-                            crystal_y = screen_y + random.randint(5, TILE_SIZE - 5)
-                            pygame.draw.polygon(screen, (230, 240, 255), 
-                                              [(crystal_x, crystal_y - crystal_size),
-                                               (crystal_x + crystal_size, crystal_y),
-                                               (crystal_x, crystal_y + crystal_size),
-                                               (crystal_x - crystal_size, crystal_y)])
-                    
-                    # Draw special features
-                    if tile.type == 2:  # STAIRS_DOWN
-                        # Draw stairs
-                        for i in range(4):
-                            stair_y = screen_y + TILE_SIZE // 4 + i * TILE_SIZE // 8
-                            pygame.draw.rect(screen, (40, 40, 40), 
-                                           (screen_x + 2, stair_y, TILE_SIZE - 4, TILE_SIZE // 8))
-                            
-                else:
-                    # Not visible - draw as darkness or fog
-                    pygame.draw.rect(screen, COLOR_BLACK, (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+        
+        # Draw tiles from the cached map layer, then distance lighting on top
+        if self.renderer is None:
+            self.renderer = DungeonRenderer(self)
+        renderer = self.renderer
+        with PROFILER.scope("dungeon.tiles"):
+            renderer.render_tiles(screen, camera)
+        with PROFILER.scope("dungeon.lighting"):
+            renderer.render_lighting(screen, camera_offset, player, self.animation_timer)
         
         # Draw special features
-        for feature in self.crystal_formations:
-            # Check if feature is visible
-            if (feature["x"], feature["y"]) in visible_tiles:
-                # Screen position
-                screen_x = feature["x"] * TILE_SIZE - camera_offset[0]
-                screen_y = feature["y"] * TILE_SIZE - camera_offset[1]
-                
-                if feature["type"] == "crystal_formation":
-                    # Draw crystal
-                    size = feature["size"]
-                    color = feature["color"]
-                    center_x = screen_x + TILE_SIZE // 2
-                    center_y = screen_y + TILE_SIZE // 2
-                    
-                    # Draw crystal shape
-                    points = []
-                    for i in range(5):
-                        angle = self.animation_timer * 0.1 + i * 2 * math.pi / 5
-                        x = center_x + int(size * TILE_SIZE // 4 * math.cos(angle))
-                        y = center_y + int(size * TILE_SIZE // 4 * math.sin(angle))
-                        points.append((x, y))
+        with PROFILER.scope("dungeon.features"):
+            for feature in self.crystal_formations:
+                # Skip features off screen, then check if the feature is visible
+                if not (view_x0 <= feature["x"] < view_x1 and view_y0 <= feature["y"] < view_y1):
+                    continue
+                if (feature["x"], feature["y"]) in visible_tiles:
+                    # Screen position
+                    screen_x = feature["x"] * TILE_SIZE - camera_offset[0]
+                    screen_y = feature["y"] * TILE_SIZE - camera_offset[1]
+                
+                    if feature["type"] == "crystal_formation":
+                        # Draw crystal
+                        size = feature["size"]
+                        color = feature["color"]
+                        center_x = screen_x + TILE_SIZE // 2
+                        center_y = screen_y + TILE_SIZE // 2
                     
-                    pygame.draw.polygon(screen, color, points)
+                        # Draw crystal shape
+                        points = []
+                        for i in range(5):
+                            angle = self.animation_timer * 0.1 + i * 2 * math.pi / 5
+                            x = center_x + int(size * TILE_SIZE // 4 * math.cos(angle))
+                            y = center_y + int(size * TILE_SIZE // 4 * math.sin(angle))
+                            points.append((x, y))
                     
-                    # Draw glow effect
-                    glow_radius = feature["glow_radius"] * TILE_SIZE // 4
-                    glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+                        pygame.draw.polygon(screen, color, points)
                     
-                    # Create radial gradient
-                    for radius in range(glow_radius, 0, -1):
-                        alpha = int(150 * (radius / glow_radius))
-                        pygame.draw.circle(glow_surface, (*color, alpha), 
-                                         (glow_radius, glow_radius), radius)
-                                         
-                    screen.blit(glow_surface, (center_x - glow_radius, center_y - glow_radius), 
-                               special_flags=pygame.BLEND_ADD)
-        
-        # Draw items
-        for item in self.items:
-            if (item.x, item.y) in visible_tiles:
-                item.draw(screen, camera_offset)
-                
-        # Draw enemies
-        for enemy in self.enemies:
-            if (enemy.x, enemy.y) in visible_tiles:
-                enemy.draw(screen, camera_offset)
+                        # Draw glow effect
+                        glow_radius = feature["glow_radius"] * TILE_SIZE // 4
+                        glow_surface = renderer.get_glow(color, glow_radius)
+                        screen.blit(glow_surface, (center_x - glow_radius, center_y - glow_radius), 
+                                   special_flags=pygame.BLEND_ADD)
+        
+        # Only entities within both the view radius and the screen can be visible
+        with PROFILER.scope("dungeon.entities"):
+            radius = self.visibility_radius
+            view_rect = (max(player.x - radius, view_x0), max(player.y - radius, view_y0),
+                         min(player.x + radius, view_x1 - 1), min(player.y + radius, view_y1 - 1))
+        
+            # Draw items
+            for item in self.item_index.entities_in_rect(*view_rect):
+                if (item.x, item.y) in visible_tiles:
+                    item.draw(screen, camera_offset)
+                
+            # Draw enemies, sliding between tiles when interpolation is on
+            interpolate = alpha < 1.0 and ADVANCED_SETTINGS.get("RENDER_INTERPOLATION", True)
+            for enemy in self.enemy_index.entities_in_rect(*view_rect):
+                if (enemy.x, enemy.y) in visible_tiles:
+                    if interpolate:
+                        enemy.draw(screen, enemy.interpolated_offset(camera_offset, alpha))
+                    else:
+                        enemy.draw(screen, camera_offset)
                 
-        # Draw player - always visible
-        player.draw(screen, camera_offset)
+            # Draw player - always visible
+            if interpolate:
+                player.draw(screen, player.interpolated_offset(camera_offset, alpha))
+            else:
+                player.draw(screen, camera_offset)
         
-        # Draw particles
-        for particle in self.particles:
-            # Check if particle is visible
-            if (int(particle["x"]), int(particle["y"])) in visible_tiles:
-                # Calculate screen position
-                screen_x = int(particle["x"] * TILE_SIZE - camera_offset[0])
-                screen_y = int(particle["y"] * TILE_SIZE - camera_offset[1])
-                
-                # Draw particle
-                if particle["type"] == "dust":
-                    pygame.draw.circle(screen, particle["color"], 
-                                     (screen_x, screen_y), particle["size"])
-                elif particle["type"] == "leaf":
-                    # Draw simple leaf shape
-                    pygame.draw.ellipse(screen, particle["color"], 
-                                      (screen_x, screen_y, 
-                                       particle["size"] * 2, particle["size"]))
-                elif particle["type"] == "snow":
-                    pygame.draw.circle(screen, particle["color"], 
-                                     (screen_x, screen_y), particle["size"])
-                elif particle["type"] == "ember":
-                    # Flicker the ember
-                    flicker = random.uniform(0.7, 1.3)
-                    size = particle["size"] * flicker
-                    # Draw with additive blending for glow effect
-                    ember_surface = pygame.Surface((int(size * 4), int(size * 4)), pygame.SRCALPHA)
-                    pygame.draw.circle(ember_surface, particle["color"], 
-                                     (int(size * 2), int(size * 2)), int(size))
-                    screen.blit(ember_surface, (screen_x - int(size * 2), screen_y - int(size * 2)), 
-                               special_flags=pygame.BLEND_ADD)
-                elif particle["type"] == "shadow":
-                    # Shadow particle with pulsating effect
-                    pulse = (math.sin(self.animation_timer * 2) + 1) * 0.5
-                    size = particle["size"] * (0.7 + pulse * 0.3)
-                    pygame.draw.circle(screen, particle["color"], 
-                                     (screen_x, screen_y), size)
-                elif particle["type"] == "light":
-                    # Light particle with pulsating effect
-                    pulse = (math.sin(self.animation_timer * 2) + 1) * 0.5
-                    size = particle["size"] * (0.7 + pulse * 0.3)
-                    pygame.draw.circle(screen, particle["color"], 
-                                     (screen_x, screen_y), size)
-                else:
-                    pygame.draw.circle(screen, particle["color"], 
-                                     (screen_x, screen_y), particle["size"])
+        # Draw particles on visible, on-screen tiles in one batched blit
+        with PROFILER.scope("dungeon.particles"):
+            self.particles.draw(screen, camera, self.grid.visible, self.width, self.animation_timer)
                                      
         # Apply biome-specific post-processing effects
-        if biome_name == "SHADOW":
-            # Shadow realm darkness effect
-            shadow_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            shadow_overlay.fill((0, 0, 20, 50))  # Dark blue tint
-            screen.blit(shadow_overlay, (0, 0))
-            
-            # Draw randomly appearing void tendrils
-            if random.random() < 0.01:
-                start_x = random.randint(0, SCREEN_WIDTH)
-                start_y = random.randint(0, SCREEN_HEIGHT)
-                for i in range(5):
-                    end_x = start_x + random.randint(-100, 100)
-                    end_y = start_y + random.randint(-100, 100)
-                    # Draw with low alpha
-                    pygame.draw.line(shadow_overlay, (80, 20, 120, 50), 
-                                   (start_x, start_y), (end_x, end_y), 2)
-                    start_x, start_y = end_x, end_y
-                screen.blit(shadow_overlay, (0, 0))
+        with PROFILER.scope("dungeon.effects"):
+            if biome_name == "SHADOW":
+                # Shadow realm darkness effect
+                screen.blit(renderer.get_shadow_overlay(), (0, 0))
+            
+                # Draw randomly appearing void tendrils
+                fx = self.rngs.stream("effects")
+                if fx.random() < 0.01:
+                    shadow_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+                    start_x = fx.randint(0, SCREEN_WIDTH)
+                    start_y = fx.randint(0, SCREEN_HEIGHT)
+                    for i in range(5):
+                        end_x = start_x + fx.randint(-100, 100)
+                        end_y = start_y + fx.randint(-100, 100)
+                        # Draw with low alpha
+                        pygame.draw.line(shadow_overlay, (80, 20, 120, 50), 
+                                       (start_x, start_y), (end_x, end_y), 2)
+                        start_x, start_y = end_x, end_y
+                    screen.blit(shadow_overlay, (0, 0))
         
-        elif biome_name == "LAVA":
-            # Heat distortion effect (subtle wavy overlay)
-            distortion = (math.sin(self.animation_timer) + 1) * 0.5
-            heat_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            for y in range(0, SCREEN_HEIGHT, 10):
-                wave = math.sin(y * 0.05 + self.animation_timer) * 5 * distortion
-                pygame.draw.line(heat_overlay, (255, 100, 20, 5), 
-                               (0, y), (SCREEN_WIDTH, y + wave))
-            screen.blit(heat_overlay, (0, 0))
+            elif biome_name == "LAVA":
+                # Heat distortion effect (subtle wavy overlay)
+                screen.blit(renderer.get_heat_overlay(self.animation_timer), (0, 0))
             
         # Draw floating text
-        for text in self.floating_texts:
-            # Calculate screen position
-            screen_x = text["x"] * TILE_SIZE - camera_offset[0] + TILE_SIZE // 2
-            screen_y = text["y"] * TILE_SIZE - camera_offset[1] + TILE_SIZE // 2
+        with PROFILER.scope("dungeon.text"):
+            for text in self.floating_texts:
+                if not (view_x0 <= text["x"] < view_x1 and view_y0 <= text["y"] < view_y1):
+                    continue
+                
+                # Calculate screen position
+                screen_x = text["x"] * TILE_SIZE - camera_offset[0] + TILE_SIZE // 2
+                screen_y = text["y"] * TILE_SIZE - camera_offset[1] + TILE_SIZE // 2
             
-            # Scale opacity with lifetime
-            alpha = min(255, int(255 * text["lifetime"] / 20))
+                # Scale opacity with lifetime
+                alpha = min(255, int(255 * text["lifetime"] / 20))
             
-            # Create text surface with alpha
-            font = pygame.font.Font(None, 24)
-            text_surf = font.render(text["text"], True, text["color"])
-            text_surf.set_alpha(alpha)
+                # Text surface with alpha, shared through the text cache
+                text_surf = render_text(get_font(24), text["text"], text["color"], alpha=alpha)
             
-            # Position text
-            text_rect = text_surf.get_rect(center=(screen_x, screen_y))
-            screen.blit(text_surf, text_rect)
+                # Position text
+                text_rect = text_surf.get_rect(center=(screen_x, screen_y))
+                screen.blit(text_surf, text_rect)
         
     def is_position_valid(self, x, y):
         """Check if a position is valid for movement"""
         return (0 <= x < self.width and 
                 0 <= y < self.height and 
-                self.grid[y][x].is_walkable()) 
\ No newline at end of file
+                self.grid.is_walkable(x, y))
+                
+    def add_enemy(self, enemy):
+        """Add an enemy to the dungeon and the occupancy index"""
+        self.enemies.append(enemy)
+        self.enemy_index.add(enemy)
+        
+    def remove_enemy(self, enemy):
+        """Remove an enemy from the dungeon and the occupancy index"""
+        if enemy in self.enemies:
+            self.enemies.remove(enemy)
+        self.enemy_index.remove(enemy)
+        self.path_service.release(enemy)
+        
+    def add_item(self, item):
+        """Add an item to the dungeon floor"""
+        self.items.append(item)
+        self.item_index.add(item)
+        
+    def remove_item(self, item):
+        """Remove an item from the dungeon floor"""
+        if item in self.items:
+            self.items.remove(item)
+        self.item_index.remove(item)
+        
+    def move_entity(self, entity, x, y):
+        """Move an enemy or item to a new position, keeping the indexes in sync"""
+        if entity in self.enemy_index:
+            self.enemy_index.move(entity, x, y)
+        elif entity in self.item_index:
+            self.item_index.move(entity, x, y)
+        else:
+            entity.x = x
+            entity.y = y
+            
+    def rebuild_spatial_index(self):
+        """Re-index every enemy and item after bulk changes to the entity lists"""
+        self.enemy_index.clear()
+        self.item_index.clear()
+        for enemy in self.enemies:
+            self.enemy_index.add(enemy)
+        for item in self.items:
+            self.item_index.add(item)
+            
+    def entity_at(self, x, y):
+        """Get the living enemy standing on a tile, or None"""
+        for enemy in self.enemy_index.cells.get((x, y), ()):
+            if enemy.alive:
+                return enemy
+        return None
+        
+    def entities_in_radius(self, x, y, radius):
+        """Get all enemies within a Euclidean radius of a position"""
+        return self.enemy_index.entities_in_radius(x, y, radius)
+        
+    def entities_in_rect(self, x0, y0, x1, y1):
+        """Get all enemies inside a rectangle of tiles (inclusive bounds)"""
+        return self.enemy_index.entities_in_rect(x0, y0, x1, y1)
+        
+    def init_navigation(self):
+        """Set up the shared navigation data used by enemy AI"""
+        self.walkable_mask = None
+        self.walkable_mask_version = None
+        self.player_distance_map = DistanceMap(self.width, self.height)
+        self.player_distance_key = None
+        self.pathfinder = PathFinder(self.width, self.height)
+        self.room_pathfinder = HierarchicalPathFinder(self.pathfinder, PATH_LOCAL_RANGE)
+        hierarchical = ADVANCED_SETTINGS.get("HIERARCHICAL_PATHS", True)
+        self.path_service = PathService(self.get_pathfinder, PATH_SEARCH_BUDGET,
+                                        ADVANCED_SETTINGS.get("INCREMENTAL_PATHS", True),
+                                        PATH_LOCAL_RANGE if hierarchical else None)
+        
+    def get_walkable_mask(self):
+        """Get a flat mask of tiles enemies can walk on, rebuilt when the map changes"""
+        if self.walkable_mask_version != self.grid.version:
+            self.walkable_mask = self.grid.type_mask(TileType.FLOOR)
+            self.walkable_mask_version = self.grid.version
+        return self.walkable_mask
+        
+    def get_pathfinder(self):
+        """Get the shared path search, loaded with the current walkable mask"""
+        if ADVANCED_SETTINGS.get("HIERARCHICAL_PATHS", True):
+            rooms = [(room.x, room.y, room.width, room.height) for room in self.rooms]
+            self.room_pathfinder.set_walkable(self.get_walkable_mask(), self.grid.version, rooms)
+            return self.room_pathfinder
+        self.pathfinder.set_walkable(self.get_walkable_mask(), self.grid.version)
+        return self.pathfinder
+        
+    def get_player_distance_map(self, player):
+        """Get the distance field toward the player, rebuilding it only when the player moves.
+        
+        The flood is bounded by the largest aggro range of any living enemy,
+        so enemies further away than that fall back to their own pathfinding.
+        """
+        key = (player.x, player.y, self.grid.version)
+        if key != self.player_distance_key:
+            max_range = max((enemy.aggro_range for enemy in self.enemies if enemy.alive), default=0)
+            self.player_distance_map.build(self.get_walkable_mask(), [(player.x, player.y)], max_range)
+            self.player_distance_key = key
+        return self.player_distance_map
@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from ..tile import TileType
+
+# Quadrant transforms: (row depth, column) -> (dx, dy) for north, east, south, west
+QUADRANTS = (
+    (0, 1, -1, 0),
+    (1, 0, 0, 1),
+    (0, 1, 1, 0),
+    (-1, 0, 0, 1),
+)
+
+def _shadowcast(types, width, height, origin_x, origin_y, radius, symmetric):
+    """
+    Recursive shadowcasting over a flat tile type array
+
+    Slopes are kept as integer (numerator, denominator) pairs so the
+    results are exact and do not depend on float rounding.
+
+    Args:
+        types: Flat array of tile type values (y * width + x)
+        width, height: Grid dimensions
+        origin_x, origin_y: Position of the viewer
+        radius: Maximum (circular) view distance in tiles
+        symmetric: Only light floor tiles whose centre is inside the light
+            cone, so that visibility is symmetric between two tiles
+
+    Returns:
+        List of flat indices of every visible tile
+    """
+    wall = TileType.WALL.value
+    radius_sq = radius * radius
+    visible = [origin_y * width + origin_x]
+
+    for row_dx, col_dx, row_dy, col_dy in QUADRANTS:
+
+        def scan(depth, start_num, start_den, end_num, end_den):
+            if depth > radius:
+                return
+
+            # Range of columns touched by the light cone at this depth
+            min_col = (2 * depth * start_num + start_den) // (2 * start_den)
+            max_col = -((end_den - 2 * depth * end_num) // (2 * end_den))
+
+            prev_is_wall = None
+            for col in range(min_col, max_col + 1):
+                x = origin_x + depth * row_dx + col * col_dx
+                y = origin_y + depth * row_dy + col * col_dy
+                in_bounds = 0 <= x < width and 0 <= y < height
+                is_wall = not in_bounds or types[y * width + x] == wall
+
+                if in_bounds and (is_wall or not symmetric or
+                                  (col * start_den >= depth * start_num and
+                                   col * end_den <= depth * end_num)):
+                    dx = x - origin_x
+                    dy = y - origin_y
+                    if dx * dx + dy * dy <= radius_sq:
+                        visible.append(y * width + x)
+
+                if prev_is_wall and not is_wall:
+                    # Leaving a shadow: the cone starts again at this tile's edge
+                    start_num, start_den = 2 * col - 1, 2 * depth
+                elif prev_is_wall is False and is_wall:
+                    # Entering a shadow: scan the lit part of the next row
+                    scan(depth + 1, start_num, start_den, 2 * col - 1, 2 * depth)
+
+                prev_is_wall = is_wall
+
+            if prev_is_wall is False:
+                scan(depth + 1, start_num, start_den, end_num, end_den)
+
+        scan(1, -1, 1, 1, 1)
+
+    return visible
+
+def symmetric_shadowcast(types, width, height, origin_x, origin_y, radius):
+    """Symmetric shadowcasting: if A can see B, B can see A"""
+    return _shadowcast(types, width, height, origin_x, origin_y, radius, True)
+
+def asymmetric_shadowcast(types, width, height, origin_x, origin_y, radius):
+    """Plain shadowcasting: lights floor tiles the cone only partly covers, so visibility can be one-way"""
+    return _shadowcast(types, width, height, origin_x, origin_y, radius, False)
+
+# Available FOV algorithms, selectable through ADVANCED_SETTINGS["FOV_ALGORITHM"]
+FOV_ALGORITHMS = {
+    "shadowcast": symmetric_shadowcast,
+    "shadowcast_asymmetric": asymmetric_shadowcast,
+}
+
+class FieldOfView:
+    """
+    Incremental field of view for a TileGrid
+
+    The visible set is only recomputed when the viewer position, the radius
+    or the grid's tile types change. Results for recently visited positions
+    are cached, and only tiles whose visibility actually changes are written
+    to the grid's visible bitset.
+    """
+
+    def __init__(self, grid, algorithm="shadowcast", cache_size=128):
+        self.grid = grid
+        self.algorithm = FOV_ALGORITHMS.get(algorithm, symmetric_shadowcast)
+        self.cache_size = cache_size
+
+        # (x, y, radius) -> (indices, coordinate set), valid for one grid version
+        self.cache = OrderedDict()
+        self.cache_version = grid.version
+
+        self.current_key = None
+        self.visible_indices = ()
+        self.visible_tiles = set()
+
+        # Callbacks notified with the indices of newly explored tiles
+        self.explore_listeners = []
+
+    def add_explore_listener(self, callback):
+        """Register a callback(indices) for tiles that become explored"""
+        if callback not in self.explore_listeners:
+            self.explore_listeners.append(callback)
+
+    def remove_explore_listener(self, callback):
+        """Unregister an explore callback"""
+        if callback in self.explore_listeners:
+            self.explore_listeners.remove(callback)
+
+    def compute(self, origin_x, origin_y, radius):
+        """Update the visible bitset for a viewer and return the visible positions"""
+        grid = self.grid
+        key = (origin_x, origin_y, radius, grid.version)
+        if key == self.current_key:
+            return self.visible_tiles
+
+        # Any tile type change may alter transparency, so drop cached results
+        if grid.version != self.cache_version:
+            self.cache.clear()
+            self.cache_version = grid.version
+
+        cache_key = key[:3]
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            indices = self.algorithm(grid.types, grid.width, grid.height,
+                                     origin_x, origin_y, radius)
+            width = grid.width
+            entry = (indices, set((i % width, i // width) for i in indices))
+            self.cache[cache_key] = entry
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(cache_key)
+
+        self.apply(entry[0])
+        self.current_key = key
+        self.visible_tiles = entry[1]
+        return self.visible_tiles
+
+    def apply(self, indices):
+        """Write a new visible set into the grid, touching only changed tiles"""
+        visible = self.grid.visible
+        explored = self.grid.explored
+        for i in self.visible_indices:
+            visible[i] = 0
+        newly_explored = []
+        for i in indices:
+            visible[i] = 1
+            if not explored[i]:
+                explored[i] = 1
+                newly_explored.append(i)
+        self.visible_indices = indices
+
+        if newly_explored:
+            for callback in self.explore_listeners:
+                callback(newly_explored)
+
+    def invalidate(self):
+        """Force the next compute() call to recalculate"""
+        self.current_key = None
+        self.cache.clear()
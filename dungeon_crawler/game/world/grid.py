@@ -0,0 +1,194 @@
+from ..tile import Tile, TileType
+
+# Tile types that can be walked on (mirrors Tile.is_walkable)
+WALKABLE_TYPES = (TileType.FLOOR.value, TileType.DOOR.value,
+                  TileType.STAIRS_DOWN.value, TileType.STAIRS_UP.value)
+
+class TileView(Tile):
+    """Lightweight proxy for a single cell of a TileGrid.
+
+    Behaves like a Tile (same attributes and methods) but reads and writes
+    straight through to the grid's flat arrays, so no per-cell objects are
+    kept alive.
+    """
+
+    __slots__ = ("_grid", "_index")
+
+    def __init__(self, grid, index):
+        self._grid = grid
+        self._index = index
+
+    @property
+    def type(self):
+        return self._grid.types[self._index]
+
+    @type.setter
+    def type(self, value):
+        self._grid.set_type_at(self._index, value)
+
+    @property
+    def variant(self):
+        return self._grid.variants[self._index]
+
+    @variant.setter
+    def variant(self, value):
+        self._grid.variants[self._index] = value
+
+    @property
+    def explored(self):
+        return bool(self._grid.explored[self._index])
+
+    @explored.setter
+    def explored(self, value):
+        self._grid.explored[self._index] = 1 if value else 0
+
+    @property
+    def visible(self):
+        return bool(self._grid.visible[self._index])
+
+    @visible.setter
+    def visible(self, value):
+        self._grid.visible[self._index] = 1 if value else 0
+
+    @property
+    def entity(self):
+        # Entities are tracked by the dungeon, not by individual tiles
+        return None
+
+class GridRow:
+    """Row accessor so that grid[y][x] keeps working for existing callers"""
+
+    __slots__ = ("_grid", "_offset")
+
+    def __init__(self, grid, y):
+        self._grid = grid
+        self._offset = y * grid.width
+
+    def __len__(self):
+        return self._grid.width
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self._grid.width
+        if not 0 <= x < self._grid.width:
+            raise IndexError("grid column out of range")
+        return TileView(self._grid, self._offset + x)
+
+    def __setitem__(self, x, tile):
+        """Assign a Tile (or TileType) to a cell, copying its state into the arrays"""
+        if not 0 <= x < self._grid.width:
+            raise IndexError("grid column out of range")
+        index = self._offset + x
+        if isinstance(tile, Tile):
+            self._grid.set_type_at(index, tile.type)
+            self._grid.variants[index] = tile.variant
+            self._grid.explored[index] = 1 if tile.explored else 0
+            self._grid.visible[index] = 1 if tile.visible else 0
+        else:
+            self._grid.set_type_at(index, tile)
+            self._grid.variants[index] = 0
+
+    def __iter__(self):
+        for x in range(self._grid.width):
+            yield TileView(self._grid, self._offset + x)
+
+class TileGrid:
+    """Compact tile storage for a dungeon level.
+
+    Tile type, variant, explored and visible flags are kept in flat byte
+    arrays indexed by y * width + x. Hot loops (FOV, rendering, minimap,
+    pathfinding) should use the arrays directly; grid[y][x] returns a
+    TileView for code that still wants Tile-like objects.
+    """
+
+    def __init__(self, width, height, fill=TileType.WALL):
+        self.width = width
+        self.height = height
+        self.size = width * height
+
+        fill_value = fill.value if isinstance(fill, TileType) else fill
+        self.types = bytearray([fill_value]) * self.size
+        self.variants = bytearray(self.size)
+        self.explored = bytearray(self.size)
+        self.visible = bytearray(self.size)
+
+        # Bumped whenever a tile type changes so caches (FOV, paths) can tell
+        # when walkability or transparency may have changed
+        self.version = 0
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        return GridRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield GridRow(self, y)
+
+    def index(self, x, y):
+        """Get the flat array index for a grid position"""
+        return y * self.width + x
+
+    def in_bounds(self, x, y):
+        """Check if a position lies inside the grid"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_type(self, x, y):
+        """Get the tile type value at a position"""
+        return self.types[y * self.width + x]
+
+    def set_type(self, x, y, tile_type, variant=0):
+        """Set the tile type (and reset the variant) at a position"""
+        index = y * self.width + x
+        self.set_type_at(index, tile_type)
+        self.variants[index] = variant
+
+    def set_type_at(self, index, tile_type):
+        """Set the tile type at a flat index"""
+        value = tile_type.value if isinstance(tile_type, TileType) else tile_type
+        if self.types[index] != value:
+            self.types[index] = value
+            self.version += 1
+
+    def fill(self, tile_type):
+        """Reset every tile to the given type and clear all other state"""
+        value = tile_type.value if isinstance(tile_type, TileType) else tile_type
+        self.types[:] = bytes([value]) * self.size
+        self.variants[:] = bytes(self.size)
+        self.explored[:] = bytes(self.size)
+        self.visible[:] = bytes(self.size)
+        self.version += 1
+
+    def fill_rect(self, x, y, width, height, tile_type):
+        """Set every tile inside a rectangle to the given type"""
+        value = tile_type.value if isinstance(tile_type, TileType) else tile_type
+        row = bytes([value]) * width
+        blank = bytes(width)
+        for row_y in range(y, y + height):
+            start = row_y * self.width + x
+            self.types[start:start + width] = row
+            self.variants[start:start + width] = blank
+        self.version += 1
+
+    def clear_visible(self):
+        """Mark every tile as not visible"""
+        self.visible[:] = bytes(self.size)
+
+    def is_walkable(self, x, y):
+        """Check if the tile at a position can be walked on"""
+        return self.types[y * self.width + x] in WALKABLE_TYPES
+
+    def is_transparent(self, x, y):
+        """Check if the tile at a position lets light through"""
+        return self.types[y * self.width + x] != TileType.WALL.value
+
+    def type_mask(self, *tile_types):
+        """Get a flat bytearray with 1 for every tile of the given types"""
+        values = set(t.value if isinstance(t, TileType) else t for t in tile_types)
+        table = bytes(1 if value in values else 0 for value in range(256))
+        return self.types.translate(table)
@@ -0,0 +1,220 @@
+import math
+import random
+import numpy as np
+import pygame
+from ..settings import *
+
+# Particle types, stored per particle as an index into this tuple
+PARTICLE_TYPES = ("dust", "leaf", "snow", "ember", "shadow", "light")
+PARTICLE_TYPE_IDS = {name: index for index, name in enumerate(PARTICLE_TYPES)}
+
+EMBER = PARTICLE_TYPE_IDS["ember"]
+PULSING_TYPES = (PARTICLE_TYPE_IDS["shadow"], PARTICLE_TYPE_IDS["light"])
+
+# Pre-baked animation frames: ember flicker scales and shadow/light pulse scales
+FLICKER_SCALES = (0.7, 0.85, 1.0, 1.15, 1.3)
+PULSE_SCALES = (0.7, 0.8, 0.9, 1.0)
+
+# Colors are quantized so particles can share pre-baked sprites
+COLOR_STEP = 32
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle pool stored as parallel NumPy arrays
+
+    Particles live in the first `count` slots of each array. Updates are
+    vectorised over that slice, and expired particles are recycled with a
+    swap-remove that moves live particles from the end into the holes, so
+    the pool stays packed without shifting the whole array. Particles are
+    drawn from pre-baked sprites in a single Surface.blits call.
+    """
+
+    def __init__(self, capacity=5000, rng=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(32))
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 4), dtype=np.uint8)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+
+        # Sprite keys (kind, color, size) -> sprite id; frames are baked on first draw
+        self.sprite_ids = {}
+        self.sprite_keys = []
+        self.sprite_frames = None
+
+    def __len__(self):
+        return self.count
+
+    def __getstate__(self):
+        # Surfaces cannot be pickled; they are re-baked on the next draw
+        state = self.__dict__.copy()
+        state["sprite_frames"] = None
+        return state
+
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+
+    def spawn(self, particle_type, x, y, lifetime, velocity_x, velocity_y, size, color):
+        """
+        Add a particle to the pool
+
+        Returns:
+            True if the particle was added, False if the pool is full
+        """
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        kind = PARTICLE_TYPE_IDS.get(particle_type, 0)
+        if len(color) < 4:
+            color = tuple(color) + (255,)
+        color = tuple(min(255, (c // COLOR_STEP) * COLOR_STEP + COLOR_STEP // 2) for c in color[:4])
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = velocity_x
+        self.vy[i] = velocity_y
+        self.lifetime[i] = lifetime
+        self.size[i] = size
+        self.color[i] = color
+        self.kind[i] = kind
+        self.sprite[i] = self.get_sprite_id(kind, color, size)
+        self.count += 1
+        return True
+
+    def get_sprite_id(self, kind, color, size):
+        """Get the shared sprite id for a particle's look"""
+        key = (kind, color, max(1, int(round(size))))
+        sprite_id = self.sprite_ids.get(key)
+        if sprite_id is None:
+            sprite_id = len(self.sprite_keys)
+            self.sprite_ids[key] = sprite_id
+            self.sprite_keys.append(key)
+            if self.sprite_frames is not None:
+                self.sprite_frames.append(self.bake_sprite(key))
+        return sprite_id
+
+    def update(self):
+        """Advance all particles by one frame and recycle expired ones"""
+        n = self.count
+        if n == 0:
+            return
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        self.lifetime[:n] -= 1
+        self.x[:n] += vx
+        self.y[:n] += vy
+
+        # Random drift, capped to a maximum speed
+        vx += self.rng.uniform(-0.02, 0.02, n).astype(np.float32)
+        vy += self.rng.uniform(-0.02, 0.02, n).astype(np.float32)
+        np.clip(vx, -0.2, 0.2, out=vx)
+        np.clip(vy, -0.2, 0.2, out=vy)
+
+        self.compact()
+
+    def compact(self):
+        """Swap-remove expired particles so live ones stay packed at the front"""
+        n = self.count
+        alive = self.lifetime[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count == n:
+            return
+
+        # Holes inside the new live range are filled from live particles beyond it
+        holes = np.flatnonzero(~alive[:live_count])
+        movers = np.flatnonzero(alive[live_count:]) + live_count
+        if holes.size:
+            for array in (self.x, self.y, self.vx, self.vy, self.lifetime,
+                          self.size, self.color, self.kind, self.sprite):
+                array[holes] = array[movers]
+        self.count = live_count
+
+    def bake_sprite(self, key):
+        """Render the animation frames for one sprite key"""
+        kind, color, size = key
+        frames = []
+        if kind == EMBER:
+            for scale in FLICKER_SCALES:
+                radius = max(1, int(size * scale))
+                surface = pygame.Surface((radius * 4, radius * 4), pygame.SRCALPHA)
+                pygame.draw.circle(surface, color, (radius * 2, radius * 2), radius)
+                frames.append((surface, radius * 2, radius * 2))
+        elif kind == PARTICLE_TYPE_IDS["leaf"]:
+            surface = pygame.Surface((size * 2, size), pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, color, (0, 0, size * 2, size))
+            frames.append((surface, 0, 0))
+        else:
+            scales = PULSE_SCALES if kind in PULSING_TYPES else (1.0,)
+            for scale in scales:
+                radius = max(1, int(size * scale))
+                surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(surface, color, (radius, radius), radius)
+                frames.append((surface, radius, radius))
+        return frames
+
+    def draw(self, screen, camera, visible, map_width, animation_timer=0):
+        """
+        Draw every particle standing on a visible, on-screen tile
+
+        Args:
+            screen: Surface to draw on
+            camera: Camera providing the offset and on-screen tile bounds
+            visible: Flat visibility mask (y * map_width + x)
+            map_width: Width of the map in tiles
+            animation_timer: Dungeon animation timer for pulsing particles
+        """
+        n = self.count
+        if n == 0:
+            return
+        if self.sprite_frames is None:
+            self.sprite_frames = [self.bake_sprite(key) for key in self.sprite_keys]
+
+        # Cull to particles on visible tiles inside the camera window
+        x0, y0, x1, y1 = camera.visible_tile_bounds(margin=1)
+        tile_x = np.floor(self.x[:n]).astype(np.int32)
+        tile_y = np.floor(self.y[:n]).astype(np.int32)
+        on_screen = (tile_x >= x0) & (tile_x < x1) & (tile_y >= y0) & (tile_y < y1)
+        candidates = np.flatnonzero(on_screen)
+        if candidates.size == 0:
+            return
+        visible_mask = np.frombuffer(visible, dtype=np.uint8)
+        candidates = candidates[visible_mask[tile_y[candidates] * map_width + tile_x[candidates]] != 0]
+        if candidates.size == 0:
+            return
+
+        offset_x, offset_y = camera.offset
+        screen_x = (self.x[candidates] * TILE_SIZE - offset_x).astype(np.int32).tolist()
+        screen_y = (self.y[candidates] * TILE_SIZE - offset_y).astype(np.int32).tolist()
+        kinds = self.kind[candidates]
+
+        # Embers flicker independently, shadow and light particles pulse together.
+        # The flicker is hashed from each ember's slot and remaining lifetime, so
+        # drawing never draws from the simulation's generator
+        frame_index = np.zeros(candidates.size, dtype=np.int32)
+        embers = kinds == EMBER
+        if embers.any():
+            slots = candidates[embers].astype(np.uint32)
+            ages = self.lifetime[slots].astype(np.uint32)
+            flicker = (ages * np.uint32(2654435761) + slots * np.uint32(40503)) >> np.uint32(16)
+            frame_index[embers] = (flicker % np.uint32(len(FLICKER_SCALES))).astype(np.int32)
+        pulsing = np.isin(kinds, PULSING_TYPES)
+        if pulsing.any():
+            pulse = (math.sin(animation_timer * 2) + 1) * 0.5
+            frame_index[pulsing] = min(len(PULSE_SCALES) - 1, int(pulse * len(PULSE_SCALES)))
+
+        sprite_frames = self.sprite_frames
+        blend_add = pygame.BLEND_ADD
+        batch = []
+        for sprite_id, frame, is_ember, sx, sy in zip(self.sprite[candidates].tolist(),
+                                                      frame_index.tolist(), embers.tolist(),
+                                                      screen_x, screen_y):
+            surface, anchor_x, anchor_y = sprite_frames[sprite_id][frame]
+            batch.append((surface, (sx - anchor_x, sy - anchor_y), None, blend_add if is_ember else 0))
+        screen.blits(batch, doreturn=False)
@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .dungeon import Dungeon
+from ..log import get_logger
+from ..settings import *
+
+log = get_logger("world")
+
+# Prefetch backends accepted by FloorPrefetcher
+BACKENDS = ("thread", "process", "off")
+
+def build_floor(level, seed, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Generate a floor (module level so worker processes can run it)"""
+    return Dungeon(width, height, level=level, seed=seed)
+
+class FloorPrefetcher:
+    """
+    Generates the next floor in the background while the current one is played
+
+    request() starts building a floor from its seed on a worker thread or
+    process; take() hands it over when the player reaches the stairs. If the
+    floor is not ready, take() waits for a build that is already running, or
+    cancels a queued one and builds synchronously, so it always returns a
+    dungeon for the requested floor and seed.
+    """
+
+    def __init__(self, backend="thread", width=GRID_WIDTH, height=GRID_HEIGHT):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown prefetch backend: {backend}")
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.executor = None
+        self.pending = None  # (level, seed, future)
+
+        # Statistics
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+
+    def get_executor(self):
+        """Create the worker pool on first use"""
+        if self.executor is None:
+            if self.backend == "process":
+                self.executor = ProcessPoolExecutor(max_workers=1)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-prefetch")
+        return self.executor
+
+    def request(self, level, seed):
+        """Start generating a floor in the background (replaces any other request)"""
+        if self.backend == "off":
+            return
+        if self.pending and self.pending[:2] == (level, seed):
+            return
+        self.cancel()
+        try:
+            future = self.get_executor().submit(build_floor, level, seed, self.width, self.height)
+        except Exception as e:
+            log.warning("Could not start floor prefetch: %s", e)
+            return
+        self.pending = (level, seed, future)
+        log.debug("Prefetching floor %s (seed %s) on a %s", level, seed, self.backend)
+
+    def is_ready(self, level, seed):
+        """Check whether a floor has finished generating in the background"""
+        return bool(self.pending and self.pending[:2] == (level, seed) and self.pending[2].done())
+
+    def take(self, level, seed):
+        """
+        Get a generated floor, building it now if it was not prefetched
+
+        Returns:
+            Dungeon for the level and seed
+        """
+        pending, self.pending = self.pending, None
+        if pending and pending[:2] == (level, seed) and (pending[2].done() or pending[2].running()):
+            # Already built or being built: finishing it is never slower than starting over
+            future = pending[2]
+            waited = not future.done()
+            try:
+                dungeon = future.result()
+            except Exception as e:
+                log.warning("Floor prefetch failed, generating synchronously: %s", e)
+            else:
+                if waited:
+                    self.waits += 1
+                else:
+                    self.hits += 1
+                return dungeon
+        elif pending:
+            pending[2].cancel()
+
+        self.misses += 1
+        return build_floor(level, seed, self.width, self.height)
+
+    def cancel(self):
+        """Drop the pending request"""
+        if self.pending:
+            self.pending[2].cancel()
+            self.pending = None
+
+    def close(self):
+        """Stop the worker pool"""
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
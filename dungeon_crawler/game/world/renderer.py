@@ -0,0 +1,286 @@
+import pygame
+import math
+import random
+from ..tile import TileType
+from ..settings import *
+
+# Tile render states
+STATE_DARK = 0
+STATE_REMEMBERED = 1
+STATE_VISIBLE = 2
+STATE_UNPAINTED = 255
+
+# Pulsing light animation per biome: (speed, amount)
+BIOME_LIGHT_PULSE = {
+    "LAVA": (1.0, 0.1),
+    "ICE": (2.0, 0.05),
+    "CRYSTAL": (1.5, 0.15),
+}
+
+class TileSprites:
+    """Pre-rendered tile sprites for one biome"""
+
+    def __init__(self, biome_name):
+        self.biome_name = biome_name
+        self.colors = BIOME_COLORS.get(biome_name, BIOME_COLORS["CAVERN"])
+        self.lit = {}
+        self.remembered = {}
+        self.dark = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        self.dark.fill(COLOR_BLACK)
+
+    def base_color(self, tile_type):
+        """Get the fully lit color for a tile type"""
+        if tile_type == TileType.WALL.value:
+            return self.colors["WALL"]
+        elif tile_type == TileType.WATER.value:
+            return self.colors["WATER"]
+        elif tile_type == TileType.LAVA.value:
+            return self.colors["HAZARD"]
+        elif tile_type in (TileType.STAIRS_DOWN.value, TileType.STAIRS_UP.value):
+            return self.colors["ACCENT"]
+        return self.colors["FLOOR"]
+
+    def get(self, tile_type, variant, state):
+        """Get the sprite for a tile type and variant in a given render state"""
+        if state == STATE_DARK:
+            return self.dark
+        sprites = self.lit if state == STATE_VISIBLE else self.remembered
+        key = (tile_type, variant)
+        sprite = sprites.get(key)
+        if sprite is None:
+            sprite = self.build(tile_type, variant, state == STATE_VISIBLE)
+            sprites[key] = sprite
+        return sprite
+
+    def build(self, tile_type, variant, lit):
+        """Draw a single tile sprite"""
+        color = self.base_color(tile_type)
+        if not lit:
+            color = tuple(c // 2 for c in color)
+
+        sprite = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        sprite.fill(color)
+
+        if tile_type == TileType.FLOOR.value and variant > 0:
+            detail_color = tuple(max(0, c - 30) for c in color)
+            detail_size = max(1, TILE_SIZE // 8)
+            if variant == 1:  # Small crack
+                pygame.draw.line(sprite, detail_color,
+                                 (TILE_SIZE // 3, TILE_SIZE // 3),
+                                 (2 * TILE_SIZE // 3, 2 * TILE_SIZE // 3), 1)
+            else:  # Biome decoration
+                self.draw_biome_detail(sprite, lit)
+                pygame.draw.circle(sprite, detail_color,
+                                   (2 * TILE_SIZE // 3, 2 * TILE_SIZE // 3), detail_size)
+
+        elif tile_type == TileType.DOOR.value:
+            door_color = (150, 100, 50) if lit else (75, 50, 25)
+            pygame.draw.rect(sprite, door_color,
+                             (TILE_SIZE // 4, TILE_SIZE // 4, TILE_SIZE // 2, TILE_SIZE // 2))
+
+        elif tile_type == TileType.STAIRS_DOWN.value:
+            for i in range(4):
+                stair_y = TILE_SIZE // 4 + i * TILE_SIZE // 8
+                pygame.draw.rect(sprite, (40, 40, 40),
+                                 (2, stair_y, TILE_SIZE - 4, TILE_SIZE // 8))
+
+        return sprite
+
+    def draw_biome_detail(self, sprite, lit):
+        """Draw the biome's floor decoration (rocks, grass, ice) onto a sprite"""
+        # Seeded so the decoration is stable for the whole floor
+        rng = random.Random(self.biome_name)
+        if self.biome_name == "CAVERN":
+            color = self.colors["ACCENT"] if lit else tuple(c // 2 for c in self.colors["ACCENT"])
+            pygame.draw.circle(sprite, color,
+                               (rng.randint(5, TILE_SIZE - 5), rng.randint(5, TILE_SIZE - 5)),
+                               rng.randint(2, 5))
+        elif self.biome_name == "FOREST":
+            color = self.colors["VEGETATION"] if lit else tuple(c // 2 for c in self.colors["VEGETATION"])
+            grass_x = rng.randint(5, TILE_SIZE - 5)
+            grass_y = rng.randint(TILE_SIZE - 10, TILE_SIZE - 5)
+            pygame.draw.line(sprite, color, (grass_x, grass_y),
+                             (grass_x, grass_y - rng.randint(3, 7)), 2)
+        elif self.biome_name == "ICE":
+            color = (230, 240, 255) if lit else (115, 120, 128)
+            size = rng.randint(2, 4)
+            cx = rng.randint(5, TILE_SIZE - 5)
+            cy = rng.randint(5, TILE_SIZE - 5)
+            pygame.draw.polygon(sprite, color, [(cx, cy - size), (cx + size, cy),
+                                                (cx, cy + size), (cx - size, cy)])
+
+class DungeonRenderer:
+    """
+    Layered renderer for a dungeon floor
+
+    The static tile layer is drawn from pre-rendered sprites into a cached
+    screen-sized surface. It is only rebuilt when the camera moves; when
+    the camera is still, only tiles whose visible/explored state changed
+    are re-blitted. Distance lighting and biome pulsing are applied as a
+    separate light layer on top instead of per-tile color math.
+    """
+
+    def __init__(self, dungeon):
+        self.dungeon = dungeon
+        self.biome_name = dungeon.biome.name
+        self.sprites = TileSprites(self.biome_name)
+        self.fog_of_war = ADVANCED_SETTINGS.get("FOG_OF_WAR", True)
+
+        # Cached static tile layer and the state each tile was painted with
+        self.map_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.layer_offset = None
+        self.layer_version = None
+        self.painted = bytearray([STATE_UNPAINTED]) * dungeon.grid.size
+        self.last_visible = None
+
+        # Light layer, rebuilt when the view radius changes
+        self.light_layer = None
+        self.light_radius = None
+
+        # Reused overlays and glow sprites
+        self.shadow_overlay = None
+        self.heat_overlay = None
+        self.glow_cache = {}
+
+    def tile_state(self, index):
+        """Get the render state for a tile"""
+        grid = self.dungeon.grid
+        if grid.visible[index]:
+            return STATE_VISIBLE
+        if self.fog_of_war and grid.explored[index]:
+            return STATE_REMEMBERED
+        return STATE_DARK
+
+    def render_tiles(self, screen, camera):
+        """Bring the cached tile layer up to date and draw it"""
+        camera_offset = camera.offset
+        bounds = camera.visible_tile_bounds()
+        if camera_offset != self.layer_offset or self.dungeon.grid.version != self.layer_version:
+            self.repaint_all(camera_offset, bounds)
+        elif self.dungeon.fov.visible_indices is not self.last_visible:
+            self.repaint_dirty(camera_offset, bounds)
+        screen.blit(self.map_layer, (0, 0))
+
+    def repaint_all(self, camera_offset, bounds):
+        """Redraw every on-screen tile into the layer with one batched blit"""
+        grid = self.dungeon.grid
+        width = grid.width
+        types = grid.types
+        variants = grid.variants
+        painted = self.painted
+        sprites = self.sprites
+        offset_x, offset_y = camera_offset
+
+        self.map_layer.fill(COLOR_BLACK)
+        x0, y0, x1, y1 = bounds
+        batch = []
+        for y in range(y0, y1):
+            screen_y = y * TILE_SIZE - offset_y
+            row = y * width
+            for x in range(x0, x1):
+                i = row + x
+                state = self.tile_state(i)
+                painted[i] = state
+                if state != STATE_DARK:
+                    batch.append((sprites.get(types[i], variants[i], state),
+                                  (x * TILE_SIZE - offset_x, screen_y)))
+        self.map_layer.blits(batch, doreturn=False)
+
+        self.layer_offset = camera_offset
+        self.layer_version = grid.version
+        self.last_visible = self.dungeon.fov.visible_indices
+
+    def repaint_dirty(self, camera_offset, bounds):
+        """Redraw only the tiles that entered or left the field of view"""
+        grid = self.dungeon.grid
+        width = grid.width
+        types = grid.types
+        variants = grid.variants
+        painted = self.painted
+        sprites = self.sprites
+        offset_x, offset_y = camera_offset
+        x0, y0, x1, y1 = bounds
+
+        current = self.dungeon.fov.visible_indices
+        batch = []
+        for indices in (self.last_visible or (), current):
+            for i in indices:
+                state = self.tile_state(i)
+                if painted[i] == state:
+                    continue
+                x = i % width
+                y = i // width
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    continue
+                painted[i] = state
+                batch.append((sprites.get(types[i], variants[i], state),
+                              (x * TILE_SIZE - offset_x, y * TILE_SIZE - offset_y)))
+        if batch:
+            self.map_layer.blits(batch, doreturn=False)
+        self.last_visible = current
+
+    def get_light_layer(self, radius):
+        """Get the distance falloff layer centred on the viewer"""
+        if self.light_layer is None or self.light_radius != radius:
+            size = (2 * radius + 1) * TILE_SIZE
+            layer = pygame.Surface((size, size), pygame.SRCALPHA)
+            for dy in range(-radius, radius + 1):
+                for dx in range(-radius, radius + 1):
+                    distance = math.sqrt(dx * dx + dy * dy)
+                    fade = max(0.5, 1.0 - distance / radius)
+                    alpha = int(255 * (1.0 - fade))
+                    if alpha > 0:
+                        layer.fill((0, 0, 0, alpha),
+                                   ((dx + radius) * TILE_SIZE, (dy + radius) * TILE_SIZE,
+                                    TILE_SIZE, TILE_SIZE))
+            self.light_layer = layer
+            self.light_radius = radius
+        return self.light_layer
+
+    def render_lighting(self, screen, camera_offset, player, animation_timer):
+        """Darken tiles with distance from the player and apply biome pulsing"""
+        radius = self.dungeon.visibility_radius
+        layer = self.get_light_layer(radius)
+
+        # Biome pulse brightens the scene by weakening the darkening layer
+        pulse = 0.0
+        if self.biome_name in BIOME_LIGHT_PULSE:
+            speed, amount = BIOME_LIGHT_PULSE[self.biome_name]
+            pulse = (math.sin(animation_timer * speed) + 1) * amount
+        layer.set_alpha(int(255 * max(0.0, 1.0 - pulse * 2)))
+
+        screen.blit(layer, ((player.x - radius) * TILE_SIZE - camera_offset[0],
+                            (player.y - radius) * TILE_SIZE - camera_offset[1]))
+
+    def get_glow(self, color, glow_radius):
+        """Get a cached radial glow sprite"""
+        key = (color, glow_radius)
+        glow_surface = self.glow_cache.get(key)
+        if glow_surface is None:
+            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+            for radius in range(glow_radius, 0, -1):
+                alpha = int(150 * (radius / glow_radius))
+                pygame.draw.circle(glow_surface, (*color, alpha),
+                                   (glow_radius, glow_radius), radius)
+            self.glow_cache[key] = glow_surface
+        return glow_surface
+
+    def get_shadow_overlay(self):
+        """Get the shadow realm tint overlay"""
+        if self.shadow_overlay is None:
+            self.shadow_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            self.shadow_overlay.fill((0, 0, 20, 50))  # Dark blue tint
+        return self.shadow_overlay
+
+    def get_heat_overlay(self, animation_timer):
+        """Redraw the reusable heat distortion overlay for this frame"""
+        if self.heat_overlay is None:
+            self.heat_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        heat_overlay = self.heat_overlay
+        heat_overlay.fill((0, 0, 0, 0))
+        distortion = (math.sin(animation_timer) + 1) * 0.5
+        for y in range(0, SCREEN_HEIGHT, 10):
+            wave = math.sin(y * 0.05 + animation_timer) * 5 * distortion
+            pygame.draw.line(heat_overlay, (255, 100, 20, 5),
+                             (0, y), (SCREEN_WIDTH, y + wave))
+        return heat_overlay
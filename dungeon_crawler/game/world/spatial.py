@@ -0,0 +1,136 @@
+class SpatialIndex:
+    """
+    Position index for entities on the dungeon grid
+
+    Keeps an exact cell -> entities map for O(1) occupancy checks, plus a
+    coarse bucketed spatial hash for area queries. Entities must be moved
+    through move() so both stay in sync. Buckets are insertion ordered
+    dicts, so query results come back in a deterministic order.
+    """
+
+    def __init__(self, bucket_size=8):
+        self.bucket_size = bucket_size
+        self.cells = {}      # (x, y) -> list of entities
+        self.buckets = {}    # (bucket_x, bucket_y) -> {entity: None}
+        self.positions = {}  # entity -> (x, y)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, entity):
+        return entity in self.positions
+
+    def clear(self):
+        """Remove every entity from the index"""
+        self.cells.clear()
+        self.buckets.clear()
+        self.positions.clear()
+
+    def add(self, entity):
+        """Add an entity at its current position"""
+        if entity in self.positions:
+            self.move(entity, entity.x, entity.y)
+            return
+        position = (entity.x, entity.y)
+        self.positions[entity] = position
+        self.cells.setdefault(position, []).append(entity)
+        bucket_key = (entity.x // self.bucket_size, entity.y // self.bucket_size)
+        self.buckets.setdefault(bucket_key, {})[entity] = None
+
+    def remove(self, entity):
+        """Remove an entity from the index"""
+        position = self.positions.pop(entity, None)
+        if position is None:
+            return False
+        self._unlink(entity, position)
+        return True
+
+    def move(self, entity, x, y):
+        """Move an entity to a new position, updating the entity and the index"""
+        old_position = self.positions.get(entity)
+        entity.x = x
+        entity.y = y
+        if old_position is None:
+            self.add(entity)
+            return
+        if old_position == (x, y):
+            return
+
+        # Cell map
+        occupants = self.cells[old_position]
+        occupants.remove(entity)
+        if not occupants:
+            del self.cells[old_position]
+        self.cells.setdefault((x, y), []).append(entity)
+        self.positions[entity] = (x, y)
+
+        # Bucket map, only touched when crossing a bucket boundary
+        size = self.bucket_size
+        old_bucket = (old_position[0] // size, old_position[1] // size)
+        new_bucket = (x // size, y // size)
+        if old_bucket != new_bucket:
+            bucket = self.buckets[old_bucket]
+            del bucket[entity]
+            if not bucket:
+                del self.buckets[old_bucket]
+            self.buckets.setdefault(new_bucket, {})[entity] = None
+
+    def _unlink(self, entity, position):
+        """Drop an entity from the cell and bucket maps"""
+        occupants = self.cells.get(position)
+        if occupants is not None:
+            occupants.remove(entity)
+            if not occupants:
+                del self.cells[position]
+        bucket_key = (position[0] // self.bucket_size, position[1] // self.bucket_size)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is not None:
+            bucket.pop(entity, None)
+            if not bucket:
+                del self.buckets[bucket_key]
+
+    def entities_at(self, x, y):
+        """Get a list of all entities on a cell"""
+        return list(self.cells.get((x, y), ()))
+
+    def entity_at(self, x, y):
+        """Get the first entity on a cell, or None"""
+        occupants = self.cells.get((x, y))
+        return occupants[0] if occupants else None
+
+    def entities_in_rect(self, x0, y0, x1, y1):
+        """Get all entities inside a rectangle (inclusive bounds)"""
+        # Small areas are cheaper to answer from the cell map directly
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= 16:
+            found = []
+            cells = self.cells
+            for y in range(y0, y1 + 1):
+                for x in range(x0, x1 + 1):
+                    occupants = cells.get((x, y))
+                    if occupants:
+                        found.extend(occupants)
+            return found
+
+        size = self.bucket_size
+        found = []
+        for bucket_y in range(y0 // size, y1 // size + 1):
+            for bucket_x in range(x0 // size, x1 // size + 1):
+                bucket = self.buckets.get((bucket_x, bucket_y))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    x, y = self.positions[entity]
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        found.append(entity)
+        return found
+
+    def entities_in_radius(self, x, y, radius):
+        """Get all entities within a Euclidean radius of a position"""
+        radius_sq = radius * radius
+        found = []
+        r = int(radius)
+        for entity in self.entities_in_rect(x - r, y - r, x + r, y + r):
+            ex, ey = self.positions[entity]
+            if (ex - x) ** 2 + (ey - y) ** 2 <= radius_sq:
+                found.append(entity)
+        return found
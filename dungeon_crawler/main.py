@@ -2,16 +2,32 @@ import pygame
 import sys
 import os
 import math
-import traceback  # Added for better error reporting
+import time
 from game.game_state import GameState
-from game.world.dungeon import Dungeon, Biome  # Explicitly import Biome
-from game.player import Player
 from game.ui.menu import MainMenu, OptionsMenu  # Import OptionsMenu directly
 from game.ui.hud import HUD
+from game.ui.fonts import get_font, render_text
 from game.quest_manager import QuestManager
+from game.session import GameSession
+from game.profiler import PROFILER
+from game.log import get_logger
+from game.timestep import FixedTimestep
+from game.world.prefetch import FloorPrefetcher
+from game.replay import InputRecorder
 from game.sound_manager import SoundManager
 from game.settings import *
 
+log = get_logger("main")
+
+# Gameplay keys and the session actions they trigger
+KEY_ACTIONS = {
+    pygame.K_UP: "up", pygame.K_w: "up",
+    pygame.K_DOWN: "down", pygame.K_s: "down",
+    pygame.K_LEFT: "left", pygame.K_a: "left",
+    pygame.K_RIGHT: "right", pygame.K_d: "right",
+    pygame.K_SPACE: "use_item",
+}
+
 # Add absolute path resolution helper
 def resolve_path(relative_path):
     """Resolve a relative path to an absolute path based on the script location"""
@@ -19,21 +35,24 @@ def resolve_path(relative_path):
     return os.path.join(base_dir, relative_path)
 
 class DungeonCrawler:
-    def __init__(self):
+    def __init__(self, record_dir=None):
+        # Directory for input recordings of each game, or None to not record
+        self.record_dir = record_dir
+        
         # Initialize Pygame
         pygame.init()
         
         # Set up logging for debugging
-        print("Initializing Epic Dungeon Crawler...")
-        print(f"Working directory: {os.getcwd()}")
+        log.info("Initializing Epic Dungeon Crawler...")
+        log.debug("Working directory: %s", os.getcwd())
         
         # Initialize audio systems with error handling
         try:
             pygame.mixer.init(44100, -16, 2, 1024)
-            print("Audio system initialized successfully")
+            log.debug("Audio system initialized successfully")
         except pygame.error as e:
-            print(f"Warning: Audio system initialization failed: {e}")
-            print("The game will run without sound")
+            log.warning("Audio system initialization failed: %s", e)
+            log.warning("The game will run without sound")
         
         pygame.font.init()
         
@@ -41,103 +60,100 @@ class DungeonCrawler:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Epic Dungeon Crawler")
         
-        # Set up the clock
+        # Set up the clock and the fixed simulation timestep
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
+        self.render_alpha = 1.0
         
         # Load game icon with proper error handling
         icon_path = resolve_path(os.path.join("assets", "images", "icon.png"))
-        print(f"Looking for icon at: {icon_path}")
+        log.debug("Looking for icon at: %s", icon_path)
         if os.path.exists(icon_path):
             try:
                 icon = pygame.image.load(icon_path)
                 pygame.display.set_icon(icon)
-                print("Game icon loaded successfully")
+                log.debug("Game icon loaded successfully")
             except pygame.error as e:
-                print(f"Warning: Could not load game icon: {e}")
+                log.warning("Could not load game icon: %s", e)
         else:
-            print(f"Warning: Icon file not found at {icon_path}")
+            log.warning("Icon file not found at %s", icon_path)
         
         # Initialize game state
         self.game_state = GameState.MAIN_MENU
         
         # Initialize managers and UI elements with error handling
         try:
-            print("Initializing sound manager...")
+            log.debug("Initializing sound manager...")
             self.sound_manager = SoundManager()
             
-            print("Initializing quest manager...")
-            self.quest_manager = QuestManager()
+            log.debug("Initializing game session...")
+            prefetcher = FloorPrefetcher(ADVANCED_SETTINGS.get("FLOOR_PREFETCH", "thread"))
+            recorder = InputRecorder() if self.record_dir else None
+            self.session = GameSession(self.sound_manager, prefetcher=prefetcher, recorder=recorder)
             
-            print("Initializing main menu...")
+            log.debug("Initializing main menu...")
             self.main_menu = MainMenu(self.screen, self.sound_manager)
             
-            print("Initializing options menu...")
+            log.debug("Initializing options menu...")
             self.options_menu = OptionsMenu(self.screen, self.sound_manager)
             
-            print("Initializing HUD...")
+            log.debug("Initializing HUD...")
             self.hud = HUD(self.screen)
             
-            print("All managers and UI elements initialized successfully")
+            log.debug("All managers and UI elements initialized successfully")
         except Exception as e:
-            print(f"Error during initialization of game components: {e}")
-            traceback.print_exc()
+            log.exception("Error during initialization of game components: %s", e)
             
-        # Initialize game objects
-        self.current_floor = 1
-        self.dungeon = None
-        self.player = None
-        
         # Initialize game variables
         self.running = True
         self.paused = False
         
         # Start background music with error handling
         try:
-            print("Starting menu music...")
+            log.debug("Starting menu music...")
             self.sound_manager.play_music("menu")
-            print("Menu music started successfully")
+            log.debug("Menu music started successfully")
         except Exception as e:
-            print(f"Warning: Could not play menu music: {e}")
+            log.warning("Could not play menu music: %s", e)
 
-    def initialize_game(self):
-        """Initialize a new game"""
-        print("Initializing new game at floor", self.current_floor, "...")
-        
-        # Create a dungeon for the current floor
-        self.dungeon = Dungeon(GRID_WIDTH, GRID_HEIGHT, 
-                              max_rooms=12, 
-                              room_min_size=6, 
-                              room_max_size=12,
-                              level=max(1, self.current_floor))
+    # Game objects live on the session so the rules can also run headless
+    @property
+    def dungeon(self):
+        return self.session.dungeon
+
+    @dungeon.setter
+    def dungeon(self, value):
+        self.session.dungeon = value
+
+    @property
+    def player(self):
+        return self.session.player
+
+    @player.setter
+    def player(self, value):
+        self.session.player = value
 
-        # Determine biome type based on current floor
-        self.dungeon.determine_biome()
-        print(f"Dungeon created with biome: {self.dungeon.biome.name}")
+    @property
+    def quest_manager(self):
+        return self.session.quest_manager
 
-        # Initialize biome-specific features
-        self.dungeon.init_biome_features()
-        
-        # Create player at a valid position
-        valid_room = self.dungeon.rooms[0]  # Use first room for player
-        player_x, player_y = valid_room.center()
-        self.player = Player(player_x, player_y)
-        self.player.dungeon = self.dungeon  # Give player reference to dungeon
-        print(f"Player created at position {player_x}, {player_y}")
-        
-        # Generate enemies and items in the dungeon
-        self.dungeon.place_entities()
-        
-        # Initialize quest for this floor
-        self.quest_manager = QuestManager()
-        new_quest = self.quest_manager.generate_quest(self.current_floor, self.dungeon.biome)
-        self.quest_manager.active_quest = new_quest
-        
-        # Start dungeon background music
-        print("Starting dungeon background music...")
-        self.sound_manager.play_music("dungeon")
-        print("Dungeon music started successfully")
-        
-        print("Game initialized successfully")
+    @quest_manager.setter
+    def quest_manager(self, value):
+        self.session.quest_manager = value
+
+    @property
+    def current_floor(self):
+        return self.session.current_floor
+
+    @current_floor.setter
+    def current_floor(self, value):
+        self.session.current_floor = value
+
+    def initialize_game(self):
+        """Initialize a new game"""
+        self.session.new_game()
+        # Generation can take a while; don't replay that time as catch-up ticks
+        self.timestep.reset()
 
     def handle_events(self):
         """Process all game events"""
@@ -145,6 +161,14 @@ class DungeonCrawler:
             if event.type == pygame.QUIT:
                 self.running = False
                 
+            # Profiler controls work in every state
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                PROFILER.toggle_overlay()
+                continue
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.toggle_trace()
+                continue
+                
             # Handle menu events
             if self.game_state == GameState.MAIN_MENU:
                 menu_action = self.main_menu.handle_event(event)
@@ -154,16 +178,16 @@ class DungeonCrawler:
                     
                     # Ensure all UI components are properly initialized
                     if not hasattr(self, 'hud') or self.hud is None:
-                        print("Initializing HUD...")
+                        log.debug("Initializing HUD...")
                         self.hud = HUD(self.screen)
                     
                     if not hasattr(self, 'quest_manager') or self.quest_manager is None:
-                        print("Initializing quest manager...")
+                        log.debug("Initializing quest manager...")
                         self.quest_manager = QuestManager()
                     
                     # Set the game state to PLAYING after initialization
                     self.game_state = GameState.PLAYING
-                    print("Game state changed to PLAYING")
+                    log.debug("Game state changed to PLAYING")
                 elif menu_action == "options":
                     # Transition to options menu
                     self.game_state = GameState.OPTIONS
@@ -174,8 +198,7 @@ class DungeonCrawler:
             elif self.game_state == GameState.OPTIONS:
                 options_action = self.options_menu.handle_event(event)
                 if options_action == "back":
-                    # Print a debug message to verify this code is being reached
-                    print("Back button clicked, returning to main menu")
+                    log.debug("Back button clicked, returning to main menu")
                     self.game_state = GameState.MAIN_MENU
                     
             # Handle gameplay events
@@ -183,210 +206,77 @@ class DungeonCrawler:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         self.paused = not self.paused
+                    elif event.key == pygame.K_m and not self.paused:
+                        self.game_state = GameState.MINIMAP_SCREEN
+                        continue
                     
                     if not self.paused:
                         self.handle_player_input(event)
             
+            # Handle full map screen events
+            elif self.game_state == GameState.MINIMAP_SCREEN:
+                if event.type == pygame.KEYDOWN and event.key in (pygame.K_m, pygame.K_ESCAPE):
+                    self.game_state = GameState.PLAYING
+            
             # Handle game over events
             elif self.game_state == GameState.GAME_OVER:
                 if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                     self.game_state = GameState.MAIN_MENU
                     
+    def toggle_trace(self):
+        """Start recording a profiler trace, or stop and save it"""
+        if not PROFILER.tracing:
+            PROFILER.start_trace()
+            log.info("Profiler trace recording started (F4 to stop)")
+        else:
+            path = PROFILER.stop_trace(time.strftime("trace_%Y%m%d_%H%M%S.json"))
+            log.info("Profiler trace saved to %s", os.path.abspath(path))
+            
     def handle_player_input(self, event):
         """Handle player keyboard input during gameplay"""
-        try:
-            if event.key in (pygame.K_UP, pygame.K_w):
-                result = self.player.move(0, -1, self.dungeon)
-                self.handle_move_result(result)
-            elif event.key in (pygame.K_DOWN, pygame.K_s):
-                result = self.player.move(0, 1, self.dungeon)
-                self.handle_move_result(result)
-            elif event.key in (pygame.K_LEFT, pygame.K_a):
-                result = self.player.move(-1, 0, self.dungeon)
-                self.handle_move_result(result)
-            elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                result = self.player.move(1, 0, self.dungeon)
-                self.handle_move_result(result)
-            elif event.key == pygame.K_SPACE:
-                self.player.use_item()
-        except Exception as e:
-            print(f"Error handling player input: {e}")
-            
-    def handle_move_result(self, result):
-        """Handle the result of a player movement attempt"""
-        if result == True:
-            self.sound_manager.play_sound("step")
-        elif result == "next_floor":
-            self.advance_floor()
-            
+        action = KEY_ACTIONS.get(event.key)
+        if action:
+            # Applied on the next simulation tick
+            self.session.queue_action(action)
+
     def update(self):
         """Update game state"""
         if self.game_state == GameState.PLAYING and not self.paused:
+            self.session.update()
+            if self.session.game_over:
+                self.game_state = GameState.GAME_OVER
+                self.save_recording()
+
+    def save_recording(self):
+        """Save the input recording of the current game, if recording"""
+        recorder = self.session.recorder
+        if recorder and recorder.seed is not None:
+            path = os.path.join(self.record_dir, time.strftime("run_%Y%m%d_%H%M%S.json"))
             try:
-                # Update dungeon elements
-                if self.dungeon:
-                    self.dungeon.update()
-                
-                # Update player
-                if self.player:
-                    self.player.update()
-                
-                # Update enemies
-                for enemy in self.dungeon.enemies[:]:  # Use a copy to safely modify during iteration
-                    enemy.update(self.player, self.dungeon)
-                    
-                # Check for combat
-                self.check_combat()
-                    
-                # Check for item pickup
-                self.check_item_pickup()
-                    
-                # Update quest
-                self.quest_manager.update_quest(self.player, self.dungeon)
-                    
-                # Check if floor is cleared
-                if not self.dungeon.enemies:
-                    self.advance_floor()
-                    
-                # Check player health
-                if self.player.health <= 0:
-                    self.game_state = GameState.GAME_OVER
-                    self.sound_manager.play_sound("game_over")
-                    self.sound_manager.play_music("game_over")
-            except Exception as e:
-                print(f"Error during game update: {e}")
-    
+                recorder.save(path, self.session)
+            except OSError as e:
+                log.error("Could not save input recording: %s", e)
+            recorder.seed = None
+
     def check_combat(self):
         """Check for player-enemy combat"""
-        for enemy in self.dungeon.enemies[:]:
-            if (abs(self.player.x - enemy.x) <= 1 and abs(self.player.y - enemy.y) <= 1):
-                # Player attacks enemy
-                damage_to_enemy = self.player.get_attack_damage()
-                enemy.health -= damage_to_enemy
-                
-                # Show damage numbers
-                self.dungeon.floating_texts.append({
-                    "x": enemy.x, 
-                    "y": enemy.y,
-                    "text": str(damage_to_enemy),
-                    "color": (255, 0, 0),
-                    "lifetime": 20,
-                    "velocity": -0.2
-                })
-                
-                # Play attack sound
-                self.sound_manager.play_sound("attack")
-                
-                if enemy.health <= 0:
-                    enemy.alive = False
-                    self.dungeon.enemies.remove(enemy)
-                    self.player.add_xp(50)
-                    self.player.add_score(50)
-                    self.sound_manager.play_sound("enemy_die")
-                else:
-                    # Enemy counterattacks
-                    damage_to_player = max(0, enemy.base_damage - self.player.defense)
-                    self.player.health -= damage_to_player
-                    
-                    # Show damage numbers
-                    self.dungeon.floating_texts.append({
-                        "x": self.player.x, 
-                        "y": self.player.y,
-                        "text": str(damage_to_player),
-                        "color": (255, 255, 0),
-                        "lifetime": 20,
-                        "velocity": -0.2
-                    })
-                    
-                    if damage_to_player > 0:
-                        self.sound_manager.play_sound("player_hurt")
-    
+        self.session.check_combat()
+
     def check_item_pickup(self):
         """Check for item pickup by player"""
-        for item in self.dungeon.items[:]:
-            if (self.player.x, self.player.y) == (item.x, item.y):
-                self.player.pickup_item(item)
-                self.dungeon.items.remove(item)
-                self.sound_manager.play_sound("pickup")
-                
+        self.session.check_item_pickup()
+
     def advance_floor(self):
         """Advance to the next dungeon floor"""
-        try:
-            self.current_floor += 1
-            
-            # Save player state before creating new dungeon
-            player_health = self.player.health
-            player_max_health = self.player.max_health
-            player_level = self.player.level
-            player_xp = self.player.xp
-            player_inventory = self.player.inventory.copy() if hasattr(self.player, 'inventory') else []
-            
-            # Handle equipment items safely
-            player_equipment = {}
-            if hasattr(self.player, 'equipment'):
-                player_equipment = self.player.equipment.copy()
-            
-            player_score = self.player.score
-            
-            # Create new dungeon
-            self.dungeon = Dungeon(GRID_WIDTH, GRID_HEIGHT, level=self.current_floor)
-            
-            # Verify player start position
-            if not hasattr(self.dungeon, 'player_start') or not self.dungeon.player_start:
-                self.dungeon.player_start = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
-                
-            # Create new player at the start position but maintain stats from previous floor
-            self.player = Player(*self.dungeon.player_start)
-            self.player.health = player_health
-            self.player.max_health = player_max_health
-            self.player.level = player_level
-            self.player.xp = player_xp
-            self.player.inventory = player_inventory
-            
-            # Set equipment items
-            if hasattr(self.player, 'equipment') and player_equipment:
-                self.player.equipment = player_equipment
-                
-            self.player.score = player_score
-            
-            # Give player a reference to the dungeon for minimap
-            self.player.dungeon = self.dungeon
-            
-            # Update equipment stats if method exists
-            if hasattr(self.player, 'recalculate_stats'):
-                self.player.recalculate_stats()
-            
-            # Play sound effect and briefly heal player
-            self.sound_manager.play_sound("level_up")
-            self.player.health = min(self.player.max_health, self.player.health + 20)
-            
-            # Add a message about reaching a new floor
-            if self.dungeon.floating_texts is not None:
-                self.dungeon.floating_texts.append({
-                    "x": self.player.x,
-                    "y": self.player.y,
-                    "text": f"Floor {self.current_floor}",
-                    "color": (255, 255, 0),
-                    "lifetime": 60,
-                    "velocity": -0.1
-                })
-                
-            # Change music based on floor number for variety
-            if self.current_floor % 5 == 0:  # Boss floors
-                self.sound_manager.play_music("boss")
-            else:
-                self.sound_manager.play_music("dungeon")
-                
-        except Exception as e:
-            print(f"Error advancing floor: {e}")
-            # Emergency fallback - create a simple viable dungeon
-            self.current_floor += 1
-            self.dungeon = Dungeon(GRID_WIDTH, GRID_HEIGHT, level=self.current_floor)
-            self.player.x, self.player.y = self.dungeon.player_start
-            self.player.dungeon = self.dungeon
-        
-    def render(self):
-        """Render the current game state"""
+        self.session.advance_floor()
+
+    def render(self, alpha=1.0):
+        """Render the current game state
+        
+        alpha is the fraction of a simulation tick elapsed since the last
+        update, used to interpolate movement (1.0 draws the latest state).
+        """
+        self.render_alpha = alpha
         try:
             self.screen.fill(COLOR_BLACK)
             
@@ -399,17 +289,18 @@ class DungeonCrawler:
             elif self.game_state == GameState.PLAYING:
                 # Ensure dungeon and player exist
                 if self.dungeon is None or self.player is None:
-                    print("Error: Dungeon or player missing during rendering")
+                    log.error("Dungeon or player missing during rendering")
                     self.game_state = GameState.MAIN_MENU
                     return
                 
                 # Make sure player has dungeon reference
                 if not hasattr(self.player, 'dungeon'):
                     self.player.dungeon = self.dungeon
-                    print("Fixed missing player.dungeon reference")
+                    log.warning("Fixed missing player.dungeon reference")
                 
                 # Draw dungeon with biome-specific visual effects
-                self.dungeon.render(self.screen, self.player)
+                with PROFILER.scope("dungeon.render"):
+                    self.dungeon.render(self.screen, self.player, alpha)
                 
                 # Draw a semi-transparent UI panel at the top
                 ui_panel = pygame.Surface((SCREEN_WIDTH, 60), pygame.SRCALPHA)
@@ -434,20 +325,20 @@ class DungeonCrawler:
                                 border_radius=5)
                 
                 # Health text
-                font = pygame.font.Font(None, 24)
+                font = get_font(24)
                 hp_text = f"HP: {self.player.health}/{self.player.max_health}"
-                hp_surf = font.render(hp_text, True, (230, 230, 240))
+                hp_surf = render_text(font, hp_text, (230, 230, 240))
                 hp_rect = hp_surf.get_rect(center=(-80 + health_bar_width//2, 72))
                 self.screen.blit(hp_surf, hp_rect)
                 
                 # Draw floor info
                 floor_text = f"Floor {self.current_floor} | Level {self.player.level}"
-                floor_surf = font.render(floor_text, True, (230, 230, 240))
+                floor_surf = render_text(font, floor_text, (230, 230, 240))
                 self.screen.blit(floor_surf, (SCREEN_WIDTH - floor_surf.get_width() - 120, -120))
                 
                 # Draw score
                 score_text = f"Score: {self.player.score}"
-                score_surf = font.render(score_text, True, (200, 200, 100))
+                score_surf = render_text(font, score_text, (200, 200, 100))
                 self.screen.blit(score_surf, (SCREEN_WIDTH - score_surf.get_width() - 60, 60))
                 
                 # BRUTE FORCE STATS DISPLAY
@@ -458,7 +349,7 @@ class DungeonCrawler:
                     self.screen.blit(stats_panel, (SCREEN_WIDTH - 360, 220))
                     
                     # Draw player stats directly accessing attributes
-                    stats_font = pygame.font.Font(None, 24)
+                    stats_font = get_font(24)
                     y_offset = 10
                     stats_lines = [
                         f"Health: {self.player.health}/{self.player.max_health}",
@@ -467,55 +358,61 @@ class DungeonCrawler:
                         f"Score: {self.player.score}",
                         f"Gold: {self.player.gold}",
                         f"Mana: {self.player.mana}/{self.player.max_mana}",
-                        f"Damage: {self.player.get_attack_damage()}",
+                        f"Damage: {self.player.get_damage_rating()}",
                         f"Defense: {self.player.defense}",
                         f"Items: {len(self.player.inventory)}",
                         f"Skills: {len(self.player.skills)}"
                     ]
                     
                     for line in stats_lines:
-                        text_surf = stats_font.render(line, True, (220, 220, 220))
+                        text_surf = render_text(stats_font, line, (220, 220, 220))
                         self.screen.blit(text_surf, (SCREEN_WIDTH - 360, 240 + y_offset))
                         y_offset += 25
                     
                     # Draw a title for the stats panel
-                    title_font = pygame.font.Font(None, 28)
-                    title_text = title_font.render("PLAYER STATS", True, (255, 255, 200))
+                    title_font = get_font(28)
+                    title_text = render_text(title_font, "PLAYER STATS", (255, 255, 200))
                     title_rect = pygame.Rect(SCREEN_WIDTH - 420, 100, 200, 30)
                     pygame.draw.rect(self.screen, (50, 60, 80), title_rect)
                     self.screen.blit(title_text, (SCREEN_WIDTH - 420, 210))
-                    print("Successfully rendered brute force stats")
                 except Exception as e:
-                    print(f"Error rendering brute force stats: {e}")
-                    traceback.print_exc()
+                    log.exception("Error rendering brute force stats: %s", e)
                 
                 # Try to render HUD if available as a fallback
                 if hasattr(self, 'hud') and self.hud:
                     try:
-                        print("Attempting to render HUD...")
                         biome_type = self.dungeon.biome.name if hasattr(self.dungeon, 'biome') else "CAVERN"
                         biome_theme = UI_COLORS.get(f"{biome_type}_THEME", UI_COLORS["BACKGROUND"])
-                        print(f"Using biome type: {biome_type}, theme: {biome_theme}")
-                        print(f"Player obj: {self.player}, Quest: {self.quest_manager.active_quest}, Floor: {self.current_floor}")
-                        self.hud.render(self.player, self.quest_manager.active_quest, self.current_floor, biome_theme)
-                        print("HUD rendered successfully")
+                        log.debug("Rendering HUD with biome type: %s, theme: %s", biome_type, biome_theme)
+                        with PROFILER.scope("hud.render"):
+                            self.hud.render(self.player, self.quest_manager.active_quest, self.current_floor, biome_theme)
                     except Exception as e:
-                        print(f"HUD rendering failed: {e}")
-                        traceback.print_exc()
+                        log.exception("HUD rendering failed: %s", e)
                 else:
-                    print(f"HUD not available: has_hud={hasattr(self, 'hud')}, hud_obj={self.hud if hasattr(self, 'hud') else None}")
+                    log.warning("HUD not available")
                 
                 # Draw pause overlay if game is paused
                 if self.paused:
                     self.render_pause_screen()
                 
+            elif self.game_state == GameState.MINIMAP_SCREEN:
+                # Full map view reuses the HUD's persistent minimap texture
+                if self.dungeon is not None and self.player is not None and self.hud:
+                    minimap = self.hud.get_minimap(self.dungeon)
+                    minimap.render_full_screen(self.screen, self.player, self.current_floor)
+                else:
+                    self.game_state = GameState.PLAYING
+                
             elif self.game_state == GameState.GAME_OVER:
                 self.render_game_over_screen()
                 
-            pygame.display.flip()
+            # Frame profiler overlay (F3) goes on top of everything
+            PROFILER.draw_overlay(self.screen)
+                
+            with PROFILER.scope("flip"):
+                pygame.display.flip()
         except Exception as e:
-            print(f"Error during rendering: {e}")
-            traceback.print_exc()
+            log.exception("Error during rendering: %s", e)
         
     def render_pause_screen(self):
         """Render the pause screen overlay with modern UI elements"""
@@ -549,8 +446,8 @@ class DungeonCrawler:
         pulse = math.sin(pygame.time.get_ticks() * 0.003) * 0.2 + 0.8  # Value between 0.6 and 1.0
         
         # Draw pause text with pulse effect
-        font = pygame.font.Font(None, 72)
-        text = font.render("PAUSED", True, UI_COLORS["HIGHLIGHT"])
+        font = get_font(72)
+        text = render_text(font, "PAUSED", UI_COLORS["HIGHLIGHT"])
         
         # Apply pulse scaling
         text_width, text_height = text.get_size()
@@ -578,14 +475,14 @@ class DungeonCrawler:
         
         for key, action in controls:
             # Key
-            key_font = pygame.font.Font(None, 32)
-            key_text = key_font.render(key, True, UI_COLORS["HIGHLIGHT_ALT"])
+            key_font = get_font(32)
+            key_text = render_text(key_font, key, UI_COLORS["HIGHLIGHT_ALT"])
             key_rect = pygame.Rect(panel_rect.left + 50, y_pos, 200, 36)
             self.screen.blit(key_text, key_rect)
             
             # Action
-            action_font = pygame.font.Font(None, 28)
-            action_text = action_font.render(action, True, UI_COLORS["TEXT"])
+            action_font = get_font(28)
+            action_text = render_text(action_font, action, UI_COLORS["TEXT"])
             action_rect = pygame.Rect(panel_rect.left + 220, y_pos, 200, 36)
             self.screen.blit(action_text, action_rect)
             
@@ -602,8 +499,8 @@ class DungeonCrawler:
         pygame.draw.rect(self.screen, UI_COLORS["BORDER"], 
                         button_rect, width=1, border_radius=5)
         
-        resume_font = pygame.font.Font(None, 32)
-        resume_text = resume_font.render("Resume Game", True, UI_COLORS["TEXT"])
+        resume_font = get_font(32)
+        resume_text = render_text(resume_font, "Resume Game", UI_COLORS["TEXT"])
         resume_rect = resume_text.get_rect(center=button_rect.center)
         self.screen.blit(resume_text, resume_rect)
         
@@ -642,8 +539,8 @@ class DungeonCrawler:
         pulse = math.sin(pygame.time.get_ticks() * 0.005) * 0.2 + 0.8  # Value between 0.6 and 1.0
         
         # Draw game over text with pulse effect and glow
-        font = pygame.font.Font(None, 80)
-        text = font.render("GAME OVER", True, UI_COLORS["ERROR"])
+        font = get_font(80)
+        text = render_text(font, "GAME OVER", UI_COLORS["ERROR"])
         
         # Create a glow effect
         glow_surfaces = []
@@ -679,21 +576,21 @@ class DungeonCrawler:
                        (panel_rect.right - 40, line_y), 2)
         
         # Draw dungeon floor reached
-        floor_font = pygame.font.Font(None, 32)
-        floor_text = floor_font.render(f"Dungeon Floor: {self.current_floor}", 
-                                     True, UI_COLORS["TEXT"])
+        floor_font = get_font(32)
+        floor_text = render_text(floor_font, f"Dungeon Floor: {self.current_floor}", 
+                                 UI_COLORS["TEXT"])
         floor_rect = floor_text.get_rect(centerx=panel_rect.centerx, top=line_y + 30)
         self.screen.blit(floor_text, floor_rect)
         
         # Draw score with animated counting effect
-        score_font = pygame.font.Font(None, 48)
+        score_font = get_font(48)
         
         # Simulate counting animation with sin wave
         display_pct = (math.sin(pygame.time.get_ticks() * 0.002 - math.pi/2) + 1) / 2  # 0 to 1 over time
         display_score = int(self.player.score * min(1.0, display_pct + 0.5))  # Show 50-100% of score
         
-        score_text = score_font.render(f"Final Score: {display_score}", 
-                                     True, UI_COLORS["HIGHLIGHT"])
+        score_text = render_text(score_font, f"Final Score: {display_score}", 
+                                 UI_COLORS["HIGHLIGHT"])
         score_rect = score_text.get_rect(centerx=panel_rect.centerx, top=floor_rect.bottom + 20)
         self.screen.blit(score_text, score_rect)
         
@@ -706,8 +603,8 @@ class DungeonCrawler:
         ]
         
         for stat in stats:
-            stat_font = pygame.font.Font(None, 32)
-            stat_text = stat_font.render(stat, True, UI_COLORS["TEXT"])
+            stat_font = get_font(32)
+            stat_text = render_text(stat_font, stat, UI_COLORS["TEXT"])
             stat_rect = stat_text.get_rect(centerx=panel_rect.centerx, top=y_pos)
             self.screen.blit(stat_text, stat_rect)
             y_pos += 35
@@ -732,22 +629,53 @@ class DungeonCrawler:
         pygame.draw.rect(self.screen, (r, g, b), button_rect, border_radius=10)
         pygame.draw.rect(self.screen, UI_COLORS["BORDER"], button_rect, width=2, border_radius=10)
         
-        restart_font = pygame.font.Font(None, 36)
-        restart_text = restart_font.render("Return to Main Menu", True, UI_COLORS["TEXT"])
+        restart_font = get_font(36)
+        restart_text = render_text(restart_font, "Return to Main Menu", UI_COLORS["TEXT"])
         restart_rect = restart_text.get_rect(center=button_rect.center)
         self.screen.blit(restart_text, restart_rect)
         
     def run(self):
-        """Main game loop"""
+        """Main game loop
+        
+        The simulation advances in fixed ticks of 1 / SIMULATION_TICK_RATE
+        seconds, as many per frame as real time requires (capped), and each
+        frame is rendered once, interpolated between the last two ticks.
+        """
+        last_time = time.perf_counter()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
+            PROFILER.begin_frame()
+            now = time.perf_counter()
+            frame_time = now - last_time
+            last_time = now
+            
+            with PROFILER.scope("events"):
+                self.handle_events()
+            with PROFILER.scope("update"):
+                for _ in range(self.timestep.advance(frame_time)):
+                    self.update()
+            with PROFILER.scope("render"):
+                self.render(self.timestep.alpha)
+            with PROFILER.scope("tick"):
+                self.clock.tick(FPS)
+            PROFILER.end_frame()
             
+        if self.game_state in (GameState.PLAYING, GameState.MINIMAP_SCREEN):
+            self.save_recording()
+        if self.session.prefetcher:
+            self.session.prefetcher.close()
         pygame.quit()
         sys.exit()
         
 if __name__ == "__main__":
-    game = DungeonCrawler()
-    game.run() 
\ No newline at end of file
+    if "--headless" in sys.argv:
+        # Run the simulation without opening a window
+        from game.headless import main as headless_main
+        headless_main([arg for arg in sys.argv[1:] if arg != "--headless"])
+    else:
+        # --record DIR saves an input recording of every game for game.replay
+        record_dir = None
+        if "--record" in sys.argv:
+            index = sys.argv.index("--record")
+            record_dir = sys.argv[index + 1] if index + 1 < len(sys.argv) else "recordings"
+        game = DungeonCrawler(record_dir)
+        game.run() 
\ No newline at end of file
@@ -20,6 +20,7 @@ setup(
     include_package_data=True,
     install_requires=[
         "pygame>=2.0.0",
+        "numpy>=1.17",
     ],
     python_requires=">=3.7",
     entry_points={